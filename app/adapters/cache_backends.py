@@ -0,0 +1,111 @@
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import AsyncIterator, Callable, Optional
+
+from redis.asyncio import Redis
+
+from app.adapters.cache import LRUTTLCache
+
+
+class CacheBackend(ABC):
+    """
+    Storage for serialized cache entries shared by the caches of one process or of all workers,
+    together with the publish/subscribe channel used to broadcast invalidations.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, keys: list[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Backend living in the current process, for a single worker and for tests.
+    """
+
+    def __init__(self, maxsize: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.entries: LRUTTLCache[str, bytes] = LRUTTLCache(maxsize, math.inf, clock)
+        self.subscribers: defaultdict[str, set[asyncio.Queue[str]]] = defaultdict(set)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries.set(key, value, ttl)
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self.entries.pop(key)
+
+    async def publish(self, channel: str, message: str) -> None:
+        for queue in self.subscribers[channel]:
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        self.subscribers[channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.subscribers[channel].discard(queue)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend speaking the Redis protocol, shared by every worker connected to the same server.
+    """
+
+    def __init__(self, client: Redis):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.client.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    async def delete(self, keys: list[str]) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self.client.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    data = message["data"]
+                    yield data.decode() if isinstance(data, bytes) else data
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,283 @@
+from bisect import bisect_right
+from typing import AsyncGenerator, AsyncIterator, Iterable, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from app.adapters.entity_cache import EntityCache, CacheInvalidator
+from app.application.models import Organization, OrganizationCreate, WasteType, OrganizationWaste
+from app.application.models.organization import OrganizationUpdate
+from app.application.models.location import Location
+from app.application.models.storage import Storage, StorageCreate, StorageFreeCapacity, StorageUpdate
+from app.application.models.waste import StorageWasteState, WasteTransferItem, OrganizationWasteState
+from app.application.protocols.database import StorageDatabaseGateway, OrganizationDatabaseGateway
+
+Entity = TypeVar("Entity", bound=BaseModel)
+
+
+def page(entities: list[Entity], after_id: Optional[int], limit: Optional[int]) -> list[Entity]:
+    start = 0 if after_id is None else bisect_right(entities, after_id, key=lambda entity: getattr(entity, "id"))
+    return entities[start:None if limit is None else start + limit]
+
+
+class CachedOrganizationGateway(OrganizationDatabaseGateway):
+    """
+    Read-through cache in front of another organization gateway.
+
+    `get_organization_by_id` and `get_organizations` are served from the cache. Writes drop
+    the organizations they touch and the full list at once and again, for every worker,
+    after the transaction is committed. Locking reads always go to the wrapped gateway.
+    Once this gateway has written anything, its reads bypass the cache so uncommitted
+    data is never cached. After `get_version` only entries read at that version are served,
+    so a response body always matches the ETag built from the version.
+    """
+
+    def __init__(
+            self,
+            gateway: OrganizationDatabaseGateway,
+            cache: EntityCache[Organization],
+            invalidator: CacheInvalidator,
+    ):
+        self.gateway = gateway
+        self.cache = cache
+        self.invalidator = invalidator
+        self.dirty = False
+        self.version: Optional[int] = None
+
+    async def _version(self) -> int:
+        # Read before the entities it tags, so an entry is never tagged newer than its contents.
+        if self.version is None:
+            self.version = await self.gateway.get_version()
+        return self.version
+
+    async def _invalidate(self, organization_ids: Iterable[int] = ()) -> None:
+        organization_ids = list(organization_ids)
+        self.dirty = True
+        await self.cache.invalidate(organization_ids)
+        self.invalidator.add(self.cache, organization_ids)
+
+    async def get_organizations(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> list[
+        Organization]:
+        if self.dirty:
+            return await self.gateway.get_organizations(after_id, limit)
+        organizations = await self.cache.get_all(self.version)
+        if organizations is None:
+            if after_id is not None or limit is not None:
+                return await self.gateway.get_organizations(after_id, limit)
+            version = await self._version()
+            organizations = await self.gateway.get_organizations()
+            await self.cache.set_all(organizations, version)
+        return page(organizations, after_id, limit)
+
+    async def iter_organizations(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[
+        Organization]:
+        organizations = None if self.dirty else await self.cache.get_all(self.version)
+        if organizations is None:
+            async for organization in self.gateway.iter_organizations(after_id, limit):
+                yield organization
+            return
+        for organization in page(organizations, after_id, limit):
+            yield organization
+
+    async def get_version(self) -> int:
+        self.version = await self.gateway.get_version()
+        return self.version
+
+    async def get_organization_by_id(self, organization_id: int) -> Optional[Organization]:
+        if self.dirty:
+            return await self.gateway.get_organization_by_id(organization_id)
+        organization = await self.cache.get(organization_id, self.version)
+        if organization is None:
+            version = await self._version()
+            organization = await self.gateway.get_organization_by_id(organization_id)
+            if organization is not None:
+                await self.cache.set(organization_id, organization, version)
+        return organization
+
+    async def get_organizations_by_ids(self, organization_ids: list[int]) -> list[Organization]:
+        return await self.gateway.get_organizations_by_ids(organization_ids)
+
+    async def get_organization_locations(self, organization_ids: list[int]) -> list[Location]:
+        return await self.gateway.get_organization_locations(organization_ids)
+
+    async def create_organization(self, organization_data: OrganizationCreate) -> int:
+        await self._invalidate()
+        return await self.gateway.create_organization(organization_data)
+
+    async def create_organizations(self, organizations_data: list[OrganizationCreate]) -> list[int]:
+        await self._invalidate()
+        return await self.gateway.create_organizations(organizations_data)
+
+    async def delete_organization_by_id(self, organization_id: int) -> Optional[int]:
+        await self._invalidate([organization_id])
+        return await self.gateway.delete_organization_by_id(organization_id)
+
+    async def delete_organizations(self, organization_ids: list[int]) -> list[int]:
+        await self._invalidate(organization_ids)
+        return await self.gateway.delete_organizations(organization_ids)
+
+    async def update_organization_by_id(self, organization_id: int, organization_data: OrganizationCreate) -> Optional[
+        int]:
+        await self._invalidate([organization_id])
+        return await self.gateway.update_organization_by_id(organization_id, organization_data)
+
+    async def patch_organization_by_id(self, organization_id: int, organization_data: OrganizationUpdate) -> Optional[
+        int]:
+        await self._invalidate([organization_id])
+        return await self.gateway.patch_organization_by_id(organization_id, organization_data)
+
+    async def lock_organization_waste(
+            self,
+            organization_id: int,
+            waste_type: WasteType
+    ) -> Optional[OrganizationWasteState]:
+        return await self.gateway.lock_organization_waste(organization_id, waste_type)
+
+    async def lock_organization_wastes(
+            self,
+            keys: list[tuple[int, WasteType]]
+    ) -> list[OrganizationWasteState]:
+        return await self.gateway.lock_organization_wastes(keys)
+
+    async def reduce_organization_waste(
+            self,
+            organization_id: int,
+            waste_type: WasteType,
+            amount: int
+    ) -> Optional[int]:
+        await self._invalidate([organization_id])
+        return await self.gateway.reduce_organization_waste(organization_id, waste_type, amount)
+
+    async def reduce_organization_wastes(self, transfers: list[WasteTransferItem]) -> None:
+        await self._invalidate({transfer.organization_id for transfer in transfers})
+        await self.gateway.reduce_organization_wastes(transfers)
+
+    async def generate_waste(self, organization_id: int, waste_type: WasteType, amount: int) -> int:
+        await self._invalidate([organization_id])
+        return await self.gateway.generate_waste(organization_id, waste_type, amount)
+
+
+class CachedStorageGateway(StorageDatabaseGateway):
+    """
+    Read-through cache in front of another storage gateway.
+
+    `get_storage_by_id` and `get_storages` are served from the cache. Writes drop
+    the storages they touch and the full list at once and again, for every worker,
+    after the transaction is committed. Locking reads, capacity lookups and available
+    storages always go to the wrapped gateway. Once this gateway has written anything,
+    its reads bypass the cache so uncommitted data is never cached. After `get_version`
+    only entries read at that version are served, so a response body always matches
+    the ETag built from the version.
+    """
+
+    def __init__(self, gateway: StorageDatabaseGateway, cache: EntityCache[Storage], invalidator: CacheInvalidator):
+        self.gateway = gateway
+        self.cache = cache
+        self.invalidator = invalidator
+        self.dirty = False
+        self.version: Optional[int] = None
+
+    async def _version(self) -> int:
+        # Read before the entities it tags, so an entry is never tagged newer than its contents.
+        if self.version is None:
+            self.version = await self.gateway.get_version()
+        return self.version
+
+    async def _invalidate(self, storage_ids: Iterable[int] = ()) -> None:
+        storage_ids = list(storage_ids)
+        self.dirty = True
+        await self.cache.invalidate(storage_ids)
+        self.invalidator.add(self.cache, storage_ids)
+
+    async def get_storages(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> list[Storage]:
+        if self.dirty:
+            return await self.gateway.get_storages(after_id, limit)
+        storages = await self.cache.get_all(self.version)
+        if storages is None:
+            if after_id is not None or limit is not None:
+                return await self.gateway.get_storages(after_id, limit)
+            version = await self._version()
+            storages = await self.gateway.get_storages()
+            await self.cache.set_all(storages, version)
+        return page(storages, after_id, limit)
+
+    async def iter_storages(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[
+        Storage]:
+        storages = None if self.dirty else await self.cache.get_all(self.version)
+        if storages is None:
+            async for storage in self.gateway.iter_storages(after_id, limit):
+                yield storage
+            return
+        for storage in page(storages, after_id, limit):
+            yield storage
+
+    async def get_version(self) -> int:
+        self.version = await self.gateway.get_version()
+        return self.version
+
+    async def get_storage_by_id(self, storage_id: int) -> Optional[Storage]:
+        if self.dirty:
+            return await self.gateway.get_storage_by_id(storage_id)
+        storage = await self.cache.get(storage_id, self.version)
+        if storage is None:
+            version = await self._version()
+            storage = await self.gateway.get_storage_by_id(storage_id)
+            if storage is not None:
+                await self.cache.set(storage_id, storage, version)
+        return storage
+
+    def iter_available_storages(
+            self,
+            location_x: float,
+            location_y: float,
+            generated_waste: list[OrganizationWaste],
+            max_distance: Optional[float] = None,
+            limit: Optional[int] = None,
+            offset: int = 0,
+    ) -> AsyncGenerator[Storage, None]:
+        return self.gateway.iter_available_storages(
+            location_x, location_y, generated_waste, max_distance, limit, offset
+        )
+
+    async def get_free_capacities(self, waste_types: list[WasteType]) -> list[StorageFreeCapacity]:
+        return await self.gateway.get_free_capacities(waste_types)
+
+    async def get_storage_locations(self, storage_ids: list[int]) -> list[Location]:
+        return await self.gateway.get_storage_locations(storage_ids)
+
+    async def create_storage(self, storage_data: StorageCreate) -> int:
+        await self._invalidate()
+        return await self.gateway.create_storage(storage_data)
+
+    async def create_storages(self, storages_data: list[StorageCreate]) -> list[int]:
+        await self._invalidate()
+        return await self.gateway.create_storages(storages_data)
+
+    async def update_storage_by_id(self, storage_id: int, storage_data: StorageCreate) -> Optional[int]:
+        await self._invalidate([storage_id])
+        return await self.gateway.update_storage_by_id(storage_id, storage_data)
+
+    async def patch_storage_by_id(self, storage_id: int, storage_data: StorageUpdate) -> Optional[int]:
+        await self._invalidate([storage_id])
+        return await self.gateway.patch_storage_by_id(storage_id, storage_data)
+
+    async def delete_storage_by_id(self, storage_id: int) -> Optional[int]:
+        await self._invalidate([storage_id])
+        return await self.gateway.delete_storage_by_id(storage_id)
+
+    async def delete_storages(self, storage_ids: list[int]) -> list[int]:
+        await self._invalidate(storage_ids)
+        return await self.gateway.delete_storages(storage_ids)
+
+    async def lock_storage_waste(self, storage_id: int, waste_type: WasteType) -> Optional[StorageWasteState]:
+        return await self.gateway.lock_storage_waste(storage_id, waste_type)
+
+    async def lock_storage_wastes(self, keys: list[tuple[int, WasteType]]) -> list[StorageWasteState]:
+        return await self.gateway.lock_storage_wastes(keys)
+
+    async def add_waste_to_storage(self, storage_id: int, waste_type: WasteType, amount: int) -> Optional[int]:
+        await self._invalidate([storage_id])
+        return await self.gateway.add_waste_to_storage(storage_id, waste_type, amount)
+
+    async def add_waste_to_storages(self, transfers: list[WasteTransferItem]) -> None:
+        await self._invalidate({transfer.storage_id for transfer in transfers})
+        await self.gateway.add_waste_to_storages(transfers)
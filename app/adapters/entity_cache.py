@@ -0,0 +1,216 @@
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Generic, Iterable, Optional, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters.cache import LRUTTLCache
+from app.adapters.cache_backends import CacheBackend
+from app.application.protocols.database import UoW
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache-invalidation"
+# Bumped whenever the layout of cached values changes, so workers never read entries in another layout.
+KEY_LAYOUT = 2
+RESUBSCRIBE_DELAY = 1.0
+
+
+M = TypeVar("M", bound=BaseModel)
+V = TypeVar("V")
+
+
+def fresh(entry: Optional[tuple[int, V]], version: Optional[int]) -> Optional[V]:
+    """
+    The value of a `(version, value)` cache entry, None when it is missing or was read at another version.
+    """
+    if entry is None or (version is not None and entry[0] != version):
+        return None
+    return entry[1]
+
+
+class EntityCache(Generic[M]):
+    """
+    Two-level cache of one entity type: entities by id and a snapshot of the full list ordered by id.
+
+    Validated models are kept in a process-local LRU+TTL cache in front of a `CacheBackend`
+    holding them as JSON, so a worker that misses locally can still reuse what another worker loaded.
+    Every entry carries the table version it was read at, and reads given a version skip entries
+    of any other one. Cached models are shared between requests and must not be mutated.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            model: type[M],
+            backend: CacheBackend,
+            maxsize: int = 1024,
+            ttl: float = 60.0,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self.entities: LRUTTLCache[int, tuple[int, M]] = LRUTTLCache(maxsize, ttl, clock)
+        self.snapshot: LRUTTLCache[None, tuple[int, list[M]]] = LRUTTLCache(1, ttl, clock)
+        self.hits = 0
+        self.misses = 0
+        self._adapter: TypeAdapter[tuple[int, M]] = TypeAdapter(tuple[int, model])  # type: ignore[valid-type]
+        self._list_adapter: TypeAdapter[tuple[int, list[M]]] = TypeAdapter(
+            tuple[int, list[model]]  # type: ignore[valid-type]
+        )
+
+    def _key(self, entity_id: Optional[int]) -> str:
+        return f"{self.name}:{KEY_LAYOUT}:{'all' if entity_id is None else entity_id}"
+
+    def _count(self, value: Optional[object]) -> None:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    async def get(self, entity_id: int, version: Optional[int] = None) -> Optional[M]:
+        entity = fresh(self.entities.get(entity_id), version)
+        if entity is None:
+            data = await self.backend.get(self._key(entity_id))
+            if data is not None:
+                entry = self._adapter.validate_json(data)
+                entity = fresh(entry, version)
+                if entity is not None:
+                    self.entities.set(entity_id, entry)
+        self._count(entity)
+        return entity
+
+    async def set(self, entity_id: int, entity: M, version: int) -> None:
+        entry = (version, entity)
+        self.entities.set(entity_id, entry)
+        await self.backend.set(self._key(entity_id), self._adapter.dump_json(entry), self.ttl)
+
+    async def get_all(self, version: Optional[int] = None) -> Optional[list[M]]:
+        entities = fresh(self.snapshot.get(None), version)
+        if entities is None:
+            data = await self.backend.get(self._key(None))
+            if data is not None:
+                entry = self._list_adapter.validate_json(data)
+                entities = fresh(entry, version)
+                if entities is not None:
+                    self.snapshot.set(None, entry)
+        self._count(entities)
+        return entities
+
+    async def set_all(self, entities: list[M], version: int) -> None:
+        entry = (version, entities)
+        self.snapshot.set(None, entry)
+        await self.backend.set(self._key(None), self._list_adapter.dump_json(entry), self.ttl)
+
+    def drop_local(self, entity_ids: Iterable[int] = ()) -> None:
+        for entity_id in entity_ids:
+            self.entities.pop(entity_id)
+        self.snapshot.clear()
+
+    def clear_local(self) -> None:
+        self.entities.clear()
+        self.snapshot.clear()
+
+    async def invalidate(self, entity_ids: Iterable[int] = ()) -> None:
+        entity_ids = list(entity_ids)
+        self.drop_local(entity_ids)
+        await self.backend.delete([self._key(entity_id) for entity_id in entity_ids] + [self._key(None)])
+
+
+class CacheInvalidationChannel:
+    """
+    Broadcasts committed invalidations to every worker and applies the ones received from others.
+    """
+
+    def __init__(self, backend: CacheBackend, caches: list[EntityCache]):
+        self.backend = backend
+        self.caches = {cache.name: cache for cache in caches}
+
+    async def publish(self, invalidations: dict[str, set[int]]) -> None:
+        for name, entity_ids in invalidations.items():
+            await self.caches[name].invalidate(entity_ids)
+        await self.backend.publish(
+            INVALIDATION_CHANNEL,
+            json.dumps({name: sorted(entity_ids) for name, entity_ids in invalidations.items()})
+        )
+
+    def apply(self, message: str) -> None:
+        for name, entity_ids in json.loads(message).items():
+            cache = self.caches.get(name)
+            if cache is not None:
+                cache.drop_local(entity_ids)
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                async for message in self.backend.subscribe(INVALIDATION_CHANNEL):
+                    self.apply(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidation channel failed, resubscribing")
+            # Messages may have been lost while the subscription was down.
+            for cache in self.caches.values():
+                cache.clear_local()
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    @asynccontextmanager
+    async def listening(self) -> AsyncIterator[None]:
+        task = asyncio.create_task(self.listen())
+        try:
+            yield
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+class CacheInvalidator:
+    """
+    Collects the entities written during one request and publishes them once the transaction is committed.
+    """
+
+    def __init__(self, channel: CacheInvalidationChannel):
+        self.channel = channel
+        self.pending: defaultdict[str, set[int]] = defaultdict(set)
+
+    def add(self, cache: EntityCache, entity_ids: Iterable[int]) -> None:
+        self.pending[cache.name].update(entity_ids)
+
+    async def commit(self) -> None:
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, defaultdict(set)
+        try:
+            await self.channel.publish(pending)
+        except Exception:
+            # The transaction is already committed, stale entries expire with their TTL.
+            logger.exception("Failed to publish cache invalidation")
+
+    def discard(self) -> None:
+        self.pending.clear()
+
+
+class InvalidatingUoW(UoW):
+    def __init__(self, session: AsyncSession, invalidator: CacheInvalidator):
+        self.session = session
+        self.invalidator = invalidator
+
+    async def commit(self) -> None:
+        await self.session.commit()
+        await self.invalidator.commit()
+
+    async def flush(self) -> None:
+        await self.session.flush()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+        self.invalidator.discard()
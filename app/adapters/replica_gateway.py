@@ -0,0 +1,178 @@
+from typing import AsyncGenerator, AsyncIterator, Callable, Optional
+
+from app.application.models import Organization, OrganizationCreate, WasteType, OrganizationWaste
+from app.application.models.organization import OrganizationUpdate
+from app.application.models.location import Location
+from app.application.models.storage import Storage, StorageCreate, StorageFreeCapacity, StorageUpdate
+from app.application.models.waste import StorageWasteState, WasteTransferItem, OrganizationWasteState
+from app.application.protocols.database import StorageDatabaseGateway, OrganizationDatabaseGateway, UoW
+
+
+class ReplicaOrganizationGateway(OrganizationDatabaseGateway):
+    """
+    Sends the plain organization reads and the table version to a read replica,
+    and every write and locking read to the primary.
+    """
+
+    def __init__(self, primary: OrganizationDatabaseGateway, replica: OrganizationDatabaseGateway):
+        self.primary = primary
+        self.replica = replica
+
+    async def get_organizations(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> list[
+        Organization]:
+        return await self.replica.get_organizations(after_id, limit)
+
+    def iter_organizations(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[
+        Organization]:
+        return self.replica.iter_organizations(after_id, limit)
+
+    async def get_version(self) -> int:
+        return await self.replica.get_version()
+
+    async def get_organization_by_id(self, organization_id: int) -> Optional[Organization]:
+        return await self.replica.get_organization_by_id(organization_id)
+
+    async def get_organizations_by_ids(self, organization_ids: list[int]) -> list[Organization]:
+        return await self.primary.get_organizations_by_ids(organization_ids)
+
+    async def get_organization_locations(self, organization_ids: list[int]) -> list[Location]:
+        return await self.primary.get_organization_locations(organization_ids)
+
+    async def create_organization(self, organization_data: OrganizationCreate) -> int:
+        return await self.primary.create_organization(organization_data)
+
+    async def create_organizations(self, organizations_data: list[OrganizationCreate]) -> list[int]:
+        return await self.primary.create_organizations(organizations_data)
+
+    async def delete_organization_by_id(self, organization_id: int) -> Optional[int]:
+        return await self.primary.delete_organization_by_id(organization_id)
+
+    async def delete_organizations(self, organization_ids: list[int]) -> list[int]:
+        return await self.primary.delete_organizations(organization_ids)
+
+    async def update_organization_by_id(self, organization_id: int, organization_data: OrganizationCreate) -> Optional[
+        int]:
+        return await self.primary.update_organization_by_id(organization_id, organization_data)
+
+    async def patch_organization_by_id(self, organization_id: int, organization_data: OrganizationUpdate) -> Optional[
+        int]:
+        return await self.primary.patch_organization_by_id(organization_id, organization_data)
+
+    async def lock_organization_waste(
+            self,
+            organization_id: int,
+            waste_type: WasteType
+    ) -> Optional[OrganizationWasteState]:
+        return await self.primary.lock_organization_waste(organization_id, waste_type)
+
+    async def lock_organization_wastes(
+            self,
+            keys: list[tuple[int, WasteType]]
+    ) -> list[OrganizationWasteState]:
+        return await self.primary.lock_organization_wastes(keys)
+
+    async def reduce_organization_waste(
+            self,
+            organization_id: int,
+            waste_type: WasteType,
+            amount: int
+    ) -> Optional[int]:
+        return await self.primary.reduce_organization_waste(organization_id, waste_type, amount)
+
+    async def reduce_organization_wastes(self, transfers: list[WasteTransferItem]) -> None:
+        await self.primary.reduce_organization_wastes(transfers)
+
+    async def generate_waste(self, organization_id: int, waste_type: WasteType, amount: int) -> int:
+        return await self.primary.generate_waste(organization_id, waste_type, amount)
+
+
+class ReplicaStorageGateway(StorageDatabaseGateway):
+    """
+    Sends the plain storage reads and the table version to a read replica,
+    and every write, locking read and capacity lookup to the primary.
+    """
+
+    def __init__(self, primary: StorageDatabaseGateway, replica: StorageDatabaseGateway):
+        self.primary = primary
+        self.replica = replica
+
+    async def get_storages(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> list[Storage]:
+        return await self.replica.get_storages(after_id, limit)
+
+    def iter_storages(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Storage]:
+        return self.replica.iter_storages(after_id, limit)
+
+    async def get_version(self) -> int:
+        return await self.replica.get_version()
+
+    async def get_storage_by_id(self, storage_id: int) -> Optional[Storage]:
+        return await self.replica.get_storage_by_id(storage_id)
+
+    def iter_available_storages(
+            self,
+            location_x: float,
+            location_y: float,
+            generated_waste: list[OrganizationWaste],
+            max_distance: Optional[float] = None,
+            limit: Optional[int] = None,
+            offset: int = 0,
+    ) -> AsyncGenerator[Storage, None]:
+        return self.primary.iter_available_storages(
+            location_x, location_y, generated_waste, max_distance, limit, offset
+        )
+
+    async def get_free_capacities(self, waste_types: list[WasteType]) -> list[StorageFreeCapacity]:
+        return await self.primary.get_free_capacities(waste_types)
+
+    async def get_storage_locations(self, storage_ids: list[int]) -> list[Location]:
+        return await self.primary.get_storage_locations(storage_ids)
+
+    async def create_storage(self, storage_data: StorageCreate) -> int:
+        return await self.primary.create_storage(storage_data)
+
+    async def create_storages(self, storages_data: list[StorageCreate]) -> list[int]:
+        return await self.primary.create_storages(storages_data)
+
+    async def update_storage_by_id(self, storage_id: int, storage_data: StorageCreate) -> Optional[int]:
+        return await self.primary.update_storage_by_id(storage_id, storage_data)
+
+    async def patch_storage_by_id(self, storage_id: int, storage_data: StorageUpdate) -> Optional[int]:
+        return await self.primary.patch_storage_by_id(storage_id, storage_data)
+
+    async def delete_storage_by_id(self, storage_id: int) -> Optional[int]:
+        return await self.primary.delete_storage_by_id(storage_id)
+
+    async def delete_storages(self, storage_ids: list[int]) -> list[int]:
+        return await self.primary.delete_storages(storage_ids)
+
+    async def lock_storage_waste(self, storage_id: int, waste_type: WasteType) -> Optional[StorageWasteState]:
+        return await self.primary.lock_storage_waste(storage_id, waste_type)
+
+    async def lock_storage_wastes(self, keys: list[tuple[int, WasteType]]) -> list[StorageWasteState]:
+        return await self.primary.lock_storage_wastes(keys)
+
+    async def add_waste_to_storage(self, storage_id: int, waste_type: WasteType, amount: int) -> Optional[int]:
+        return await self.primary.add_waste_to_storage(storage_id, waste_type, amount)
+
+    async def add_waste_to_storages(self, transfers: list[WasteTransferItem]) -> None:
+        await self.primary.add_waste_to_storages(transfers)
+
+
+class ReadYourWritesUoW(UoW):
+    """
+    Calls `on_commit` after every commit so the client's next reads can be sent to the primary.
+    """
+
+    def __init__(self, uow: UoW, on_commit: Callable[[], None]):
+        self.uow = uow
+        self.on_commit = on_commit
+
+    async def commit(self) -> None:
+        await self.uow.commit()
+        self.on_commit()
+
+    async def flush(self) -> None:
+        await self.uow.flush()
+
+    async def rollback(self) -> None:
+        await self.uow.rollback()
@@ -0,0 +1,107 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
+
+from app.application.models.pool import PoolMetrics
+from app.application.protocols.database import ConnectionPoolMonitor
+
+STATEMENT_TIMEOUTS = {
+    "postgresql": "SET statement_timeout = {}",
+    "mysql": "SET SESSION max_execution_time = {}",
+    "sqlite": "PRAGMA busy_timeout = {}",
+}
+
+READ_ONLY_STATEMENTS = {
+    "postgresql": "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY",
+    "mysql": "SET SESSION TRANSACTION READ ONLY",
+    "sqlite": "PRAGMA query_only = ON",
+}
+
+
+def run_on_connect(engine: AsyncEngine, statement: str) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def execute_statement(dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute(statement)
+        cursor.close()
+
+
+def set_statement_timeout(engine: AsyncEngine, timeout: float) -> None:
+    """
+    Run the dialect's timeout statement with `timeout` seconds on every new connection of the engine.
+    """
+    statement = STATEMENT_TIMEOUTS.get(engine.dialect.name)
+    if statement is None:
+        raise ValueError(f"Statement timeout is not supported for {engine.dialect.name}")
+    run_on_connect(engine, statement.format(int(timeout * 1000)))
+
+
+def enable_foreign_keys(engine: AsyncEngine) -> None:
+    """
+    Make SQLite enforce foreign keys, and with them `ON DELETE CASCADE`, as the other databases always do.
+    """
+    if engine.dialect.name == "sqlite":
+        run_on_connect(engine, "PRAGMA foreign_keys = ON")
+
+
+def set_read_only(engine: AsyncEngine) -> None:
+    """
+    Make every connection of the engine reject writes, so a write sent to a replica fails instead of diverging it.
+    """
+    statement = READ_ONLY_STATEMENTS.get(engine.dialect.name)
+    if statement is None:
+        raise ValueError(f"Read-only connections are not supported for {engine.dialect.name}")
+    run_on_connect(engine, statement)
+
+
+class SqlaConnectionPoolMonitor(ConnectionPoolMonitor):
+    """
+    Pool utilisation of an engine together with counters of the pool events since it was created.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_overflow: int):
+        self.engine = engine
+        self.max_overflow = max_overflow
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        event.listen(engine.sync_engine, "connect", self._on_connect)
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, *args: Any) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, *args: Any) -> None:
+        self.checkouts += 1
+
+    def _on_invalidate(self, *args: Any) -> None:
+        self.invalidations += 1
+
+    async def get_pool_metrics(self) -> PoolMetrics:
+        pool = self.engine.pool
+        counters = dict(connects=self.connects, checkouts=self.checkouts, invalidations=self.invalidations)
+        if not isinstance(pool, QueuePool):
+            return PoolMetrics(
+                pool=type(pool).__name__,
+                size=None,
+                max_overflow=None,
+                checked_in=None,
+                checked_out=None,
+                overflow=None,
+                utilization=None,
+                **counters,
+            )
+        capacity = pool.size() + self.max_overflow
+        return PoolMetrics(
+            pool=type(pool).__name__,
+            size=pool.size(),
+            max_overflow=self.max_overflow,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(0, pool.overflow()),
+            utilization=pool.checkedout() / capacity if capacity > 0 else None,
+            **counters,
+        )
@@ -1,35 +1,313 @@
-from typing import Optional
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from typing import Optional, AsyncIterator, AsyncGenerator, Any, Sequence
 
-from sqlalchemy import select, delete
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from pydantic import TypeAdapter
+from sqlalchemy import select, delete, func, and_, or_, distinct, Select, update, insert, literal, bindparam, event, \
+    cast, String, ScalarSelect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
 
 from app.adapters.sqlalchemy_db import models
-from app.application.models import Organization, OrganizationCreate, WasteType
-from app.application.models.storage import Storage, StorageCreate
+from app.application.models import Organization, OrganizationCreate, WasteType, OrganizationWaste
+from app.application.models.organization import OrganizationUpdate
+from app.application.models.location import Location
+from app.application.models.storage import Storage, StorageCreate, StorageFreeCapacity, StorageUpdate
+from app.application.models.storage_capacity import StorageCapacity
+from app.application.models.storage_current_level import StorageCurrentLevel
+from app.application.models.waste import OrganizationWasteState, StorageWasteState, WasteTransferItem
 from app.application.protocols.database import OrganizationDatabaseGateway, StorageDatabaseGateway
 
+STREAM_YIELD_PER = 500
+IN_CHUNK_SIZE = 500
+ORGANIZATION_LIST = TypeAdapter(list[Organization])
+STORAGE_LIST = TypeAdapter(list[Storage])
+CHANGED_TABLES_KEY = "changed_tables"
+PINNED_KEY = "pinned"
+
+
+def pin_connection(session: AsyncSession) -> None:
+    """
+    Keep the current transaction, and its connection, until the session is committed or rolled back.
+    """
+    session.info[PINNED_KEY] = True
+
+
+def mark_changed(session: AsyncSession, table: str) -> None:
+    """
+    Bump the version of `table` when the current transaction commits.
+    """
+    pin_connection(session)
+    session.info.setdefault(CHANGED_TABLES_KEY, set()).add(table)
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Return the connection of a read-only transaction to the pool once a read is done,
+    instead of holding it until the end of the request.
+
+    Sessions that wrote, flushed or locked rows are left alone. The next query starts a new transaction.
+    """
+    if not session.info.get(PINNED_KEY) and session.in_transaction():
+        await session.close()
+
+
+@asynccontextmanager
+async def stream_session(
+        session: AsyncSession,
+        session_maker: Optional[async_sessionmaker[AsyncSession]],
+) -> AsyncIterator[AsyncSession]:
+    """
+    Session to stream a read through.
+
+    A streamed response is still reading after the request's session has been closed,
+    so with a session maker the stream opens a session of its own and closes it when it ends.
+    """
+    if session_maker is None:
+        yield session
+        await release_connection(session)
+        return
+    async with session_maker() as own_session:
+        yield own_session
+
+
+async def get_table_version(session: AsyncSession, table: str) -> int:
+    version = await session.scalar(
+        select(models.TableVersion.version).where(models.TableVersion.name == table)
+    )
+    await release_connection(session)
+    return version or 0
+
+
+@event.listens_for(Session, "before_commit")
+def bump_table_versions(session: Session) -> None:
+    # Bumped right before COMMIT so the version rows stay locked as briefly as possible.
+    tables = session.info.pop(CHANGED_TABLES_KEY, None)
+    if tables:
+        session.execute(
+            update(models.TableVersion)
+            .where(models.TableVersion.name.in_(sorted(tables)))
+            .values(version=models.TableVersion.version + 1)
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_table_versions(session: Session) -> None:
+    session.info.pop(CHANGED_TABLES_KEY, None)
+    session.info.pop(PINNED_KEY, None)
+
+
+@event.listens_for(Session, "after_flush")
+def pin_flushed_session(session: Session, flush_context: object) -> None:
+    session.info[PINNED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def unpin_committed_session(session: Session) -> None:
+    session.info.pop(PINNED_KEY, None)
+
+
+def chunks(ids: Sequence[int]) -> list[Sequence[int]]:
+    return [ids[start:start + IN_CHUNK_SIZE] for start in range(0, len(ids), IN_CHUNK_SIZE)]
+
+
+ORGANIZATION_COLUMNS = (
+    models.Organization.id,
+    models.Organization.name,
+    models.Organization.location_x,
+    models.Organization.location_y,
+)
+
+
+def aggregated_wastes(storage_id: Any, waste_type: Any, amount: Any) -> ScalarSelect[Any]:
+    """
+    `WASTE_TYPE:amount` pairs of the enclosing storage, joined with commas into a single column.
+    """
+    return (
+        select(func.aggregate_strings(cast(waste_type, String) + ":" + cast(amount, String), ","))
+        .where(storage_id == models.Storage.id)
+        .scalar_subquery()
+    )
+
+
+def parse_wastes(wastes: Optional[str], amount_key: str) -> list[dict[str, str]]:
+    if not wastes:
+        return []
+    # The aggregate has no order, sorting the pairs sorts them by waste type.
+    return [
+        {"waste_type": waste_type, amount_key: amount}
+        for waste_type, amount in (pair.split(":") for pair in sorted(wastes.split(",")))
+    ]
+
+
+# Capacities and current levels are aggregated into the storage row, so a storage
+# and everything it lists are read with one query and one row.
+STORAGE_COLUMNS = (
+    models.Storage.id,
+    models.Storage.name,
+    models.Storage.location_x,
+    models.Storage.location_y,
+    aggregated_wastes(
+        models.StorageCapacity.storage_id,
+        models.StorageCapacity.waste_type,
+        models.StorageCapacity.capacity,
+    ).label("capacities"),
+    aggregated_wastes(
+        models.StorageCurrentLevel.storage_id,
+        models.StorageCurrentLevel.waste_type,
+        models.StorageCurrentLevel.current_amount,
+    ).label("current_levels"),
+)
+
+
+def storages_from_rows(rows: Sequence[Any]) -> list[Storage]:
+    return STORAGE_LIST.validate_python([
+        {
+            "id": storage_id,
+            "name": name,
+            "location_x": location_x,
+            "location_y": location_y,
+            "capacities": parse_wastes(capacities, "capacity"),
+            "current_levels": parse_wastes(current_levels, "current_amount"),
+        }
+        for storage_id, name, location_x, location_y, capacities, current_levels in rows
+    ])
+
+
+async def sync_wastes(
+        session: AsyncSession,
+        model: Any,
+        owner_key: str,
+        owner_id: int,
+        amount_key: str,
+        amounts: dict[str, int],
+) -> bool:
+    """
+    Make the waste rows of one owner match `amounts`, keyed by waste type, deleting, updating
+    and inserting only the rows that differ. Returns whether anything was written.
+    """
+    result = await session.execute(
+        select(model.id, model.waste_type, getattr(model, amount_key)).where(getattr(model, owner_key) == owner_id)
+    )
+    current = {waste_type.value: (row_id, amount) for row_id, waste_type, amount in result}
+    removed = sorted(row_id for waste_type, (row_id, _) in current.items() if waste_type not in amounts)
+    changed = [
+        {"id": current[waste_type][0], amount_key: amount}
+        for waste_type, amount in sorted(amounts.items())
+        if waste_type in current and current[waste_type][1] != amount
+    ]
+    added = [
+        {owner_key: owner_id, "waste_type": waste_type, amount_key: amount}
+        for waste_type, amount in sorted(amounts.items())
+        if waste_type not in current
+    ]
+    if removed:
+        await session.execute(delete(model).where(model.id.in_(removed)))
+    if changed:
+        await session.execute(update(model), changed)
+    if added:
+        await session.execute(insert(model), added)
+    return bool(removed or changed or added)
+
+
+def changed_values(row: Any, values: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in values.items() if getattr(row, key) != value}
+
 
 class OrganizationSqlaGateway(OrganizationDatabaseGateway):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+            self,
+            session: AsyncSession,
+            stream_session_maker: Optional[async_sessionmaker[AsyncSession]] = None,
+    ):
         self.session = session
+        self.stream_session_maker = stream_session_maker
 
-    async def get_organizations(self) -> list[Organization]:
-        query = select(models.Organization).options(selectinload(models.Organization.generated_waste))
+    def _organizations_query(self, after_id: Optional[int], limit: Optional[int]) -> Select:
+        query = select(*ORGANIZATION_COLUMNS).order_by(models.Organization.id)
+        if after_id is not None:
+            query = query.where(models.Organization.id > after_id)
+        return query.limit(limit)
+
+    async def _organizations_from_rows(self, session: AsyncSession, rows: Sequence[Any]) -> list[Organization]:
+        """
+        Attach the generated waste to organization rows.
+
+        Reads select plain columns, so no entities are loaded into the identity map.
+        """
+        generated_waste: defaultdict[int, list[dict[str, Any]]] = defaultdict(list)
+        for organization_ids in chunks([row.id for row in rows]):
+            result = await session.execute(
+                select(
+                    models.OrganizationWaste.organization_id,
+                    models.OrganizationWaste.waste_type,
+                    models.OrganizationWaste.amount,
+                )
+                .where(models.OrganizationWaste.organization_id.in_(organization_ids))
+                .order_by(models.OrganizationWaste.organization_id, models.OrganizationWaste.waste_type)
+            )
+            for organization_id, waste_type, amount in result:
+                generated_waste[organization_id].append({"waste_type": waste_type.value, "amount": amount})
+        return ORGANIZATION_LIST.validate_python([
+            {
+                "id": row.id,
+                "name": row.name,
+                "location_x": row.location_x,
+                "location_y": row.location_y,
+                "generated_waste": generated_waste[row.id],
+            }
+            for row in rows
+        ])
+
+    async def get_organizations(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> list[
+        Organization]:
+        query = self._organizations_query(after_id, limit)
         result = await self.session.execute(query)
-        organization_list = [Organization.model_validate(organization) for organization in result.scalars().all()]
+        organization_list = await self._organizations_from_rows(self.session, result.all())
+        await release_connection(self.session)
         return organization_list
 
+    async def iter_organizations(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[
+        Organization]:
+        query = self._organizations_query(after_id, limit).execution_options(yield_per=STREAM_YIELD_PER)
+        async with stream_session(self.session, self.stream_session_maker) as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                for organization in await self._organizations_from_rows(session, rows):
+                    yield organization
+
+    async def get_version(self) -> int:
+        return await get_table_version(self.session, "organizations")
+
     async def get_organization_by_id(self, organization_id: int) -> Optional[Organization]:
-        query = select(models.Organization).where(models.Organization.id == organization_id).options(
-            selectinload(models.Organization.generated_waste))
-        result = await self.session.execute(query)
-        organization = result.scalars().first()
-        if organization:
-            return Organization.model_validate(organization)
-        return None
+        result = await self.session.execute(
+            select(*ORGANIZATION_COLUMNS).where(models.Organization.id == organization_id)
+        )
+        organizations = await self._organizations_from_rows(self.session, result.all())
+        await release_connection(self.session)
+        return organizations[0] if organizations else None
+
+    async def get_organizations_by_ids(self, organization_ids: list[int]) -> list[Organization]:
+        result = await self.session.execute(
+            select(*ORGANIZATION_COLUMNS)
+            .where(models.Organization.id.in_(organization_ids))
+            .order_by(models.Organization.id)
+        )
+        organizations = await self._organizations_from_rows(self.session, result.all())
+        await release_connection(self.session)
+        return organizations
+
+    async def get_organization_locations(self, organization_ids: list[int]) -> list[Location]:
+        result = await self.session.execute(
+            select(models.Organization.id, models.Organization.location_x, models.Organization.location_y)
+            .where(models.Organization.id.in_(organization_ids))
+        )
+        locations = [Location(id=row.id, location_x=row.location_x, location_y=row.location_y) for row in result]
+        await release_connection(self.session)
+        return locations
 
     async def create_organization(self, organization_data: OrganizationCreate) -> int:
+        mark_changed(self.session, "organizations")
         new_organization = models.Organization(
             name=organization_data.name,
             location_x=organization_data.location_x,
@@ -46,82 +324,381 @@ class OrganizationSqlaGateway(OrganizationDatabaseGateway):
         await self.session.flush()
         return new_organization.id
 
+    async def create_organizations(self, organizations_data: list[OrganizationCreate]) -> list[int]:
+        """
+        Insert the organizations with one multi-row `INSERT ... RETURNING` and their generated
+        waste with one bulk `INSERT`, without building ORM entities.
+        """
+        if not organizations_data:
+            return []
+        mark_changed(self.session, "organizations")
+        result = await self.session.execute(
+            insert(models.Organization).returning(models.Organization.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": organization_data.name,
+                    "location_x": organization_data.location_x,
+                    "location_y": organization_data.location_y,
+                }
+                for organization_data in organizations_data
+            ],
+        )
+        organization_ids = list(result.scalars())
+        generated_waste = [
+            {"organization_id": organization_id, "waste_type": waste_item.waste_type, "amount": waste_item.amount}
+            for organization_id, organization_data in zip(organization_ids, organizations_data)
+            for waste_item in organization_data.generated_waste
+        ]
+        if generated_waste:
+            await self.session.execute(insert(models.OrganizationWaste), generated_waste)
+        return organization_ids
+
     async def delete_organization_by_id(self, organization_id: int) -> Optional[int]:
+        deleted_ids = await self.delete_organizations([organization_id])
+        return deleted_ids[0] if deleted_ids else None
+
+    async def delete_organizations(self, organization_ids: list[int]) -> list[int]:
+        """
+        One `DELETE ... RETURNING` per chunk of ids, generated waste is removed by `ON DELETE CASCADE`.
+        """
+        deleted_ids: list[int] = []
+        for chunk in chunks(sorted(set(organization_ids))):
+            result = await self.session.execute(
+                delete(models.Organization).where(models.Organization.id.in_(chunk)).returning(models.Organization.id)
+            )
+            deleted_ids.extend(result.scalars())
+        if deleted_ids:
+            mark_changed(self.session, "organizations")
+        return sorted(deleted_ids)
+
+    async def _update_organization(
+            self,
+            organization_id: int,
+            values: dict[str, Any],
+            generated_waste: Optional[list[OrganizationWaste]],
+    ) -> Optional[int]:
+        """
+        Write only the columns and waste rows that differ from `values` and `generated_waste`,
+        leaving the waste rows alone when `generated_waste` is None.
+        """
+        pin_connection(self.session)
         result = await self.session.execute(
-            select(models.Organization).where(models.Organization.id == organization_id))
-        organization = result.scalars().first()
-        if not organization:
+            select(*ORGANIZATION_COLUMNS).where(models.Organization.id == organization_id).with_for_update()
+        )
+        row = result.first()
+        if row is None:
             return None
-        await self.session.delete(organization)
-        return organization.id
+        changed = changed_values(row, values)
+        if changed:
+            await self.session.execute(
+                update(models.Organization).where(models.Organization.id == organization_id).values(changed)
+            )
+        written = bool(changed)
+        if generated_waste is not None:
+            written = await sync_wastes(
+                self.session,
+                models.OrganizationWaste,
+                "organization_id",
+                organization_id,
+                "amount",
+                {WasteType(waste_item.waste_type).value: waste_item.amount for waste_item in generated_waste},
+            ) or written
+        if written:
+            mark_changed(self.session, "organizations")
+        return organization_id
 
     async def update_organization_by_id(self, organization_id: int, organization_data: OrganizationCreate) -> Optional[
         int]:
+        return await self._update_organization(
+            organization_id,
+            organization_data.model_dump(exclude={"generated_waste"}),
+            organization_data.generated_waste,
+        )
+
+    async def patch_organization_by_id(self, organization_id: int, organization_data: OrganizationUpdate) -> Optional[
+        int]:
+        return await self._update_organization(
+            organization_id,
+            organization_data.model_dump(exclude_unset=True, exclude={"generated_waste"}),
+            organization_data.generated_waste,
+        )
+
+    async def lock_organization_waste(
+            self,
+            organization_id: int,
+            waste_type: WasteType
+    ) -> Optional[OrganizationWasteState]:
+        pin_connection(self.session)
         result = await self.session.execute(
-            select(models.Organization).
-            where(models.Organization.id == organization_id
-                  ).options(selectinload(models.Organization.generated_waste))
+            select(models.Organization.id, models.OrganizationWaste.amount)
+            .outerjoin(
+                models.OrganizationWaste,
+                and_(
+                    models.OrganizationWaste.organization_id == models.Organization.id,
+                    models.OrganizationWaste.waste_type == waste_type,
+                )
+            )
+            .where(models.Organization.id == organization_id)
+            .with_for_update(of=models.Organization)
         )
-        organization = result.scalars().first()
-        if not organization:
+        row = result.first()
+        if row is None:
             return None
-        organization.name = organization_data.name
-        organization.location_x = organization_data.location_x
-        organization.location_y = organization_data.location_y
-        organization.generated_waste = [
-            models.OrganizationWaste(waste_type=w.waste_type, amount=w.amount) for w in
-            organization_data.generated_waste
+        return OrganizationWasteState(organization_id=row.id, waste_type=waste_type, amount=row.amount)
+
+    async def lock_organization_wastes(
+            self,
+            keys: list[tuple[int, WasteType]]
+    ) -> list[OrganizationWasteState]:
+        pin_connection(self.session)
+        organization_ids = sorted({organization_id for organization_id, _ in keys})
+        waste_types = {WasteType(waste_type) for _, waste_type in keys}
+        result = await self.session.execute(
+            select(models.Organization.id, models.OrganizationWaste.waste_type, models.OrganizationWaste.amount)
+            .outerjoin(
+                models.OrganizationWaste,
+                and_(
+                    models.OrganizationWaste.organization_id == models.Organization.id,
+                    models.OrganizationWaste.waste_type.in_(waste_types),
+                )
+            )
+            .where(models.Organization.id.in_(organization_ids))
+            .order_by(models.Organization.id)
+            .with_for_update(of=models.Organization)
+        )
+        existing_ids = set()
+        amounts = {}
+        for row in result:
+            existing_ids.add(row.id)
+            if row.waste_type is not None:
+                amounts[row.id, WasteType(row.waste_type.value)] = row.amount
+        return [
+            OrganizationWasteState(
+                organization_id=organization_id,
+                waste_type=waste_type,
+                amount=amounts.get((organization_id, waste_type))
+            )
+            for organization_id, waste_type in dict.fromkeys(
+                (organization_id, WasteType(waste_type)) for organization_id, waste_type in keys
+            )
+            if organization_id in existing_ids
         ]
-        return organization.id
 
-    async def reduce_organization_waste(self, organization_id: int, waste_type: WasteType, amount: int) -> None:
+    async def reduce_organization_waste(
+            self,
+            organization_id: int,
+            waste_type: WasteType,
+            amount: int
+    ) -> Optional[int]:
+        mark_changed(self.session, "organizations")
         result = await self.session.execute(
-            select(models.OrganizationWaste)
+            update(models.OrganizationWaste)
             .where(models.OrganizationWaste.organization_id == organization_id)
             .where(models.OrganizationWaste.waste_type == waste_type)
+            .where(models.OrganizationWaste.amount >= amount)
+            .values(amount=models.OrganizationWaste.amount - amount)
+            .returning(models.OrganizationWaste.amount)
         )
-        organization_waste = result.scalars().first()
-
-        if isinstance(organization_waste, models.OrganizationWaste):
-            organization_waste.amount -= amount
+        return result.scalar_one_or_none()
 
-        await self.session.flush()
+    async def reduce_organization_wastes(self, transfers: list[WasteTransferItem]) -> None:
+        mark_changed(self.session, "organizations")
+        amounts: Counter[tuple[int, WasteType]] = Counter()
+        for transfer in transfers:
+            amounts[transfer.organization_id, WasteType(transfer.waste_type)] += transfer.amount
+        if not amounts:
+            return
+        # Executed on the connection: an ORM bulk UPDATE would match rows by primary key only.
+        connection = await self.session.connection()
+        await connection.execute(
+            update(models.OrganizationWaste)
+            .where(models.OrganizationWaste.organization_id == bindparam("b_organization_id"))
+            .where(models.OrganizationWaste.waste_type == bindparam("b_waste_type"))
+            .values(amount=models.OrganizationWaste.amount - bindparam("b_amount")),
+            [
+                {"b_organization_id": organization_id, "b_waste_type": waste_type, "b_amount": amount}
+                for (organization_id, waste_type), amount in amounts.items()
+            ]
+        )
 
-    async def generate_waste(self, organization_id: int, waste_type: WasteType, amount: int) -> None:
+    async def generate_waste(self, organization_id: int, waste_type: WasteType, amount: int) -> int:
+        mark_changed(self.session, "organizations")
         result = await self.session.execute(
-            select(models.OrganizationWaste)
+            update(models.OrganizationWaste)
             .where(models.OrganizationWaste.organization_id == organization_id)
             .where(models.OrganizationWaste.waste_type == waste_type)
+            .values(amount=models.OrganizationWaste.amount + amount)
+            .returning(models.OrganizationWaste.amount)
         )
-        organization_waste = result.scalars().first()
+        generated_amount = result.scalar_one_or_none()
+        if generated_amount is not None:
+            return generated_amount
+        await self.session.execute(
+            insert(models.OrganizationWaste)
+            .values(organization_id=organization_id, waste_type=waste_type, amount=amount)
+        )
+        return amount
 
-        if isinstance(organization_waste, models.OrganizationWaste):
-            organization_waste.amount += amount
+
+def sufficient_capacity_query(generated_waste: list[OrganizationWaste]) -> Optional[Select]:
+    """
+    Select ids of storages whose free capacity covers every waste item.
+
+    Returns None when nothing has to be stored, i.e. every storage qualifies.
+    """
+    required: dict[WasteType, int] = {}
+    for waste in generated_waste:
+        if waste.amount > 0:
+            required[waste.waste_type] = max(waste.amount, required.get(waste.waste_type, 0))
+    if not required:
+        return None
+
+    free_capacity = models.StorageCapacity.capacity - func.coalesce(models.StorageCurrentLevel.current_amount, 0)
+    return select(
+        models.StorageCapacity.storage_id
+    ).outerjoin(
+        models.StorageCurrentLevel,
+        and_(
+            models.StorageCurrentLevel.storage_id == models.StorageCapacity.storage_id,
+            models.StorageCurrentLevel.waste_type == models.StorageCapacity.waste_type,
+        )
+    ).where(
+        or_(*(
+            and_(models.StorageCapacity.waste_type == waste_type, free_capacity >= amount)
+            for waste_type, amount in required.items()
+        ))
+    ).group_by(
+        models.StorageCapacity.storage_id
+    ).having(
+        func.count(distinct(models.StorageCapacity.waste_type)) == len(required)
+    )
 
 
 class StorageSqlaGateway(StorageDatabaseGateway):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+            self,
+            session: AsyncSession,
+            stream_session_maker: Optional[async_sessionmaker[AsyncSession]] = None,
+    ):
         self.session = session
+        self.stream_session_maker = stream_session_maker
+
+    def _storages_query(self, after_id: Optional[int], limit: Optional[int]) -> Select:
+        query = select(*STORAGE_COLUMNS).order_by(models.Storage.id)
+        if after_id is not None:
+            query = query.where(models.Storage.id > after_id)
+        return query.limit(limit)
 
-    async def get_storages(self) -> list[Storage]:
-        query = select(models.Storage).options(
-            selectinload(models.Storage.capacities)
-        ).options(
-            selectinload(models.Storage.current_levels))
+    async def get_storages(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> list[Storage]:
+        query = self._storages_query(after_id, limit)
         result = await self.session.execute(query)
-        storage_list = [Storage.model_validate(storage) for storage in result.scalars().all()]
+        storage_list = storages_from_rows(result.all())
+        await release_connection(self.session)
         return storage_list
 
+    async def iter_storages(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[
+        Storage]:
+        query = self._storages_query(after_id, limit).execution_options(yield_per=STREAM_YIELD_PER)
+        async with stream_session(self.session, self.stream_session_maker) as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                for storage in storages_from_rows(rows):
+                    yield storage
+
+    async def get_version(self) -> int:
+        return await get_table_version(self.session, "storages")
+
     async def get_storage_by_id(self, storage_id: int) -> Optional[Storage]:
-        query = select(models.Storage).where(models.Storage.id == storage_id).options(
-            selectinload(models.Storage.capacities)
-        ).options(
-            selectinload(models.Storage.current_levels))
-        result = await self.session.execute(query)
-        storage = result.scalars().first()
-        return Storage.model_validate(storage) if storage else None
+        result = await self.session.execute(select(*STORAGE_COLUMNS).where(models.Storage.id == storage_id))
+        storages = storages_from_rows(result.all())
+        await release_connection(self.session)
+        return storages[0] if storages else None
+
+    async def iter_available_storages(
+            self,
+            location_x: float,
+            location_y: float,
+            generated_waste: list[OrganizationWaste],
+            max_distance: Optional[float] = None,
+            limit: Optional[int] = None,
+            offset: int = 0,
+    ) -> AsyncGenerator[Storage, None]:
+        distance = (
+            (models.Storage.location_x - location_x) * (models.Storage.location_x - location_x)
+            + (models.Storage.location_y - location_y) * (models.Storage.location_y - location_y)
+        )
+        query = (
+            select(*STORAGE_COLUMNS)
+            .order_by(distance, models.Storage.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        if max_distance is not None:
+            # The bounding box lets the database narrow the scan with the location index.
+            query = query.where(
+                models.Storage.location_x.between(location_x - max_distance, location_x + max_distance),
+                models.Storage.location_y.between(location_y - max_distance, location_y + max_distance),
+                distance <= max_distance * max_distance,
+            )
+        sufficient_capacity = sufficient_capacity_query(generated_waste)
+        if sufficient_capacity is not None:
+            query = query.where(models.Storage.id.in_(sufficient_capacity))
+        try:
+            result = await self.session.execute(query)
+            for storage in storages_from_rows(result.all()):
+                yield storage
+        finally:
+            # Callers may stop early, closing the generator at a yield.
+            await release_connection(self.session)
+
+    async def get_free_capacities(self, waste_types: list[WasteType]) -> list[StorageFreeCapacity]:
+        if not waste_types:
+            return []
+        free_capacity = models.StorageCapacity.capacity - func.coalesce(models.StorageCurrentLevel.current_amount, 0)
+        result = await self.session.execute(
+            select(
+                models.Storage.id,
+                models.Storage.location_x,
+                models.Storage.location_y,
+                models.StorageCapacity.waste_type,
+                free_capacity.label("free_capacity"),
+            )
+            .join(models.StorageCapacity, models.StorageCapacity.storage_id == models.Storage.id)
+            .outerjoin(
+                models.StorageCurrentLevel,
+                and_(
+                    models.StorageCurrentLevel.storage_id == models.Storage.id,
+                    models.StorageCurrentLevel.waste_type == models.StorageCapacity.waste_type,
+                )
+            )
+            .where(models.StorageCapacity.waste_type.in_(waste_types))
+            .where(free_capacity > 0)
+            .order_by(models.Storage.id)
+        )
+        free_capacities = [
+            StorageFreeCapacity(
+                storage_id=row.id,
+                location_x=row.location_x,
+                location_y=row.location_y,
+                waste_type=WasteType(row.waste_type.value),
+                free_capacity=row.free_capacity,
+            )
+            for row in result
+        ]
+        await release_connection(self.session)
+        return free_capacities
+
+    async def get_storage_locations(self, storage_ids: list[int]) -> list[Location]:
+        result = await self.session.execute(
+            select(models.Storage.id, models.Storage.location_x, models.Storage.location_y)
+            .where(models.Storage.id.in_(storage_ids))
+        )
+        locations = [Location(id=row.id, location_x=row.location_x, location_y=row.location_y) for row in result]
+        await release_connection(self.session)
+        return locations
 
     async def create_storage(self, storage_data: StorageCreate) -> int:
+        mark_changed(self.session, "storages")
         new_storage = models.Storage(
             name=storage_data.name,
             location_x=storage_data.location_x,
@@ -146,56 +723,284 @@ class StorageSqlaGateway(StorageDatabaseGateway):
         await self.session.flush()
         return new_storage.id
 
-    async def update_storage_by_id(self, storage_id: int, storage_data: StorageCreate) -> Optional[int]:
+    async def create_storages(self, storages_data: list[StorageCreate]) -> list[int]:
+        """
+        Insert the storages with one multi-row `INSERT ... RETURNING` and their capacities and
+        current levels with one bulk `INSERT` each, without building ORM entities.
+        """
+        if not storages_data:
+            return []
+        mark_changed(self.session, "storages")
         result = await self.session.execute(
-            select(models.Storage).
-            where(models.Storage.id == storage_id
-                  ).options(
-                selectinload(models.Storage.capacities)
-            ).options(
-                selectinload(models.Storage.current_levels)
-            )
+            insert(models.Storage).returning(models.Storage.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": storage_data.name,
+                    "location_x": storage_data.location_x,
+                    "location_y": storage_data.location_y,
+                }
+                for storage_data in storages_data
+            ],
         )
-        storage = result.scalars().first()
-        if not storage:
-            return None
-        storage.name = storage_data.name
-        storage.location_x = storage_data.location_x
-        storage.location_y = storage_data.location_y
-        storage.capacities = [
-            models.StorageCapacity(
-                waste_type=waste_item.waste_type,
-                capacity=waste_item.capacity
-            )
+        storage_ids = list(result.scalars())
+        capacities = [
+            {"storage_id": storage_id, "waste_type": waste_item.waste_type, "capacity": waste_item.capacity}
+            for storage_id, storage_data in zip(storage_ids, storages_data)
             for waste_item in storage_data.capacities
         ]
-        storage.current_levels = [
-            models.StorageCurrentLevel(
-                waste_type=waste_item.waste_type,
-                current_amount=waste_item.current_amount
-            )
+        if capacities:
+            await self.session.execute(insert(models.StorageCapacity), capacities)
+        current_levels = [
+            {
+                "storage_id": storage_id,
+                "waste_type": waste_item.waste_type,
+                "current_amount": waste_item.current_amount,
+            }
+            for storage_id, storage_data in zip(storage_ids, storages_data)
             for waste_item in storage_data.current_levels
         ]
-        return storage.id
+        if current_levels:
+            await self.session.execute(insert(models.StorageCurrentLevel), current_levels)
+        return storage_ids
+
+    async def _update_storage(
+            self,
+            storage_id: int,
+            values: dict[str, Any],
+            capacities: Optional[list[StorageCapacity]],
+            current_levels: Optional[list[StorageCurrentLevel]],
+    ) -> Optional[int]:
+        """
+        Write only the columns, capacities and current levels that differ from the given ones,
+        leaving capacities or current levels alone when they are None.
+        """
+        pin_connection(self.session)
+        result = await self.session.execute(
+            select(models.Storage.id, models.Storage.name, models.Storage.location_x, models.Storage.location_y)
+            .where(models.Storage.id == storage_id)
+            .with_for_update()
+        )
+        row = result.first()
+        if row is None:
+            return None
+        changed = changed_values(row, values)
+        if changed:
+            await self.session.execute(
+                update(models.Storage).where(models.Storage.id == storage_id).values(changed)
+            )
+        written = bool(changed)
+        if capacities is not None:
+            written = await sync_wastes(
+                self.session,
+                models.StorageCapacity,
+                "storage_id",
+                storage_id,
+                "capacity",
+                {WasteType(waste_item.waste_type).value: waste_item.capacity for waste_item in capacities},
+            ) or written
+        if current_levels is not None:
+            written = await sync_wastes(
+                self.session,
+                models.StorageCurrentLevel,
+                "storage_id",
+                storage_id,
+                "current_amount",
+                {WasteType(waste_item.waste_type).value: waste_item.current_amount for waste_item in current_levels},
+            ) or written
+        if written:
+            mark_changed(self.session, "storages")
+        return storage_id
+
+    async def update_storage_by_id(self, storage_id: int, storage_data: StorageCreate) -> Optional[int]:
+        return await self._update_storage(
+            storage_id,
+            storage_data.model_dump(exclude={"capacities", "current_levels"}),
+            storage_data.capacities,
+            storage_data.current_levels,
+        )
+
+    async def patch_storage_by_id(self, storage_id: int, storage_data: StorageUpdate) -> Optional[int]:
+        return await self._update_storage(
+            storage_id,
+            storage_data.model_dump(exclude_unset=True, exclude={"capacities", "current_levels"}),
+            storage_data.capacities,
+            storage_data.current_levels,
+        )
 
     async def delete_storage_by_id(self, storage_id: int) -> Optional[int]:
+        deleted_ids = await self.delete_storages([storage_id])
+        return deleted_ids[0] if deleted_ids else None
+
+    async def delete_storages(self, storage_ids: list[int]) -> list[int]:
+        """
+        One `DELETE ... RETURNING` per chunk of ids, capacities and current levels are removed
+        by `ON DELETE CASCADE`.
+        """
+        deleted_ids: list[int] = []
+        for chunk in chunks(sorted(set(storage_ids))):
+            result = await self.session.execute(
+                delete(models.Storage).where(models.Storage.id.in_(chunk)).returning(models.Storage.id)
+            )
+            deleted_ids.extend(result.scalars())
+        if deleted_ids:
+            mark_changed(self.session, "storages")
+        return sorted(deleted_ids)
+
+    async def lock_storage_waste(self, storage_id: int, waste_type: WasteType) -> Optional[StorageWasteState]:
+        pin_connection(self.session)
         result = await self.session.execute(
-            select(models.Storage).where(models.Storage.id == storage_id))
-        storage = result.scalars().first()
-        if not storage:
+            select(models.Storage.id, models.StorageCapacity.capacity, models.StorageCurrentLevel.current_amount)
+            .outerjoin(
+                models.StorageCapacity,
+                and_(
+                    models.StorageCapacity.storage_id == models.Storage.id,
+                    models.StorageCapacity.waste_type == waste_type,
+                )
+            )
+            .outerjoin(
+                models.StorageCurrentLevel,
+                and_(
+                    models.StorageCurrentLevel.storage_id == models.Storage.id,
+                    models.StorageCurrentLevel.waste_type == waste_type,
+                )
+            )
+            .where(models.Storage.id == storage_id)
+            .with_for_update(of=models.Storage)
+        )
+        row = result.first()
+        if row is None:
             return None
-        await self.session.delete(storage)
-        return storage.id
+        return StorageWasteState(
+            storage_id=row.id,
+            waste_type=waste_type,
+            capacity=row.capacity,
+            current_amount=row.current_amount
+        )
+
+    async def lock_storage_wastes(self, keys: list[tuple[int, WasteType]]) -> list[StorageWasteState]:
+        pin_connection(self.session)
+        storage_ids = sorted({storage_id for storage_id, _ in keys})
+        waste_types = {WasteType(waste_type) for _, waste_type in keys}
+        result = await self.session.execute(
+            select(
+                models.Storage.id,
+                models.StorageCapacity.waste_type,
+                models.StorageCapacity.capacity,
+                models.StorageCurrentLevel.current_amount
+            )
+            .outerjoin(
+                models.StorageCapacity,
+                and_(
+                    models.StorageCapacity.storage_id == models.Storage.id,
+                    models.StorageCapacity.waste_type.in_(waste_types),
+                )
+            )
+            .outerjoin(
+                models.StorageCurrentLevel,
+                and_(
+                    models.StorageCurrentLevel.storage_id == models.Storage.id,
+                    models.StorageCurrentLevel.waste_type == models.StorageCapacity.waste_type,
+                )
+            )
+            .where(models.Storage.id.in_(storage_ids))
+            .order_by(models.Storage.id)
+            .with_for_update(of=models.Storage)
+        )
+        existing_ids = set()
+        levels = {}
+        for row in result:
+            existing_ids.add(row.id)
+            if row.waste_type is not None:
+                levels[row.id, WasteType(row.waste_type.value)] = (row.capacity, row.current_amount)
+        states = []
+        for storage_id, waste_type in dict.fromkeys(
+                (storage_id, WasteType(waste_type)) for storage_id, waste_type in keys
+        ):
+            if storage_id not in existing_ids:
+                continue
+            capacity, current_amount = levels.get((storage_id, waste_type), (None, None))
+            states.append(StorageWasteState(
+                storage_id=storage_id,
+                waste_type=waste_type,
+                capacity=capacity,
+                current_amount=current_amount
+            ))
+        return states
 
-    async def add_waste_to_storage(self, storage_id: int, waste_type: WasteType, amount: int) -> None:
+    async def add_waste_to_storage(self, storage_id: int, waste_type: WasteType, amount: int) -> Optional[int]:
+        mark_changed(self.session, "storages")
+        capacity = select(models.StorageCapacity.capacity).where(
+            models.StorageCapacity.storage_id == storage_id,
+            models.StorageCapacity.waste_type == waste_type,
+        ).scalar_subquery()
         result = await self.session.execute(
-            select(models.StorageCurrentLevel)
+            update(models.StorageCurrentLevel)
             .where(models.StorageCurrentLevel.storage_id == storage_id)
             .where(models.StorageCurrentLevel.waste_type == waste_type)
+            .where(models.StorageCurrentLevel.current_amount + amount <= capacity)
+            .values(current_amount=models.StorageCurrentLevel.current_amount + amount)
+            .returning(models.StorageCurrentLevel.current_amount)
         )
-        storage_level = result.scalars().first()
+        current_amount = result.scalar_one_or_none()
+        if current_amount is not None:
+            return current_amount
 
-        if isinstance(storage_level, models.StorageCurrentLevel):
-            storage_level.current_amount += amount
+        # A storage may have a capacity for the waste type but no level row yet.
+        level_exists = select(models.StorageCurrentLevel.id).where(
+            models.StorageCurrentLevel.storage_id == storage_id,
+            models.StorageCurrentLevel.waste_type == waste_type,
+        ).exists()
+        result = await self.session.execute(
+            insert(models.StorageCurrentLevel)
+            .from_select(
+                ["storage_id", "waste_type", "current_amount"],
+                select(
+                    models.StorageCapacity.storage_id,
+                    models.StorageCapacity.waste_type,
+                    literal(amount),
+                ).where(
+                    models.StorageCapacity.storage_id == storage_id,
+                    models.StorageCapacity.waste_type == waste_type,
+                    models.StorageCapacity.capacity >= amount,
+                    ~level_exists,
+                )
+            )
+            .returning(models.StorageCurrentLevel.current_amount)
+        )
+        return result.scalar_one_or_none()
 
-        await self.session.flush()
+    async def add_waste_to_storages(self, transfers: list[WasteTransferItem]) -> None:
+        mark_changed(self.session, "storages")
+        amounts: Counter[tuple[int, WasteType]] = Counter()
+        for transfer in transfers:
+            amounts[transfer.storage_id, WasteType(transfer.waste_type)] += transfer.amount
+        if not amounts:
+            return
+        parameters = [
+            {"b_storage_id": storage_id, "b_waste_type": waste_type, "b_amount": amount}
+            for (storage_id, waste_type), amount in amounts.items()
+        ]
+        storage_id_param = bindparam("b_storage_id", type_=models.StorageCurrentLevel.storage_id.type)
+        waste_type_param = bindparam("b_waste_type", type_=models.StorageCurrentLevel.waste_type.type)
+        amount_param = bindparam("b_amount", type_=models.StorageCurrentLevel.current_amount.type)
+        # Executed on the connection: an ORM bulk UPDATE would match rows by primary key only.
+        connection = await self.session.connection()
+        await connection.execute(
+            update(models.StorageCurrentLevel)
+            .where(models.StorageCurrentLevel.storage_id == storage_id_param)
+            .where(models.StorageCurrentLevel.waste_type == waste_type_param)
+            .values(current_amount=models.StorageCurrentLevel.current_amount + amount_param),
+            parameters
+        )
+        # Rows updated above already exist, so this only creates the missing levels.
+        level_exists = select(models.StorageCurrentLevel.id).where(
+            models.StorageCurrentLevel.storage_id == storage_id_param,
+            models.StorageCurrentLevel.waste_type == waste_type_param,
+        ).exists()
+        await connection.execute(
+            insert(models.StorageCurrentLevel).from_select(
+                ["storage_id", "waste_type", "current_amount"],
+                select(storage_id_param, waste_type_param, amount_param).where(~level_exists)
+            ),
+            parameters
+        )
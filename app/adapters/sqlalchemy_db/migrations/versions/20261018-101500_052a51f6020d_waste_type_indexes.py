@@ -0,0 +1,53 @@
+"""waste type indexes
+
+Revision ID: 052a51f6020d
+Revises: 2258e2a81a6b
+Create Date: 2026-10-18 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '052a51f6020d'
+down_revision: Union[str, None] = '2258e2a81a6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Amounts of duplicate rows are summed. A capacity is a limit, not an amount, so duplicate
+# capacities keep the value of the first row, which is the one the gateways have been reading.
+WASTE_TYPE_TABLES = (
+    ('organization_waste', 'organization_id', 'amount'),
+    ('storage_capacities', 'storage_id', None),
+    ('storage_current_levels', 'storage_id', 'current_amount'),
+)
+
+
+def upgrade() -> None:
+    for table, owner_column, amount_column in WASTE_TYPE_TABLES:
+        # Merge duplicate (owner, waste_type) rows into the first one, then drop the rest.
+        if amount_column is not None:
+            op.execute(sa.text(
+                f"UPDATE {table} SET {amount_column} = "
+                f"(SELECT SUM(duplicate.{amount_column}) FROM {table} AS duplicate "
+                f"WHERE duplicate.{owner_column} = {table}.{owner_column} "
+                f"AND duplicate.waste_type = {table}.waste_type) "
+                f"WHERE id IN (SELECT min_id FROM (SELECT MIN(id) AS min_id FROM {table} "
+                f"GROUP BY {owner_column}, waste_type HAVING COUNT(*) > 1) AS merged)"
+            ))
+        op.execute(sa.text(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT min_id FROM (SELECT MIN(id) AS min_id FROM {table} GROUP BY {owner_column}, waste_type) AS keep)"
+        ))
+        op.create_index(f'ix_{table}_{owner_column}_waste_type', table, [owner_column, 'waste_type'], unique=True)
+    op.create_index('ix_storages_location_x_location_y', 'storages', ['location_x', 'location_y'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_storages_location_x_location_y', table_name='storages')
+    for table, owner_column, _ in reversed(WASTE_TYPE_TABLES):
+        op.drop_index(f'ix_{table}_{owner_column}_waste_type', table_name=table)
@@ -0,0 +1,34 @@
+"""table versions
+
+Revision ID: 7c1e5b9a4d2f
+Revises: 052a51f6020d
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5b9a4d2f'
+down_revision: Union[str, None] = '052a51f6020d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    table_versions = op.create_table('table_versions',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(table_versions, [
+        {'name': 'organizations', 'version': 0},
+        {'name': 'storages', 'version': 0},
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
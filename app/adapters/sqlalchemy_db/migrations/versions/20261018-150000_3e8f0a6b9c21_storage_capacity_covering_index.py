@@ -0,0 +1,41 @@
+"""storage capacity covering index
+
+Revision ID: 3e8f0a6b9c21
+Revises: 7c1e5b9a4d2f
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8f0a6b9c21'
+down_revision: Union[str, None] = '7c1e5b9a4d2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Storage reads aggregate the capacities of every storage they return. Carrying the capacity in the
+    # (storage_id, waste_type) index lets PostgreSQL answer that from the index alone. Current amounts are
+    # left out: they change on every transfer and would turn those updates into index updates.
+    op.drop_index('ix_storage_capacities_storage_id_waste_type', table_name='storage_capacities')
+    op.create_index(
+        'ix_storage_capacities_storage_id_waste_type',
+        'storage_capacities',
+        ['storage_id', 'waste_type'],
+        unique=True,
+        postgresql_include=['capacity'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_storage_capacities_storage_id_waste_type', table_name='storage_capacities')
+    op.create_index(
+        'ix_storage_capacities_storage_id_waste_type',
+        'storage_capacities',
+        ['storage_id', 'waste_type'],
+        unique=True,
+    )
@@ -0,0 +1,43 @@
+"""cascade waste foreign keys
+
+Revision ID: 9d4b7e2c6a13
+Revises: 3e8f0a6b9c21
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union, Optional
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b7e2c6a13'
+down_revision: Union[str, None] = '3e8f0a6b9c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEYS = [
+    ('organization_waste', 'organization_id', 'organizations'),
+    ('storage_capacities', 'storage_id', 'storages'),
+    ('storage_current_levels', 'storage_id', 'storages'),
+]
+# PostgreSQL's default foreign key name. The init migration created the constraints unnamed,
+# so SQLite, which recreates the tables, reflects them under the same name.
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def set_on_delete(ondelete: Optional[str]) -> None:
+    for table, column, referred_table in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, referred_table, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    # Deleting an organization or a storage removes its waste rows in the same statement.
+    set_on_delete('CASCADE')
+
+
+def downgrade() -> None:
+    set_on_delete(None)
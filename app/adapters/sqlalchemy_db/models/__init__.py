@@ -4,8 +4,8 @@ __all__ = (
     "Organization",
     "OrganizationWaste",
     "StorageCapacity",
-    "StorageCurrentLevel"
-
+    "StorageCurrentLevel",
+    "TableVersion",
 )
 
 from .base import Base
@@ -14,3 +14,4 @@ from .organization import Organization
 from .organization_waste import OrganizationWaste
 from .storage_capacity import StorageCapacity
 from .storage_current_level import StorageCurrentLevel
+from .table_version import TableVersion
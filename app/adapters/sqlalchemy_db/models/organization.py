@@ -17,5 +17,5 @@ class Organization(Base):
     location_y: Mapped[float] = mapped_column(Float)
 
     generated_waste: Mapped[list["OrganizationWaste"]] = relationship(
-        "OrganizationWaste", back_populates="organization", cascade="all, delete-orphan"
+        "OrganizationWaste", back_populates="organization", cascade="all, delete-orphan", passive_deletes=True
     )
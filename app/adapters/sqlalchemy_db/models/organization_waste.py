@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, ForeignKey, Enum
+from sqlalchemy import Integer, ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.adapters.sqlalchemy_db.models import Base
@@ -13,9 +13,12 @@ if TYPE_CHECKING:
 
 class OrganizationWaste(Base):
     __tablename__ = 'organization_waste'
+    __table_args__ = (
+        Index('ix_organization_waste_organization_id_waste_type', 'organization_id', 'waste_type', unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    organization_id: Mapped[int] = mapped_column(ForeignKey('organizations.id'))
+    organization_id: Mapped[int] = mapped_column(ForeignKey('organizations.id', ondelete='CASCADE'))
     waste_type: Mapped[WasteTypeEnum] = mapped_column(Enum(WasteTypeEnum))
     amount: Mapped[int] = mapped_column(Integer)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Float
+from sqlalchemy import Integer, String, Float, Index
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
 from app.adapters.sqlalchemy_db.models import Base
@@ -11,6 +11,9 @@ if TYPE_CHECKING:
 
 class Storage(Base):
     __tablename__ = 'storages'
+    __table_args__ = (
+        Index('ix_storages_location_x_location_y', 'location_x', 'location_y'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String)
@@ -18,8 +21,8 @@ class Storage(Base):
     location_y: Mapped[float] = mapped_column(Float)
 
     capacities: Mapped[list["StorageCapacity"]] = relationship(
-        "StorageCapacity", back_populates="storage", cascade="all, delete-orphan"
+        "StorageCapacity", back_populates="storage", cascade="all, delete-orphan", passive_deletes=True
     )
     current_levels: Mapped[list["StorageCurrentLevel"]] = relationship(
-        "StorageCurrentLevel", back_populates="storage", cascade="all, delete-orphan"
+        "StorageCurrentLevel", back_populates="storage", cascade="all, delete-orphan", passive_deletes=True
     )
\ No newline at end of file
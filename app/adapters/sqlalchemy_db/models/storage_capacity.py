@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Enum, Integer
+from sqlalchemy import ForeignKey, Enum, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.adapters.sqlalchemy_db.models import Base
@@ -12,9 +12,18 @@ if TYPE_CHECKING:
 
 class StorageCapacity(Base):
     __tablename__ = 'storage_capacities'
+    __table_args__ = (
+        Index(
+            'ix_storage_capacities_storage_id_waste_type',
+            'storage_id',
+            'waste_type',
+            unique=True,
+            postgresql_include=['capacity'],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    storage_id: Mapped[int] = mapped_column(ForeignKey('storages.id'))
+    storage_id: Mapped[int] = mapped_column(ForeignKey('storages.id', ondelete='CASCADE'))
     waste_type: Mapped[WasteTypeEnum] = mapped_column(Enum(WasteTypeEnum))
     capacity: Mapped[int] = mapped_column(Integer)
 
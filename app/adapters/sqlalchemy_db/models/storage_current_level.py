@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Integer, ForeignKey, Enum
+from sqlalchemy import Integer, ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.adapters.sqlalchemy_db.models import Base
@@ -12,9 +12,12 @@ if TYPE_CHECKING:
 
 class StorageCurrentLevel(Base):
     __tablename__ = 'storage_current_levels'
+    __table_args__ = (
+        Index('ix_storage_current_levels_storage_id_waste_type', 'storage_id', 'waste_type', unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    storage_id: Mapped[int] = mapped_column(ForeignKey('storages.id'))
+    storage_id: Mapped[int] = mapped_column(ForeignKey('storages.id', ondelete='CASCADE'))
     waste_type: Mapped[WasteTypeEnum] = mapped_column(Enum(WasteTypeEnum))
     current_amount: Mapped[int] = mapped_column(Integer)
 
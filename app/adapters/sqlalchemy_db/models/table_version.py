@@ -0,0 +1,23 @@
+from sqlalchemy import Integer, String, DDL, event
+from sqlalchemy.orm import mapped_column, Mapped
+
+from app.adapters.sqlalchemy_db.models import Base
+
+VERSIONED_TABLES = ('organizations', 'storages')
+
+
+class TableVersion(Base):
+    __tablename__ = 'table_versions'
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+
+
+event.listen(
+    TableVersion.__table__,
+    'after_create',
+    DDL(
+        "INSERT INTO table_versions (name, version) VALUES "
+        + ", ".join(f"('{name}', 0)" for name in VERSIONED_TABLES)
+    )
+)
@@ -0,0 +1,22 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.api.depends_stub import Stub
+from app.application.models.pool import PoolMetrics
+from app.application.protocols.database import ConnectionPoolMonitor
+
+admin_router = APIRouter()
+
+
+@admin_router.get("/pool/", response_model=PoolMetrics)
+async def get_pool_metrics(
+        monitor: Annotated[ConnectionPoolMonitor, Depends(Stub(ConnectionPoolMonitor))],
+) -> PoolMetrics:
+    """
+    Database connection pool utilisation and the number of connects, checkouts
+    and invalidated connections since the application started.
+
+    Pools without a fixed size, such as the one used for in-memory SQLite, report only the counters.
+    """
+    return await monitor.get_pool_metrics()
@@ -0,0 +1,91 @@
+import json
+from typing import Any, AsyncIterator, Iterable, TypeVar
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+from app.api.streaming import NDJSON_MEDIA_TYPE
+
+Item = TypeVar("Item")
+
+BULK_CHUNK_SIZE = 1000
+MAX_BULK_CHUNK_SIZE = 10000
+MAX_BULK_DELETE = 10000
+
+
+class InvalidLineError(Exception):
+    """
+    A line of an NDJSON body that is not a valid item.
+    """
+
+    def __init__(self, line: int, errors: list[Any]):
+        super().__init__(f"Invalid item on line {line}")
+        self.line = line
+        self.errors = errors
+
+
+def bulk_request_body(item_schema: str) -> dict[str, Any]:
+    """
+    OpenAPI `requestBody` of an endpoint reading its items with `read_items`.
+    """
+    item = {"$ref": f"#/components/schemas/{item_schema}"}
+    return {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": item}},
+            NDJSON_MEDIA_TYPE: {"schema": item},
+        },
+    }
+
+
+async def _iterate(items: Iterable[Item]) -> AsyncIterator[Item]:
+    for item in items:
+        yield item
+
+
+async def _ndjson_items(request: Request, adapter: TypeAdapter[Item]) -> AsyncIterator[Item]:
+    line_number = 0
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _validate_line(adapter, line, line_number)
+    if buffer.strip():
+        yield _validate_line(adapter, buffer, line_number + 1)
+
+
+def _validate_line(adapter: TypeAdapter[Item], line: bytes, line_number: int) -> Item:
+    try:
+        return adapter.validate_json(line)
+    except ValidationError as error:
+        raise InvalidLineError(line_number, json.loads(error.json(include_url=False))) from error
+
+
+async def read_items(
+        request: Request,
+        adapter: TypeAdapter[Item],
+        list_adapter: TypeAdapter[list[Item]],
+) -> AsyncIterator[Item]:
+    """
+    Items of a request body sent either as a JSON array or as NDJSON, one item per line.
+
+    A JSON array is validated as a whole before the first item is returned and raises
+    `RequestValidationError`. NDJSON is read and validated line by line while the body
+    is still being received, so an invalid line raises `InvalidLineError` only once
+    the items before it have been consumed.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == NDJSON_MEDIA_TYPE:
+        return _ndjson_items(request, adapter)
+    try:
+        items = list_adapter.validate_json(await request.body())
+    except ValidationError as error:
+        raise RequestValidationError([
+            {**line_error, "loc": ("body", *line_error["loc"])}
+            for line_error in json.loads(error.json(include_url=False))
+        ]) from error
+    return _iterate(items)
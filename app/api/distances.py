@@ -0,0 +1,42 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.depends_stub import Stub
+from app.application.distances import get_distance_matrix
+from app.application.exceptions import OrganizationNotFoundError, StorageNotFoundError, DistanceMatrixTooLargeError
+from app.application.models.organization import DistanceMatrixResponse
+from app.application.protocols.database import OrganizationDatabaseGateway, StorageDatabaseGateway
+
+distances_router = APIRouter()
+
+MAX_MATRIX_ORGANIZATIONS = 1000
+MAX_MATRIX_STORAGES = 10000
+
+
+@distances_router.get("/matrix", response_model=DistanceMatrixResponse)
+async def get_distances_matrix(
+        organization_id: Annotated[list[int], Query(min_length=1, max_length=MAX_MATRIX_ORGANIZATIONS)],
+        storage_id: Annotated[list[int], Query(min_length=1, max_length=MAX_MATRIX_STORAGES)],
+        organization_database: Annotated[OrganizationDatabaseGateway, Depends()],
+        storage_database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+) -> DistanceMatrixResponse:
+    """
+    Calculate distances from every listed organization to every listed storage.
+
+    Pass `organization_id` and `storage_id` once per ID. Row `i` of `distances` belongs to
+    the `i`-th organization and column `j` to the `j`-th storage of the response. The matrix
+    may have at most `MAX_MATRIX_CELLS` cells.
+
+    Returns:
+        DistanceMatrixResponse: The requested IDs and the distance matrix between them.
+
+    Raises:
+        HTTPException: If any of the organizations or storages is not found, or the matrix is too large.
+    """
+    try:
+        return await get_distance_matrix(organization_id, storage_id, organization_database, storage_database)
+    except (OrganizationNotFoundError, StorageNotFoundError) as error:
+        raise HTTPException(status_code=404, detail=error.detail)
+    except DistanceMatrixTooLargeError as error:
+        raise HTTPException(status_code=422, detail=error.detail)
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*versions: object) -> str:
+    """
+    Strong entity tag built from the versions of every table a response is read from.
+    """
+    return '"' + "-".join(str(version) for version in versions) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an `If-None-Match` header contains `etag`, using the weak comparison required for GET.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
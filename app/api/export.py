@@ -0,0 +1,73 @@
+from typing import Annotated, AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.depends_stub import Stub
+from app.api.streaming import NDJSON_MEDIA_TYPE
+from app.application.exceptions import ExportFormatUnavailableError
+from app.application.export import ExportFormat, export_organizations, export_storages
+from app.application.protocols.database import OrganizationDatabaseGateway, StorageDatabaseGateway
+
+export_router = APIRouter()
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: NDJSON_MEDIA_TYPE,
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def export_response(content: AsyncIterator[bytes], name: str, export_format: ExportFormat) -> StreamingResponse:
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'},
+    )
+
+
+@export_router.get("/organizations/")
+async def export_all_organizations(
+        database: Annotated[OrganizationDatabaseGateway, Depends(Stub(OrganizationDatabaseGateway, export=True))],
+        export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+        after_id: Annotated[Optional[int], Query(ge=0)] = None,
+) -> StreamingResponse:
+    """
+    Download all organizations ordered by ID as NDJSON, CSV or Parquet.
+
+    Rows are streamed from a database cursor, bypassing the read cache, so memory use does not grow
+    with the number of organizations. CSV and Parquet have one `generated_waste_<WASTE_TYPE>` column
+    per waste type. Use `after_id` to resume an interrupted export. Parquet needs `pyarrow` installed.
+
+    Raises:
+        HTTPException: If the format is not available on this server.
+    """
+    try:
+        content = export_organizations(database, export_format, after_id)
+    except ExportFormatUnavailableError as error:
+        raise HTTPException(status_code=501, detail=error.detail)
+    return export_response(content, "organizations", export_format)
+
+
+@export_router.get("/storages/")
+async def export_all_storages(
+        database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway, export=True))],
+        export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+        after_id: Annotated[Optional[int], Query(ge=0)] = None,
+) -> StreamingResponse:
+    """
+    Download all storages ordered by ID as NDJSON, CSV or Parquet.
+
+    Rows are streamed from a database cursor, bypassing the read cache, so memory use does not grow
+    with the number of storages. CSV and Parquet have one `capacity_<WASTE_TYPE>` and one
+    `current_amount_<WASTE_TYPE>` column per waste type. Use `after_id` to resume an interrupted export.
+    Parquet needs `pyarrow` installed.
+
+    Raises:
+        HTTPException: If the format is not available on this server.
+    """
+    try:
+        content = export_storages(database, export_format, after_id)
+    except ExportFormatUnavailableError as error:
+        raise HTTPException(status_code=501, detail=error.detail)
+    return export_response(content, "storages", export_format)
@@ -1,54 +1,96 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Header, Response, Request
+from pydantic import TypeAdapter
 
+from app.api.bulk import read_items, InvalidLineError, bulk_request_body, BULK_CHUNK_SIZE, MAX_BULK_CHUNK_SIZE, \
+    MAX_BULK_DELETE
 from app.api.depends_stub import Stub
+from app.api.etag import make_etag, etag_matches, not_modified
+from app.api.responses import json_response
+from app.api.streaming import ndjson_response
+from app.application.exceptions import WasteTransferError, OrganizationNotFoundError, StorageNotFoundError, \
+    WasteTransferConflictError, RoutingProblemTooLargeError
 from app.application.models import Organization, OrganizationCreate, OrganizationCreateResponse, \
-    DeleteOrganizationResponse, UpdateOrganizationResponse, OrganizationWaste
-from app.application.models.organization import DistanceResponse
+    DeleteOrganizationResponse, UpdateOrganizationResponse
+from app.application.models.organization import DistanceResponse, OrganizationBulkCreateResponse, OrganizationUpdate, \
+    OrganizationBulkDeleteResponse
+from app.application.models.routing import RoutingStrategy, AutoDisposeResponse
 from app.application.models.storage import AvailableStorageResponse
-from app.application.models.waste import WasteTransferResponse, WasteTransferRequest, WasteType, GenerateWasteResponse
+from app.application.models.waste import WasteTransferResponse, WasteTransferRequest, WasteType, GenerateWasteResponse, \
+    WasteTransferItem, BatchWasteTransferResponse
 from app.application.organizations import get_organizations_data, get_organization_data, add_organization, \
     delete_organization, update_organization_by_id, calculate_distance_to_storage, \
-    get_available_storages_for_organization, has_sufficient_capacity, transfer_waste, organization_generate_waste
+    get_available_storages_for_organization, transfer_waste, organization_generate_waste, \
+    stream_organizations_data, transfer_waste_batch, auto_dispose_waste, get_organizations_version, \
+    import_organizations, patch_organization_by_id, delete_organizations
 from app.application.protocols.database import OrganizationDatabaseGateway, UoW, StorageDatabaseGateway
-from app.application.storages import get_storage_data
+from app.application.storages import get_storages_version
 
 organizations_router = APIRouter()
 
+MAX_BATCH_TRANSFERS = 1000
+
+ORGANIZATION_LIST = TypeAdapter(list[Organization])
+ORGANIZATION = TypeAdapter(Organization)
+ORGANIZATION_CREATE = TypeAdapter(OrganizationCreate)
+ORGANIZATION_CREATE_LIST = TypeAdapter(list[OrganizationCreate])
+AVAILABLE_STORAGE_LIST = TypeAdapter(list[AvailableStorageResponse])
+
 
 @organizations_router.get("/", response_model=list[Organization])
 async def get_organizations(
         database: Annotated[OrganizationDatabaseGateway, Depends()],
-) -> list[Organization]:
+        after_id: Annotated[Optional[int], Query(ge=0)] = None,
+        limit: Annotated[Optional[int], Query(gt=0)] = None,
+        stream: bool = False,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
-    Retrieve a list of all organizations.
+    Retrieve a list of organizations ordered by ID.
+
+    Use `after_id` with the last ID of the previous page and `limit` for keyset pagination.
+    With `stream=true` organizations are streamed as NDJSON while they are read from the database.
+    Responds with 304 Not Modified when `If-None-Match` holds the current `ETag`.
 
     Returns:
         list[Organization]: A list of organization objects.
     """
-    organization_list = await get_organizations_data(database)
-    return organization_list
+    etag = make_etag("organizations", await get_organizations_version(database))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if stream:
+        streaming_response = ndjson_response(stream_organizations_data(database, after_id, limit))
+        streaming_response.headers["ETag"] = etag
+        return streaming_response
+    organization_list = await get_organizations_data(database, after_id, limit)
+    return json_response(ORGANIZATION_LIST, organization_list, {"ETag": etag})
 
 
 @organizations_router.get("/{organization_id}", response_model=Organization)
 async def get_organization(
         organization_id: int,
         database: Annotated[OrganizationDatabaseGateway, Depends()],
-) -> Organization:
+        if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
     Retrieve a single organization by its ID.
 
+    Responds with 304 Not Modified when `If-None-Match` holds the current `ETag`.
+
     Returns:
         Organization: The organization object corresponding to the specified ID.
 
     Raises:
         HTTPException: If the organization is not found.
     """
+    etag = make_etag("organizations", await get_organizations_version(database))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     organization = await get_organization_data(organization_id, database)
     if not organization:
         raise HTTPException(status_code=404, detail="Data not found for specified organization_id.")
-    return organization
+    return json_response(ORGANIZATION, organization, {"ETag": etag})
 
 
 @organizations_router.post("/", response_model=OrganizationCreateResponse)
@@ -67,6 +109,59 @@ async def create_organization(
     return OrganizationCreateResponse(organization_id=organization_id)
 
 
+@organizations_router.post(
+    "/bulk/",
+    response_model=OrganizationBulkCreateResponse,
+    openapi_extra={"requestBody": bulk_request_body("OrganizationCreate")},
+)
+async def create_organizations_in_bulk(
+        request: Request,
+        database: Annotated[OrganizationDatabaseGateway, Depends()],
+        uow: Annotated[UoW, Depends()],
+        chunk_size: Annotated[int, Query(gt=0, le=MAX_BULK_CHUNK_SIZE)] = BULK_CHUNK_SIZE,
+) -> OrganizationBulkCreateResponse:
+    """
+    Create many organizations from a JSON array or from NDJSON (`Content-Type: application/x-ndjson`),
+    one organization per line.
+
+    Organizations are inserted and committed in chunks of `chunk_size`. NDJSON is inserted while it is
+    being received; when a line is invalid, the response is 422 and lists the IDs of the organizations
+    already committed from the lines before it.
+
+    Returns:
+        OrganizationBulkCreateResponse: IDs of the created organizations in the order they were sent.
+    """
+    organization_ids: list[int] = []
+    organizations_data = await read_items(request, ORGANIZATION_CREATE, ORGANIZATION_CREATE_LIST)
+    try:
+        async for chunk_ids in import_organizations(organizations_data, database, uow, chunk_size):
+            organization_ids.extend(chunk_ids)
+    except InvalidLineError as error:
+        raise HTTPException(
+            status_code=422,
+            detail={"line": error.line, "errors": error.errors, "organization_ids": organization_ids},
+        )
+    return OrganizationBulkCreateResponse(organization_ids=organization_ids)
+
+
+@organizations_router.post("/bulk-delete/", response_model=OrganizationBulkDeleteResponse)
+async def delete_organizations_in_bulk(
+        organization_ids: Annotated[list[int], Body(min_length=1, max_length=MAX_BULK_DELETE)],
+        database: Annotated[OrganizationDatabaseGateway, Depends()],
+        uow: Annotated[UoW, Depends()],
+) -> OrganizationBulkDeleteResponse:
+    """
+    Delete many organizations by their IDs in one transaction.
+
+    IDs that do not exist are skipped.
+
+    Returns:
+        OrganizationBulkDeleteResponse: IDs of the deleted organizations in ascending order.
+    """
+    deleted_organization_ids = await delete_organizations(organization_ids, database, uow)
+    return OrganizationBulkDeleteResponse(organization_ids=deleted_organization_ids)
+
+
 @organizations_router.delete("/", response_model=DeleteOrganizationResponse)
 async def delete_organization_by_id(
         organization_id: int,
@@ -113,6 +208,31 @@ async def update_organization(
     return UpdateOrganizationResponse(detail="Organization updated successfully")
 
 
+@organizations_router.patch("/{organization_id}/", response_model=UpdateOrganizationResponse)
+async def patch_organization(
+        organization_id: int,
+        organization_data: OrganizationUpdate,
+        database: Annotated[OrganizationDatabaseGateway, Depends()],
+        uow: Annotated[UoW, Depends()],
+) -> UpdateOrganizationResponse:
+    """
+    Partially update an organization by its ID.
+
+    Omitted fields keep their value, a given `generated_waste` replaces the whole list.
+    Only the values that actually changed are written.
+
+    Returns:
+        UpdateOrganizationResponse: Response indicating that the organization was updated.
+
+    Raises:
+        HTTPException: If the organization is not found.
+    """
+    updated_organization_id = await patch_organization_by_id(organization_id, organization_data, database, uow)
+    if not updated_organization_id:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    return UpdateOrganizationResponse(detail="Organization updated successfully")
+
+
 @organizations_router.get("/{organization_id}/distance-to-storage/{storage_id}/", response_model=DistanceResponse)
 async def get_distance_to_storage(
         organization_id: int,
@@ -140,9 +260,18 @@ async def get_available_storages(
         organization_id: int,
         organization_database: Annotated[OrganizationDatabaseGateway, Depends()],
         storage_database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
-) -> list[AvailableStorageResponse]:
+        limit: Annotated[Optional[int], Query(gt=0)] = None,
+        offset: Annotated[int, Query(ge=0)] = 0,
+        max_distance: Annotated[Optional[float], Query(ge=0)] = None,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
-    Get a list of available storages for a specific organization.
+    Get a list of available storages for a specific organization, nearest first.
+
+    Only the `limit` closest storages after skipping `offset` are returned,
+    optionally restricted to storages within `max_distance`.
+    Responds with 304 Not Modified when `If-None-Match` holds the current `ETag`,
+    which changes with every write to organizations or storages.
 
     Returns:
         list[AvailableStorageResponse]: A list of available storages with details like distance and capacities.
@@ -150,11 +279,24 @@ async def get_available_storages(
     Raises:
         HTTPException: If the organization is not found.
     """
+    etag = make_etag(
+        "available",
+        await get_organizations_version(organization_database),
+        await get_storages_version(storage_database),
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     organization = await get_organization_data(organization_id, organization_database)
     if not organization:
         raise HTTPException(status_code=404, detail="Organization not found")
-    available_storages = await get_available_storages_for_organization(organization, storage_database)
-    return available_storages
+    available_storages = await get_available_storages_for_organization(
+        organization,
+        storage_database,
+        limit=limit,
+        offset=offset,
+        max_distance=max_distance
+    )
+    return json_response(AVAILABLE_STORAGE_LIST, available_storages, {"ETag": etag})
 
 
 @organizations_router.post(
@@ -178,58 +320,114 @@ async def transfer_waste_to_specific_storage(
     Raises:
         HTTPException: If any validation fails (e.g., insufficient capacity, invalid waste type).
     """
-    organization = await get_organization_data(organization_id, organization_database)
-    if not organization:
-        raise HTTPException(status_code=404, detail="Organization not found")
+    try:
+        await transfer_waste(
+            organization_id,
+            storage_id,
+            transfer_request,
+            organization_database,
+            storage_database,
+            uow
+        )
+    except (OrganizationNotFoundError, StorageNotFoundError) as error:
+        raise HTTPException(status_code=404, detail=error.detail)
+    except WasteTransferConflictError as error:
+        raise HTTPException(status_code=409, detail=error.detail)
+    except WasteTransferError as error:
+        raise HTTPException(status_code=400, detail=error.detail)
 
-    storage = await get_storage_data(storage_id, storage_database)
-    if not storage:
-        raise HTTPException(status_code=404, detail="Storage not found")
+    return WasteTransferResponse(
+        detail="Waste transferred successfully."
+    )
 
-    if not any(cap.waste_type == transfer_request.waste_type for cap in storage.capacities):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Storage {storage_id} does not support waste type {transfer_request.waste_type}."
-        )
 
-    if not has_sufficient_capacity(
-            storage,
-            [OrganizationWaste(waste_type=transfer_request.waste_type, amount=transfer_request.amount)]
-    ):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Storage {storage_id} does not have sufficient capacity for {transfer_request.amount} of "
-                   f"waste type {transfer_request.waste_type}."
-        )
+@organizations_router.post("/transfer-waste/", response_model=BatchWasteTransferResponse)
+async def transfer_waste_in_batch(
+        transfers: Annotated[list[WasteTransferItem], Body(min_length=1, max_length=MAX_BATCH_TRANSFERS)],
+        organization_database: Annotated[OrganizationDatabaseGateway, Depends()],
+        storage_database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+        uow: Annotated[UoW, Depends()]
+) -> BatchWasteTransferResponse:
+    """
+    Transfer waste for many organization and storage pairs in one request.
+
+    Transfers are validated together in the given order, the valid ones are applied in bulk
+    and committed once.
 
-    organization_waste = next(
-        (w for w in organization.generated_waste if w.waste_type == transfer_request.waste_type),
-        None
+    Returns:
+        BatchWasteTransferResponse: Per-transfer results and the number of applied transfers.
+    """
+    results = await transfer_waste_batch(transfers, organization_database, storage_database, uow)
+    return BatchWasteTransferResponse(
+        transferred=sum(result.transferred for result in results),
+        results=results
     )
-    if not organization_waste:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Organization {organization_id} does not generate waste type {transfer_request.waste_type}."
-        )
 
-    if organization_waste.amount < transfer_request.amount:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Organization {organization_id} has insufficient waste of type {transfer_request.waste_type}. "
-                   f"Available: {organization_waste.amount}, Requested: {transfer_request.amount}."
+
+@organizations_router.post("/{organization_id}/auto-dispose/", response_model=AutoDisposeResponse)
+async def auto_dispose_organization_waste(
+        organization_id: int,
+        organization_database: Annotated[OrganizationDatabaseGateway, Depends()],
+        storage_database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+        uow: Annotated[UoW, Depends()],
+        strategy: RoutingStrategy = RoutingStrategy.GREEDY,
+) -> AutoDisposeResponse:
+    """
+    Transfer all generated waste of an organization to storages, minimizing the total distance.
+
+    `greedy` fills the nearest storages first, `min_cost_flow` finds the assignment with
+    the smallest total amount times distance.
+
+    Returns:
+        AutoDisposeResponse: Applied routes and the waste no storage had room for.
+
+    Raises:
+        HTTPException: If the organization is not found, or there are too many storages to plan the routes.
+    """
+    try:
+        return await auto_dispose_waste(
+            [organization_id],
+            strategy,
+            organization_database,
+            storage_database,
+            uow
         )
-    await transfer_waste(
-        organization_id,
-        storage_id,
-        transfer_request,
-        organization_database,
-        storage_database,
-        uow
-    )
+    except OrganizationNotFoundError as error:
+        raise HTTPException(status_code=404, detail=error.detail)
+    except RoutingProblemTooLargeError as error:
+        raise HTTPException(status_code=422, detail=error.detail)
 
-    return WasteTransferResponse(
-        detail="Waste transferred successfully."
-    )
+
+@organizations_router.post("/auto-dispose/", response_model=AutoDisposeResponse)
+async def auto_dispose_waste_in_batch(
+        organization_ids: Annotated[list[int], Body(min_length=1, max_length=MAX_BATCH_TRANSFERS)],
+        organization_database: Annotated[OrganizationDatabaseGateway, Depends()],
+        storage_database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+        uow: Annotated[UoW, Depends()],
+        strategy: RoutingStrategy = RoutingStrategy.GREEDY,
+) -> AutoDisposeResponse:
+    """
+    Transfer all generated waste of many organizations at once, sharing the free storage capacity between them.
+
+    Returns:
+        AutoDisposeResponse: Applied routes and the waste no storage had room for.
+
+    Raises:
+        HTTPException: If any of the organizations is not found, or there are too many organizations
+            and storages to plan the routes.
+    """
+    try:
+        return await auto_dispose_waste(
+            organization_ids,
+            strategy,
+            organization_database,
+            storage_database,
+            uow
+        )
+    except OrganizationNotFoundError as error:
+        raise HTTPException(status_code=404, detail=error.detail)
+    except RoutingProblemTooLargeError as error:
+        raise HTTPException(status_code=422, detail=error.detail)
 
 
 @organizations_router.get("/{organization_id}/generate_waste/", response_model=GenerateWasteResponse)
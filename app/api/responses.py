@@ -0,0 +1,35 @@
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+
+RESPONSE_CLASSES: dict[str, type[JSONResponse]] = {
+    "json": JSONResponse,
+    "orjson": ORJSONResponse,
+}
+
+
+def default_response_class(name: Optional[str] = None) -> type[JSONResponse]:
+    """
+    Response class used by every endpoint that returns models or plain data, orjson unless `name` says otherwise.
+
+    orjson renders the plain data FastAPI produces from `response_model` several times faster than `json.dumps`.
+    """
+    if name is None:
+        name = "orjson"
+    if name not in RESPONSE_CLASSES:
+        raise ValueError(f"Unknown JSON response class {name!r}, expected one of {', '.join(RESPONSE_CLASSES)}")
+    return RESPONSE_CLASSES[name]
+
+
+def json_response(adapter: TypeAdapter[Any], content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Serialize models built by the gateways straight to JSON.
+
+    The content is trusted, so FastAPI's validation against `response_model` is skipped;
+    `response_model` still documents the endpoint.
+    """
+    return Response(adapter.dump_json(content), media_type=JSON_MEDIA_TYPE, headers=headers)
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 
+from .admin import admin_router
+from .distances import distances_router
+from .export import export_router
 from .index import index_router
 from .organizations import organizations_router
 from .storages import storages_router
@@ -17,6 +20,21 @@ root_router.include_router(
     prefix="/storages",
     tags=["storages"]
 )
+root_router.include_router(
+    distances_router,
+    prefix="/distances",
+    tags=["distances"]
+)
+root_router.include_router(
+    export_router,
+    prefix="/export",
+    tags=["export"]
+)
+root_router.include_router(
+    admin_router,
+    prefix="/admin",
+    tags=["admin"]
+)
 root_router.include_router(
     index_router,
 )
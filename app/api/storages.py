@@ -1,49 +1,82 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response, Request, Body
+from pydantic import TypeAdapter
 
+from app.api.bulk import read_items, InvalidLineError, bulk_request_body, BULK_CHUNK_SIZE, MAX_BULK_CHUNK_SIZE, \
+    MAX_BULK_DELETE
 from app.api.depends_stub import Stub
+from app.api.etag import make_etag, etag_matches, not_modified
+from app.api.responses import json_response
+from app.api.streaming import ndjson_response
 from app.application.models.storage import Storage, StorageCreate, StorageCreateResponse, UpdateStorageResponse, \
-    DeleteStorageResponse
+    DeleteStorageResponse, StorageBulkCreateResponse, StorageUpdate, StorageBulkDeleteResponse
 from app.application.protocols.database import StorageDatabaseGateway, UoW
 from app.application.storages import get_storages_data, get_storage_data, add_storage, update_storage_by_id, \
-    delete_storage_by_id
+    delete_storage_by_id, stream_storages_data, get_storages_version, import_storages, patch_storage_by_id, \
+    delete_storages
 
 storages_router = APIRouter()
 
+STORAGE_LIST = TypeAdapter(list[Storage])
+STORAGE = TypeAdapter(Storage)
+STORAGE_CREATE = TypeAdapter(StorageCreate)
+STORAGE_CREATE_LIST = TypeAdapter(list[StorageCreate])
+
 
 @storages_router.get("/", response_model=list[Storage])
 async def get_storages(
         database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
-) -> list[Storage]:
+        after_id: Annotated[Optional[int], Query(ge=0)] = None,
+        limit: Annotated[Optional[int], Query(gt=0)] = None,
+        stream: bool = False,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
-    Retrieve a list of all storages.
+    Retrieve a list of storages ordered by ID.
+
+    Use `after_id` with the last ID of the previous page and `limit` for keyset pagination.
+    With `stream=true` storages are streamed as NDJSON while they are read from the database.
+    Responds with 304 Not Modified when `If-None-Match` holds the current `ETag`.
 
     Returns:
         list[Storage]: A list of storage objects.
     """
-    storage_list = await get_storages_data(database)
-    return storage_list
+    etag = make_etag("storages", await get_storages_version(database))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if stream:
+        streaming_response = ndjson_response(stream_storages_data(database, after_id, limit))
+        streaming_response.headers["ETag"] = etag
+        return streaming_response
+    storage_list = await get_storages_data(database, after_id, limit)
+    return json_response(STORAGE_LIST, storage_list, {"ETag": etag})
 
 
 @storages_router.get("/{storage_id}/", response_model=Storage)
 async def get_storage(
         storage_id: int,
         database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
-) -> Storage:
+        if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
     Retrieve a specific storage by its ID.
 
+    Responds with 304 Not Modified when `If-None-Match` holds the current `ETag`.
+
     Returns:
         Storage: The storage object corresponding to the specified ID.
 
     Raises:
         HTTPException: If the storage is not found.
     """
+    etag = make_etag("storages", await get_storages_version(database))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     storage = await get_storage_data(storage_id, database)
     if not storage:
         raise HTTPException(status_code=404, detail="Storage not found")
-    return storage
+    return json_response(STORAGE, storage, {"ETag": etag})
 
 
 @storages_router.post("/", response_model=StorageCreateResponse)
@@ -62,6 +95,59 @@ async def create_organization(
     return StorageCreateResponse(storage_id=storage_id)
 
 
+@storages_router.post(
+    "/bulk/",
+    response_model=StorageBulkCreateResponse,
+    openapi_extra={"requestBody": bulk_request_body("StorageCreate")},
+)
+async def create_storages_in_bulk(
+        request: Request,
+        database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+        uow: Annotated[UoW, Depends()],
+        chunk_size: Annotated[int, Query(gt=0, le=MAX_BULK_CHUNK_SIZE)] = BULK_CHUNK_SIZE,
+) -> StorageBulkCreateResponse:
+    """
+    Create many storages from a JSON array or from NDJSON (`Content-Type: application/x-ndjson`),
+    one storage per line.
+
+    Storages are inserted and committed in chunks of `chunk_size`. NDJSON is inserted while it is
+    being received; when a line is invalid, the response is 422 and lists the IDs of the storages
+    already committed from the lines before it.
+
+    Returns:
+        StorageBulkCreateResponse: IDs of the created storages in the order they were sent.
+    """
+    storage_ids: list[int] = []
+    storages_data = await read_items(request, STORAGE_CREATE, STORAGE_CREATE_LIST)
+    try:
+        async for chunk_ids in import_storages(storages_data, database, uow, chunk_size):
+            storage_ids.extend(chunk_ids)
+    except InvalidLineError as error:
+        raise HTTPException(
+            status_code=422,
+            detail={"line": error.line, "errors": error.errors, "storage_ids": storage_ids},
+        )
+    return StorageBulkCreateResponse(storage_ids=storage_ids)
+
+
+@storages_router.post("/bulk-delete/", response_model=StorageBulkDeleteResponse)
+async def delete_storages_in_bulk(
+        storage_ids: Annotated[list[int], Body(min_length=1, max_length=MAX_BULK_DELETE)],
+        database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+        uow: Annotated[UoW, Depends()],
+) -> StorageBulkDeleteResponse:
+    """
+    Delete many storages by their IDs in one transaction.
+
+    IDs that do not exist are skipped.
+
+    Returns:
+        StorageBulkDeleteResponse: IDs of the deleted storages in ascending order.
+    """
+    deleted_storage_ids = await delete_storages(storage_ids, database, uow)
+    return StorageBulkDeleteResponse(storage_ids=deleted_storage_ids)
+
+
 @storages_router.put("/{storage_id}/", response_model=UpdateStorageResponse)
 async def update_storage(
         storage_id: int,
@@ -84,6 +170,31 @@ async def update_storage(
     return UpdateStorageResponse(detail="Storage updated successfully")
 
 
+@storages_router.patch("/{storage_id}/", response_model=UpdateStorageResponse)
+async def patch_storage(
+        storage_id: int,
+        storage_data: StorageUpdate,
+        database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+        uow: Annotated[UoW, Depends()],
+) -> UpdateStorageResponse:
+    """
+    Partially update a storage by its ID.
+
+    Omitted fields keep their value, given `capacities` or `current_levels` replace the whole list.
+    Only the values that actually changed are written.
+
+    Returns:
+        UpdateStorageResponse: Response indicating that the storage was updated successfully.
+
+    Raises:
+        HTTPException: If the storage is not found.
+    """
+    updated_storage_id = await patch_storage_by_id(storage_id, storage_data, database, uow)
+    if not updated_storage_id:
+        raise HTTPException(status_code=404, detail="Storage not found")
+    return UpdateStorageResponse(detail="Storage updated successfully")
+
+
 @storages_router.delete("/{storage_id}/", response_model=DeleteStorageResponse)
 async def delete_storage(
         storage_id: int,
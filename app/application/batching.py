@@ -0,0 +1,19 @@
+from typing import AsyncIterable, AsyncIterator, TypeVar
+
+Item = TypeVar("Item")
+
+
+async def chunked(items: AsyncIterable[Item], size: int) -> AsyncIterator[list[Item]]:
+    """
+    Group items into lists of `size`, the last one possibly shorter, as they arrive.
+    """
+    if size <= 0:
+        raise ValueError("size must be positive")
+    chunk: list[Item] = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,84 @@
+from typing import Iterator, Sequence, Any
+
+import numpy as np
+
+from app.application.exceptions import OrganizationNotFoundError, StorageNotFoundError, DistanceMatrixTooLargeError
+from app.application.models.location import Location
+from app.application.models.organization import DistanceMatrixResponse
+from app.application.protocols.database import OrganizationDatabaseGateway, StorageDatabaseGateway
+
+Point = tuple[float, float]
+DistanceMatrix = np.ndarray[Any, Any]
+
+# Organization-storage cells one matrix request may ask for, bounding the memory and size of the response.
+MAX_MATRIX_CELLS = 250_000
+
+
+def distance_matrix(origins: Sequence[Point], destinations: Sequence[Point]) -> DistanceMatrix:
+    """
+    Euclidean distances between every origin (rows) and every destination (columns),
+    computed with NumPy broadcasting.
+    """
+    origin_array = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+    destination_array = np.asarray(destinations, dtype=np.float64).reshape(-1, 2)
+    return np.hypot(
+        origin_array[:, 0, None] - destination_array[None, :, 0],
+        origin_array[:, 1, None] - destination_array[None, :, 1],
+    )
+
+
+def sorted_pairs(matrix: DistanceMatrix) -> Iterator[tuple[int, int]]:
+    """
+    Yield `(row, column)` index pairs of the matrix from the shortest distance to the longest.
+    """
+    rows, columns = np.unravel_index(np.argsort(matrix, axis=None, kind="stable"), matrix.shape)
+    yield from zip(rows.tolist(), columns.tolist())
+
+
+def location_points(locations: Sequence[Location]) -> list[Point]:
+    return [(location.location_x, location.location_y) for location in locations]
+
+
+async def get_distance_matrix(
+        organization_ids: list[int],
+        storage_ids: list[int],
+        organization_database: OrganizationDatabaseGateway,
+        storage_database: StorageDatabaseGateway,
+) -> DistanceMatrixResponse:
+    """
+    Distances from every requested organization to every requested storage, in the order of the given ids.
+
+    Raises:
+        OrganizationNotFoundError: If any of the organizations does not exist.
+        StorageNotFoundError: If any of the storages does not exist.
+        DistanceMatrixTooLargeError: If the matrix has more than `MAX_MATRIX_CELLS` cells.
+    """
+    organization_ids = list(dict.fromkeys(organization_ids))
+    storage_ids = list(dict.fromkeys(storage_ids))
+    cells = len(organization_ids) * len(storage_ids)
+    if cells > MAX_MATRIX_CELLS:
+        raise DistanceMatrixTooLargeError(
+            f"The distance matrix would have {cells} cells, at most {MAX_MATRIX_CELLS} are supported"
+        )
+    organizations = {
+        location.id: location
+        for location in await organization_database.get_organization_locations(organization_ids)
+    }
+    if len(organizations) != len(organization_ids):
+        raise OrganizationNotFoundError()
+    storages = {
+        location.id: location
+        for location in await storage_database.get_storage_locations(storage_ids)
+    }
+    if len(storages) != len(storage_ids):
+        raise StorageNotFoundError()
+
+    matrix = distance_matrix(
+        location_points([organizations[organization_id] for organization_id in organization_ids]),
+        location_points([storages[storage_id] for storage_id in storage_ids]),
+    )
+    return DistanceMatrixResponse(
+        organization_ids=organization_ids,
+        storage_ids=storage_ids,
+        distances=matrix.tolist(),
+    )
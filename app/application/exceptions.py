@@ -0,0 +1,37 @@
+class WasteTransferError(Exception):
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class OrganizationNotFoundError(WasteTransferError):
+    def __init__(self) -> None:
+        super().__init__("Organization not found")
+
+
+class StorageNotFoundError(WasteTransferError):
+    def __init__(self) -> None:
+        super().__init__("Storage not found")
+
+
+class WasteTransferConflictError(WasteTransferError):
+    def __init__(self) -> None:
+        super().__init__("Organization waste or storage level changed during the transfer, please retry.")
+
+
+class ExportFormatUnavailableError(Exception):
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class RoutingProblemTooLargeError(Exception):
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class DistanceMatrixTooLargeError(Exception):
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
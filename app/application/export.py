@@ -0,0 +1,194 @@
+import csv
+import io
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+try:
+    import pyarrow as pa  # type: ignore[import-not-found]
+    import pyarrow.parquet as pq  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+from pydantic import BaseModel
+
+from app.application.batching import chunked
+from app.application.exceptions import ExportFormatUnavailableError
+from app.application.models import Organization, WasteType
+from app.application.models.storage import Storage
+from app.application.protocols.database import OrganizationDatabaseGateway, StorageDatabaseGateway
+
+Entity = TypeVar("Entity", bound=BaseModel)
+Record = dict[str, Any]
+
+EXPORT_BATCH_SIZE = 1000
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+# CSV and Parquet are flat: every waste type gets its own column, empty when it is not listed.
+ORGANIZATION_FIELDS = ("id", "name", "location_x", "location_y") + tuple(
+    f"generated_waste_{waste_type.value}" for waste_type in WasteType
+)
+STORAGE_FIELDS = ("id", "name", "location_x", "location_y") + tuple(
+    f"{column}_{waste_type.value}" for column in ("capacity", "current_amount") for waste_type in WasteType
+)
+
+
+def organization_record(organization: Organization) -> Record:
+    record: Record = {
+        "id": organization.id,
+        "name": organization.name,
+        "location_x": organization.location_x,
+        "location_y": organization.location_y,
+    }
+    for waste in organization.generated_waste:
+        record[f"generated_waste_{WasteType(waste.waste_type).value}"] = waste.amount
+    return record
+
+
+def storage_record(storage: Storage) -> Record:
+    record: Record = {
+        "id": storage.id,
+        "name": storage.name,
+        "location_x": storage.location_x,
+        "location_y": storage.location_y,
+    }
+    for capacity in storage.capacities:
+        record[f"capacity_{WasteType(capacity.waste_type).value}"] = capacity.capacity
+    for current_level in storage.current_levels:
+        record[f"current_amount_{WasteType(current_level.waste_type).value}"] = current_level.current_amount
+    return record
+
+
+async def _ndjson(entities: AsyncIterator[Entity]) -> AsyncIterator[bytes]:
+    async for batch in chunked(entities, EXPORT_BATCH_SIZE):
+        yield b"".join(entity.model_dump_json().encode() + b"\n" for entity in batch)
+
+
+async def _csv(
+        entities: AsyncIterator[Entity],
+        to_record: Callable[[Entity], Record],
+        fields: tuple[str, ...],
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fields)
+    writer.writeheader()
+    async for batch in chunked(entities, EXPORT_BATCH_SIZE):
+        writer.writerows(to_record(entity) for entity in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _StreamSink(io.RawIOBase):
+    """
+    Write-only file collecting what the Parquet writer wrote since the last `drain`.
+
+    Keeps the number of bytes written so far as the position, the offsets in the Parquet footer
+    are absolute even though earlier bytes are already sent.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _parquet_schema(fields: tuple[str, ...]) -> "pa.Schema":
+    types = {"id": pa.int64(), "name": pa.string(), "location_x": pa.float64(), "location_y": pa.float64()}
+    return pa.schema([(field, types.get(field, pa.int64())) for field in fields])
+
+
+async def _parquet(
+        entities: AsyncIterator[Entity],
+        to_record: Callable[[Entity], Record],
+        fields: tuple[str, ...],
+) -> AsyncIterator[bytes]:
+    schema = _parquet_schema(fields)
+    sink = _StreamSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        async for batch in chunked(entities, PARQUET_ROW_GROUP_SIZE):
+            writer.write_table(pa.Table.from_pylist([to_record(entity) for entity in batch], schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _export(
+        entities: AsyncIterator[Entity],
+        export_format: ExportFormat,
+        to_record: Callable[[Entity], Record],
+        fields: tuple[str, ...],
+) -> AsyncIterator[bytes]:
+    if export_format == ExportFormat.NDJSON:
+        return _ndjson(entities)
+    if export_format == ExportFormat.CSV:
+        return _csv(entities, to_record, fields)
+    return _parquet(entities, to_record, fields)
+
+
+def check_export_format(export_format: ExportFormat) -> None:
+    """
+    Raises:
+        ExportFormatUnavailableError: If the format needs an optional dependency that is not installed.
+    """
+    if export_format == ExportFormat.PARQUET and pq is None:
+        raise ExportFormatUnavailableError("Parquet export requires pyarrow to be installed")
+
+
+def export_organizations(
+        database: OrganizationDatabaseGateway,
+        export_format: ExportFormat,
+        after_id: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    All organizations, ordered by ID, encoded in `export_format` while they are read from the database.
+
+    Only one batch of organizations is held in memory at a time.
+
+    Raises:
+        ExportFormatUnavailableError: If the format needs an optional dependency that is not installed.
+    """
+    check_export_format(export_format)
+    return _export(database.iter_organizations(after_id), export_format, organization_record, ORGANIZATION_FIELDS)
+
+
+def export_storages(
+        database: StorageDatabaseGateway,
+        export_format: ExportFormat,
+        after_id: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    All storages, ordered by ID, encoded in `export_format` while they are read from the database.
+
+    Only one batch of storages is held in memory at a time.
+
+    Raises:
+        ExportFormatUnavailableError: If the format needs an optional dependency that is not installed.
+    """
+    check_export_format(export_format)
+    return _export(database.iter_storages(after_id), export_format, storage_record, STORAGE_FIELDS)
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class Location(BaseModel):
+    id: int
+    location_x: float
+    location_y: float
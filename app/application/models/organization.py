@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from app.application.models.organization_waste import OrganizationWaste
+from app.application.models.waste import check_unique_waste_types, reject_null
 
 
 class Organization(BaseModel):
@@ -20,15 +21,38 @@ class OrganizationCreate(BaseModel):
     location_y: float
     generated_waste: List[OrganizationWaste]
 
+    _unique_generated_waste = field_validator("generated_waste")(check_unique_waste_types)
+
+
+class OrganizationUpdate(BaseModel):
+    """
+    Partial update: omitted fields keep their value, a given `generated_waste` replaces the whole list.
+    """
+    name: Optional[str] = None
+    location_x: Optional[float] = None
+    location_y: Optional[float] = None
+    generated_waste: Optional[List[OrganizationWaste]] = None
+
+    _not_null = field_validator("name", "location_x", "location_y", "generated_waste", mode="before")(reject_null)
+    _unique_generated_waste = field_validator("generated_waste")(check_unique_waste_types)
+
 
 class OrganizationCreateResponse(BaseModel):
     organization_id: int
 
 
+class OrganizationBulkCreateResponse(BaseModel):
+    organization_ids: list[int]
+
+
 class DeleteOrganizationResponse(BaseModel):
     detail: str
 
 
+class OrganizationBulkDeleteResponse(BaseModel):
+    organization_ids: list[int]
+
+
 class UpdateOrganizationResponse(BaseModel):
     detail: str
 
@@ -36,3 +60,8 @@ class UpdateOrganizationResponse(BaseModel):
 class DistanceResponse(BaseModel):
     distance: float
 
+
+class DistanceMatrixResponse(BaseModel):
+    organization_ids: list[int]
+    storage_ids: list[int]
+    distances: list[list[float]]
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PoolMetrics(BaseModel):
+    pool: str
+    size: Optional[int]
+    max_overflow: Optional[int]
+    checked_in: Optional[int]
+    checked_out: Optional[int]
+    overflow: Optional[int]
+    utilization: Optional[float]
+    connects: int
+    checkouts: int
+    invalidations: int
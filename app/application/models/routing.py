@@ -0,0 +1,28 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+from app.application.models.waste import WasteTransferItem, WasteTransferResult, WasteType
+
+
+class RoutingStrategy(str, Enum):
+    GREEDY = "greedy"
+    MIN_COST_FLOW = "min_cost_flow"
+
+
+class WasteRoute(WasteTransferItem):
+    distance: float
+
+
+class UndisposedWaste(BaseModel):
+    organization_id: int
+    waste_type: WasteType
+    amount: int
+
+
+class AutoDisposeResponse(BaseModel):
+    strategy: RoutingStrategy
+    transferred: int
+    total_distance: float
+    results: list[WasteTransferResult]
+    undisposed: list[UndisposedWaste]
@@ -1,7 +1,10 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from app.application.models.storage_capacity import StorageCapacity
 from app.application.models.storage_current_level import StorageCurrentLevel
+from app.application.models.waste import check_unique_waste_types, WasteType, reject_null
 
 
 class Storage(BaseModel):
@@ -21,11 +24,33 @@ class StorageCreate(BaseModel):
     capacities: list[StorageCapacity]
     current_levels: list[StorageCurrentLevel]
 
+    _unique_waste_types = field_validator("capacities", "current_levels")(check_unique_waste_types)
+
+
+class StorageUpdate(BaseModel):
+    """
+    Partial update: omitted fields keep their value, given `capacities` or `current_levels` replace the whole list.
+    """
+    name: Optional[str] = None
+    location_x: Optional[float] = None
+    location_y: Optional[float] = None
+    capacities: Optional[list[StorageCapacity]] = None
+    current_levels: Optional[list[StorageCurrentLevel]] = None
+
+    _not_null = field_validator(
+        "name", "location_x", "location_y", "capacities", "current_levels", mode="before"
+    )(reject_null)
+    _unique_waste_types = field_validator("capacities", "current_levels")(check_unique_waste_types)
+
 
 class StorageCreateResponse(BaseModel):
     storage_id: int
 
 
+class StorageBulkCreateResponse(BaseModel):
+    storage_ids: list[int]
+
+
 class UpdateStorageResponse(BaseModel):
     detail: str
 
@@ -34,9 +59,21 @@ class DeleteStorageResponse(BaseModel):
     detail: str
 
 
+class StorageBulkDeleteResponse(BaseModel):
+    storage_ids: list[int]
+
+
 class AvailableStorageResponse(BaseModel):
     storage_id: int
     name: str
     distance: float
     capacities: list[StorageCapacity]
     current_levels: list[StorageCurrentLevel]
+
+
+class StorageFreeCapacity(BaseModel):
+    storage_id: int
+    location_x: float
+    location_y: float
+    waste_type: WasteType
+    free_capacity: int
@@ -1,7 +1,10 @@
 from enum import Enum
+from typing import TypeVar, Optional, Any
 
 from pydantic import BaseModel, Field
 
+WasteItem = TypeVar("WasteItem", bound=BaseModel)
+
 
 class WasteType(str, Enum):
     BIO_WASTE = "BIO_WASTE"
@@ -18,5 +21,53 @@ class WasteTransferRequest(BaseModel):
     amount: int = Field(..., gt=0, description="The amount of waste to be transferred. Must be greater than 0.")
 
 
+class WasteTransferItem(WasteTransferRequest):
+    organization_id: int
+    storage_id: int
+
+
+class WasteTransferResult(BaseModel):
+    organization_id: int
+    storage_id: int
+    waste_type: WasteType
+    amount: int
+    transferred: bool
+    detail: str
+
+
+class BatchWasteTransferResponse(BaseModel):
+    transferred: int
+    results: list[WasteTransferResult]
+
+
 class GenerateWasteResponse(BaseModel):
     detail: str
+
+
+class OrganizationWasteState(BaseModel):
+    organization_id: int
+    waste_type: WasteType
+    amount: Optional[int]
+
+
+class StorageWasteState(BaseModel):
+    storage_id: int
+    waste_type: WasteType
+    capacity: Optional[int]
+    current_amount: Optional[int]
+
+
+def check_unique_waste_types(items: list[WasteItem]) -> list[WasteItem]:
+    waste_types = [getattr(item, "waste_type") for item in items]
+    if len(waste_types) != len(set(waste_types)):
+        raise ValueError("Each waste type can be listed only once.")
+    return items
+
+
+def reject_null(value: Any) -> Any:
+    """
+    Fields of partial updates may be omitted but not set to null.
+    """
+    if value is None:
+        raise ValueError("Omit the field to keep its value, null is not allowed.")
+    return value
@@ -1,22 +1,43 @@
+import asyncio
 import math
-from typing import Optional, Annotated
+from contextlib import aclosing
+from typing import Optional, AsyncIterator, AsyncIterable
 
-from fastapi import Depends
-
-from app.api.depends_stub import Stub
-from app.application.models import Organization, OrganizationCreate, OrganizationWaste
+from app.application.batching import chunked
+from app.application.distances import distance_matrix
+from app.application.exceptions import WasteTransferError, OrganizationNotFoundError, StorageNotFoundError, \
+    WasteTransferConflictError
+from app.application.models import Organization, OrganizationCreate
+from app.application.models.organization import OrganizationUpdate
+from app.application.models.routing import RoutingStrategy, AutoDisposeResponse, UndisposedWaste
 from app.application.models.storage import Storage, AvailableStorageResponse
-from app.application.models.waste import WasteTransferRequest, WasteType
+from app.application.models.waste import WasteTransferRequest, WasteType, OrganizationWasteState, StorageWasteState, \
+    WasteTransferItem, WasteTransferResult
 from app.application.protocols.database import OrganizationDatabaseGateway, UoW, StorageDatabaseGateway
+from app.application.waste_routing import plan_waste_routes
+
+
+async def get_organizations_version(database: OrganizationDatabaseGateway) -> int:
+    return await database.get_version()
 
 
 async def get_organizations_data(
         database: OrganizationDatabaseGateway,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
 ) -> list[Organization]:
-    organization_list = await database.get_organizations()
+    organization_list = await database.get_organizations(after_id, limit)
     return organization_list
 
 
+def stream_organizations_data(
+        database: OrganizationDatabaseGateway,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+) -> AsyncIterator[Organization]:
+    return database.iter_organizations(after_id, limit)
+
+
 async def get_organization_data(
         organization_id: int,
         database: OrganizationDatabaseGateway,
@@ -35,6 +56,24 @@ async def add_organization(
     return organization_id
 
 
+async def import_organizations(
+        organizations_data: AsyncIterable[OrganizationCreate],
+        database: OrganizationDatabaseGateway,
+        uow: UoW,
+        chunk_size: int,
+) -> AsyncIterator[list[int]]:
+    """
+    Insert organizations in chunks of `chunk_size`, committing every chunk on its own,
+    and yield the ids of each chunk once it is committed.
+
+    Chunks committed before a failure stay in the database.
+    """
+    async for chunk in chunked(organizations_data, chunk_size):
+        organization_ids = await database.create_organizations(chunk)
+        await uow.commit()
+        yield organization_ids
+
+
 async def delete_organization(
         organization_id: int,
         database: OrganizationDatabaseGateway,
@@ -45,6 +84,16 @@ async def delete_organization(
     return deleted_organization_id
 
 
+async def delete_organizations(
+        organization_ids: list[int],
+        database: OrganizationDatabaseGateway,
+        uow: UoW,
+) -> list[int]:
+    deleted_organization_ids = await database.delete_organizations(organization_ids)
+    await uow.commit()
+    return deleted_organization_ids
+
+
 async def update_organization_by_id(
         organization_id: int,
         organization_data: OrganizationCreate,
@@ -56,6 +105,17 @@ async def update_organization_by_id(
     return updated_organization_id
 
 
+async def patch_organization_by_id(
+        organization_id: int,
+        organization_data: OrganizationUpdate,
+        database: OrganizationDatabaseGateway,
+        uow: UoW,
+) -> Optional[int]:
+    updated_organization_id = await database.patch_organization_by_id(organization_id, organization_data)
+    await uow.commit()
+    return updated_organization_id
+
+
 async def calculate_distance_to_storage(
         organization_id: int,
         storage_id: int,
@@ -73,41 +133,42 @@ async def calculate_distance_to_storage(
 async def get_available_storages_for_organization(
         organization: Organization,
         storage_database: StorageDatabaseGateway,
-
+        limit: Optional[int] = None,
+        offset: int = 0,
+        max_distance: Optional[float] = None,
 ) -> list[AvailableStorageResponse]:
-    storages = await storage_database.get_storages()
-    available_storages = []
-
-    for storage in storages:
-        if has_sufficient_capacity(storage, organization.generated_waste):
-            distance = await calculate_distance(
-                organization,
-                storage,
+    available_storages: list[AvailableStorageResponse] = []
+    if limit == 0:
+        return available_storages
+
+    nearest_storages = storage_database.iter_available_storages(
+        organization.location_x,
+        organization.location_y,
+        organization.generated_waste,
+        max_distance,
+        limit,
+        offset,
+    )
+    async with aclosing(nearest_storages):
+        storages = [storage async for storage in nearest_storages]
+    if not storages:
+        return available_storages
+
+    distances = distance_matrix(
+        [(organization.location_x, organization.location_y)],
+        [(storage.location_x, storage.location_y) for storage in storages],
+    )[0]
+    for storage, distance in zip(storages, distances):
+        available_storages.append(
+            AvailableStorageResponse(
+                storage_id=storage.id,
+                name=storage.name,
+                distance=float(distance),
+                capacities=storage.capacities,
+                current_levels=storage.current_levels
             )
-            available_storages.append({
-                "storage_id": storage.id,
-                "name": storage.name,
-                "distance": distance,
-                "capacities": storage.capacities,
-                "current_levels": storage.current_levels
-            })
-    available_storages.sort(key=lambda s: float(s["distance"]))
-    return [AvailableStorageResponse.model_validate(storage) for storage in available_storages]
-
-
-def has_sufficient_capacity(storage: Storage, generated_waste: list[OrganizationWaste]) -> bool:
-    for waste in generated_waste:
-        capacity = next(
-            (cap.capacity for cap in storage.capacities if cap.waste_type == waste.waste_type),
-            0
-        )
-        current_level = next(
-            (level.current_amount for level in storage.current_levels if level.waste_type == waste.waste_type),
-            0
         )
-        if waste.amount > (capacity - current_level):
-            return False
-    return True
+    return available_storages
 
 
 async def calculate_distance(
@@ -119,27 +180,203 @@ async def calculate_distance(
     )
 
 
+def validate_waste_transfer(
+        organization_waste: Optional[OrganizationWasteState],
+        storage_waste: Optional[StorageWasteState],
+        amount: int,
+) -> tuple[OrganizationWasteState, StorageWasteState]:
+    if organization_waste is None:
+        raise OrganizationNotFoundError()
+    if storage_waste is None:
+        raise StorageNotFoundError()
+
+    waste_type = storage_waste.waste_type.value
+    if storage_waste.capacity is None:
+        raise WasteTransferError(
+            f"Storage {storage_waste.storage_id} does not support waste type {waste_type}."
+        )
+    if amount > storage_waste.capacity - (storage_waste.current_amount or 0):
+        raise WasteTransferError(
+            f"Storage {storage_waste.storage_id} does not have sufficient capacity for {amount} of "
+            f"waste type {waste_type}."
+        )
+    if organization_waste.amount is None:
+        raise WasteTransferError(
+            f"Organization {organization_waste.organization_id} does not generate waste type {waste_type}."
+        )
+    if organization_waste.amount < amount:
+        raise WasteTransferError(
+            f"Organization {organization_waste.organization_id} has insufficient waste of type {waste_type}. "
+            f"Available: {organization_waste.amount}, Requested: {amount}."
+        )
+    return organization_waste, storage_waste
+
+
 async def transfer_waste(
         organization_id: int,
         storage_id: int,
         transfer_request: WasteTransferRequest,
-        organization_database: Annotated[OrganizationDatabaseGateway, Depends()],
-        storage_database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+        organization_database: OrganizationDatabaseGateway,
+        storage_database: StorageDatabaseGateway,
         uow: UoW
 ) -> None:
-    await organization_database.reduce_organization_waste(
-        organization_id=organization_id,
-        waste_type=transfer_request.waste_type,
-        amount=transfer_request.amount
-    )
+    """
+    Lock the organization and storage rows affected by the transfer, validate it and move the waste.
 
-    await storage_database.add_waste_to_storage(
-        storage_id=storage_id,
-        waste_type=transfer_request.waste_type,
-        amount=transfer_request.amount
-    )
+    Raises:
+        WasteTransferError: If the transfer is not possible, see subclasses for missing entities.
+    """
+    try:
+        organization_waste = await organization_database.lock_organization_waste(
+            organization_id,
+            transfer_request.waste_type
+        )
+        storage_waste = await storage_database.lock_storage_waste(storage_id, transfer_request.waste_type)
+        validate_waste_transfer(organization_waste, storage_waste, transfer_request.amount)
+
+        remaining_amount = await organization_database.reduce_organization_waste(
+            organization_id=organization_id,
+            waste_type=transfer_request.waste_type,
+            amount=transfer_request.amount
+        )
+        if remaining_amount is None:
+            raise WasteTransferConflictError()
+
+        stored_amount = await storage_database.add_waste_to_storage(
+            storage_id=storage_id,
+            waste_type=transfer_request.waste_type,
+            amount=transfer_request.amount
+        )
+        if stored_amount is None:
+            raise WasteTransferConflictError()
+    except WasteTransferError:
+        await uow.rollback()
+        raise
+
+    await uow.commit()
+
+
+async def transfer_waste_batch(
+        transfers: list[WasteTransferItem],
+        organization_database: OrganizationDatabaseGateway,
+        storage_database: StorageDatabaseGateway,
+        uow: UoW
+) -> list[WasteTransferResult]:
+    """
+    Validate transfers in order against the locked state, apply the valid ones in bulk and commit once.
 
+    Every transfer sees the waste already moved by the transfers before it, so a batch can never
+    oversubscribe a storage or overdraw an organization.
+    """
+    organization_states = {
+        (state.organization_id, state.waste_type): state
+        for state in await organization_database.lock_organization_wastes(
+            [(transfer.organization_id, transfer.waste_type) for transfer in transfers]
+        )
+    }
+    storage_states = {
+        (state.storage_id, state.waste_type): state
+        for state in await storage_database.lock_storage_wastes(
+            [(transfer.storage_id, transfer.waste_type) for transfer in transfers]
+        )
+    }
+
+    results = []
+    accepted = []
+    for transfer in transfers:
+        try:
+            organization_waste, storage_waste = validate_waste_transfer(
+                organization_states.get((transfer.organization_id, transfer.waste_type)),
+                storage_states.get((transfer.storage_id, transfer.waste_type)),
+                transfer.amount
+            )
+        except WasteTransferError as error:
+            results.append(WasteTransferResult(
+                **transfer.model_dump(),
+                transferred=False,
+                detail=error.detail
+            ))
+            continue
+        organization_waste.amount = (organization_waste.amount or 0) - transfer.amount
+        storage_waste.current_amount = (storage_waste.current_amount or 0) + transfer.amount
+        accepted.append(transfer)
+        results.append(WasteTransferResult(
+            **transfer.model_dump(),
+            transferred=True,
+            detail="Waste transferred successfully."
+        ))
+
+    if not accepted:
+        await uow.rollback()
+        return results
+    await organization_database.reduce_organization_wastes(accepted)
+    await storage_database.add_waste_to_storages(accepted)
     await uow.commit()
+    return results
+
+
+async def auto_dispose_waste(
+        organization_ids: list[int],
+        strategy: RoutingStrategy,
+        organization_database: OrganizationDatabaseGateway,
+        storage_database: StorageDatabaseGateway,
+        uow: UoW
+) -> AutoDisposeResponse:
+    """
+    Route all generated waste of the organizations to the storages with free capacity and transfer it.
+
+    The plan is computed from a snapshot of free capacities and applied with `transfer_waste_batch`,
+    which validates every route again against the locked rows. Planning is CPU bound,
+    so it runs in a worker thread instead of blocking the event loop.
+
+    Raises:
+        OrganizationNotFoundError: If any of the organizations does not exist.
+        RoutingProblemTooLargeError: If there are too many organization-storage pairs to plan.
+    """
+    organization_ids = list(dict.fromkeys(organization_ids))
+    organizations = await organization_database.get_organizations_by_ids(organization_ids)
+    if len(organizations) != len(organization_ids):
+        raise OrganizationNotFoundError()
+
+    waste_types = list(dict.fromkeys(
+        WasteType(waste.waste_type)
+        for organization in organizations
+        for waste in organization.generated_waste
+        if waste.amount > 0
+    ))
+    storages = await storage_database.get_free_capacities(waste_types)
+    routes = await asyncio.to_thread(plan_waste_routes, organizations, storages, strategy)
+    results = await transfer_waste_batch(
+        [WasteTransferItem(**route.model_dump(exclude={"distance"})) for route in routes],
+        organization_database,
+        storage_database,
+        uow
+    ) if routes else []
+
+    disposed: dict[tuple[int, WasteType], int] = {}
+    total_distance = 0.0
+    for route, result in zip(routes, results):
+        if result.transferred:
+            key = (route.organization_id, route.waste_type)
+            disposed[key] = disposed.get(key, 0) + route.amount
+            total_distance += route.amount * route.distance
+    undisposed = [
+        UndisposedWaste(
+            organization_id=organization.id,
+            waste_type=waste.waste_type,
+            amount=waste.amount - disposed.get((organization.id, WasteType(waste.waste_type)), 0)
+        )
+        for organization in organizations
+        for waste in organization.generated_waste
+        if waste.amount > disposed.get((organization.id, WasteType(waste.waste_type)), 0)
+    ]
+    return AutoDisposeResponse(
+        strategy=strategy,
+        transferred=sum(result.transferred for result in results),
+        total_distance=total_distance,
+        results=results,
+        undisposed=undisposed
+    )
 
 
 async def organization_generate_waste(
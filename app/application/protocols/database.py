@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, AsyncIterator, AsyncGenerator
 
-from app.application.models import Organization, OrganizationCreate, WasteType
-from app.application.models.storage import Storage, StorageCreate
+from app.application.models import Organization, OrganizationCreate, WasteType, OrganizationWaste
+from app.application.models.organization import OrganizationUpdate
+from app.application.models.location import Location
+from app.application.models.pool import PoolMetrics
+from app.application.models.storage import Storage, StorageCreate, StorageFreeCapacity, StorageUpdate
+from app.application.models.waste import OrganizationWasteState, StorageWasteState, WasteTransferItem
 
 
 class UoW(ABC):
@@ -14,55 +18,177 @@ class UoW(ABC):
     async def flush(self) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def rollback(self) -> None:
+        raise NotImplementedError
+
 
 class OrganizationDatabaseGateway(ABC):
 
     @abstractmethod
-    async def get_organizations(self) -> list[Organization]:
+    async def get_organizations(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> list[
+        Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_organizations(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[
+        Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_version(self) -> int:
+        """
+        Version of the organization data, increased by every committed write.
+        """
         raise NotImplementedError
 
     @abstractmethod
     async def get_organization_by_id(self, organization_id: int) -> Optional[Organization]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_organizations_by_ids(self, organization_ids: list[int]) -> list[Organization]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_organization_locations(self, organization_ids: list[int]) -> list[Location]:
+        raise NotImplementedError
+
     @abstractmethod
     async def create_organization(self, organization_data: OrganizationCreate) -> int:
         raise NotImplementedError
 
+    @abstractmethod
+    async def create_organizations(self, organizations_data: list[OrganizationCreate]) -> list[int]:
+        """
+        Insert many organizations at once, returning their ids in the given order.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def delete_organization_by_id(self, organization_id: int) -> Optional[int]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def delete_organizations(self, organization_ids: list[int]) -> list[int]:
+        """
+        Delete many organizations at once, returning the ids of the deleted ones in ascending order.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def update_organization_by_id(self, organization_id: int, organization_data: OrganizationCreate) -> Optional[
         int]:
+        """
+        Replace the organization, writing only the columns and waste rows that changed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def patch_organization_by_id(self, organization_id: int, organization_data: OrganizationUpdate) -> Optional[
+        int]:
+        """
+        Update only the fields set in `organization_data`, writing only the ones that changed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def lock_organization_waste(
+            self,
+            organization_id: int,
+            waste_type: WasteType
+    ) -> Optional[OrganizationWasteState]:
         raise NotImplementedError
 
     @abstractmethod
-    async def reduce_organization_waste(self, organization_id: int, waste_type: WasteType, amount: int) -> None:
+    async def lock_organization_wastes(
+            self,
+            keys: list[tuple[int, WasteType]]
+    ) -> list[OrganizationWasteState]:
         raise NotImplementedError
 
     @abstractmethod
-    async def generate_waste(self, organization_id: int, waste_type: WasteType, amount: int) -> None:
+    async def reduce_organization_waste(
+            self,
+            organization_id: int,
+            waste_type: WasteType,
+            amount: int
+    ) -> Optional[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reduce_organization_wastes(self, transfers: list[WasteTransferItem]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def generate_waste(self, organization_id: int, waste_type: WasteType, amount: int) -> int:
         raise NotImplementedError
 
 
 class StorageDatabaseGateway(ABC):
 
     @abstractmethod
-    async def get_storages(self) -> list[Storage]:
+    async def get_storages(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> list[Storage]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_storages(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Storage]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_version(self) -> int:
+        """
+        Version of the storage data, increased by every committed write.
+        """
         raise NotImplementedError
 
     @abstractmethod
     async def get_storage_by_id(self, storage_id: int) -> Optional[Storage]:
         raise NotImplementedError
 
+    @abstractmethod
+    def iter_available_storages(
+            self,
+            location_x: float,
+            location_y: float,
+            generated_waste: list[OrganizationWaste],
+            max_distance: Optional[float] = None,
+            limit: Optional[int] = None,
+            offset: int = 0,
+    ) -> AsyncGenerator[Storage, None]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_free_capacities(self, waste_types: list[WasteType]) -> list[StorageFreeCapacity]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_storage_locations(self, storage_ids: list[int]) -> list[Location]:
+        raise NotImplementedError
+
     @abstractmethod
     async def create_storage(self, storage_data: StorageCreate) -> int:
         raise NotImplementedError
 
+    @abstractmethod
+    async def create_storages(self, storages_data: list[StorageCreate]) -> list[int]:
+        """
+        Insert many storages at once, returning their ids in the given order.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def update_storage_by_id(self, storage_id: int, storage_data: StorageCreate) -> Optional[int]:
+        """
+        Replace the storage, writing only the columns, capacities and current levels that changed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def patch_storage_by_id(self, storage_id: int, storage_data: StorageUpdate) -> Optional[int]:
+        """
+        Update only the fields set in `storage_data`, writing only the ones that changed.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -70,5 +196,31 @@ class StorageDatabaseGateway(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def add_waste_to_storage(self, storage_id: int, waste_type: WasteType, amount: int) -> None:
+    async def delete_storages(self, storage_ids: list[int]) -> list[int]:
+        """
+        Delete many storages at once, returning the ids of the deleted ones in ascending order.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def lock_storage_waste(self, storage_id: int, waste_type: WasteType) -> Optional[StorageWasteState]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def lock_storage_wastes(self, keys: list[tuple[int, WasteType]]) -> list[StorageWasteState]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_waste_to_storage(self, storage_id: int, waste_type: WasteType, amount: int) -> Optional[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_waste_to_storages(self, transfers: list[WasteTransferItem]) -> None:
+        raise NotImplementedError
+
+
+class ConnectionPoolMonitor(ABC):
+
+    @abstractmethod
+    async def get_pool_metrics(self) -> PoolMetrics:
         raise NotImplementedError
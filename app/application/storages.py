@@ -1,16 +1,31 @@
-from typing import Optional
+from typing import Optional, AsyncIterator, AsyncIterable
 
-from app.application.models.storage import Storage, StorageCreate
+from app.application.batching import chunked
+from app.application.models.storage import Storage, StorageCreate, StorageUpdate
 from app.application.protocols.database import StorageDatabaseGateway, UoW
 
 
+async def get_storages_version(database: StorageDatabaseGateway) -> int:
+    return await database.get_version()
+
+
 async def get_storages_data(
         database: StorageDatabaseGateway,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
 ) -> list[Storage]:
-    storage_list = await database.get_storages()
+    storage_list = await database.get_storages(after_id, limit)
     return storage_list
 
 
+def stream_storages_data(
+        database: StorageDatabaseGateway,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+) -> AsyncIterator[Storage]:
+    return database.iter_storages(after_id, limit)
+
+
 async def get_storage_data(
         storage_id: int,
         database: StorageDatabaseGateway,
@@ -29,6 +44,24 @@ async def add_storage(
     return storage_id
 
 
+async def import_storages(
+        storages_data: AsyncIterable[StorageCreate],
+        database: StorageDatabaseGateway,
+        uow: UoW,
+        chunk_size: int,
+) -> AsyncIterator[list[int]]:
+    """
+    Insert storages in chunks of `chunk_size`, committing every chunk on its own,
+    and yield the ids of each chunk once it is committed.
+
+    Chunks committed before a failure stay in the database.
+    """
+    async for chunk in chunked(storages_data, chunk_size):
+        storage_ids = await database.create_storages(chunk)
+        await uow.commit()
+        yield storage_ids
+
+
 async def update_storage_by_id(
         storage_id: int,
         storage_data: StorageCreate,
@@ -40,6 +73,17 @@ async def update_storage_by_id(
     return updated_storage_id
 
 
+async def patch_storage_by_id(
+        storage_id: int,
+        storage_data: StorageUpdate,
+        database: StorageDatabaseGateway,
+        uow: UoW,
+) -> Optional[int]:
+    updated_storage_id = await database.patch_storage_by_id(storage_id, storage_data)
+    await uow.commit()
+    return updated_storage_id
+
+
 async def delete_storage_by_id(
         organization_id: int,
         database: StorageDatabaseGateway,
@@ -48,3 +92,13 @@ async def delete_storage_by_id(
     deleted_organization_id = await database.delete_storage_by_id(organization_id)
     await uow.commit()
     return deleted_organization_id
+
+
+async def delete_storages(
+        storage_ids: list[int],
+        database: StorageDatabaseGateway,
+        uow: UoW,
+) -> list[int]:
+    deleted_storage_ids = await database.delete_storages(storage_ids)
+    await uow.commit()
+    return deleted_storage_ids
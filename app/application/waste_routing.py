@@ -0,0 +1,200 @@
+import heapq
+import math
+from collections import defaultdict
+
+import numpy as np
+
+from app.application.distances import distance_matrix, sorted_pairs, DistanceMatrix
+from app.application.exceptions import RoutingProblemTooLargeError
+from app.application.models import Organization, WasteType
+from app.application.models.routing import RoutingStrategy, WasteRoute
+from app.application.models.storage import StorageFreeCapacity
+
+Flows = dict[tuple[int, int], int]
+
+# Organization-storage pairs of one waste type the planner accepts, bounding the time and memory of a plan.
+MAX_ROUTING_PAIRS = 250_000
+
+
+def greedy_assignment(costs: DistanceMatrix, supplies: list[int], capacities: list[int]) -> Flows:
+    """
+    Fill the shortest organization-storage pairs first until either side runs out.
+    """
+    supplies = list(supplies)
+    capacities = list(capacities)
+    remaining = min(sum(supplies), sum(capacities))
+    flows: Flows = {}
+    for row, column in sorted_pairs(costs):
+        if not remaining:
+            break
+        amount = min(supplies[row], capacities[column])
+        if amount <= 0:
+            continue
+        flows[row, column] = amount
+        supplies[row] -= amount
+        capacities[column] -= amount
+        remaining -= amount
+    return flows
+
+
+def min_cost_flow_assignment(costs: DistanceMatrix, supplies: list[int], capacities: list[int]) -> Flows:
+    """
+    Move as much waste as the storages can take at the minimum total amount times distance.
+
+    Successive shortest paths on the transportation network source -> organizations -> storages -> sink,
+    where organization-storage edges are unbounded. Each path is found with Dijkstra over reduced costs
+    that relaxes a whole row of storages at once and stops as soon as the sink is settled.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    organizations, storages = costs.shape
+    supplies = list(supplies)
+    capacities = list(capacities)
+    # Flow on organization -> storage edges, kept per storage for the residual storage -> organization edges.
+    storage_flows: list[dict[int, int]] = [defaultdict(int) for _ in range(storages)]
+    organization_potential = np.zeros(organizations)
+    storage_potential = np.zeros(storages)
+    sink_potential = 0.0
+
+    while True:
+        organization_distance = np.full(organizations, np.inf)
+        organization_previous = np.full(organizations, -1)
+        organization_done = np.zeros(organizations, dtype=bool)
+        storage_distance = np.full(storages, np.inf)
+        storage_previous = np.full(storages, -1)
+        storage_done = np.zeros(storages, dtype=bool)
+        sink_distance, sink_previous = math.inf, -1
+
+        heap = []
+        for row in range(organizations):
+            if supplies[row] > 0:
+                organization_distance[row] = max(0.0, -organization_potential[row])
+                heap.append((organization_distance[row], row))
+        heapq.heapify(heap)
+        while True:
+            organization_candidate = heap[0][0] if heap else math.inf
+            unsettled = np.where(storage_done, np.inf, storage_distance)
+            column = int(np.argmin(unsettled))
+            storage_candidate = unsettled[column]
+            if sink_distance <= min(organization_candidate, storage_candidate):
+                break
+            if organization_candidate <= storage_candidate:
+                distance, row = heapq.heappop(heap)
+                if organization_done[row]:
+                    continue
+                organization_done[row] = True
+                # Reduced costs are non-negative up to rounding, clamp so the search tree stays acyclic.
+                candidate = distance + np.maximum(0.0, costs[row] + organization_potential[row] - storage_potential)
+                improved = (candidate < storage_distance) & ~storage_done
+                storage_distance[improved] = candidate[improved]
+                storage_previous[improved] = row
+                continue
+
+            storage_done[column] = True
+            for row, flow in storage_flows[column].items():
+                if flow <= 0 or organization_done[row]:
+                    continue
+                candidate = storage_candidate + max(
+                    0.0, storage_potential[column] - costs[row, column] - organization_potential[row]
+                )
+                if candidate < organization_distance[row]:
+                    organization_distance[row] = candidate
+                    organization_previous[row] = column
+                    heapq.heappush(heap, (candidate, row))
+            if capacities[column] > 0:
+                candidate = storage_candidate + max(0.0, storage_potential[column] - sink_potential)
+                if candidate < sink_distance:
+                    sink_distance, sink_previous = candidate, column
+
+        if sink_distance == math.inf:
+            break
+        organization_potential += np.minimum(organization_distance, sink_distance)
+        storage_potential += np.minimum(storage_distance, sink_distance)
+        sink_potential += sink_distance
+
+        # Walk the path back from the sink: forward edges organization -> storage alternate with
+        # residual edges storage -> organization that cancel earlier flow.
+        forward_edges = []
+        backward_edges = []
+        column = sink_previous
+        amount = capacities[column]
+        while True:
+            row = int(storage_previous[column])
+            forward_edges.append((row, column))
+            column = int(organization_previous[row])
+            if column == -1:
+                amount = min(amount, supplies[row])
+                break
+            backward_edges.append((row, column))
+            amount = min(amount, storage_flows[column][row])
+
+        supplies[row] -= amount
+        capacities[sink_previous] -= amount
+        for row, column in forward_edges:
+            storage_flows[column][row] += amount
+        for row, column in backward_edges:
+            storage_flows[column][row] -= amount
+
+    return {
+        (row, column): flow
+        for column, flows in enumerate(storage_flows)
+        for row, flow in flows.items()
+        if flow > 0
+    }
+
+
+ASSIGNMENTS = {
+    RoutingStrategy.GREEDY: greedy_assignment,
+    RoutingStrategy.MIN_COST_FLOW: min_cost_flow_assignment,
+}
+
+
+def plan_waste_routes(
+        organizations: list[Organization],
+        storages: list[StorageFreeCapacity],
+        strategy: RoutingStrategy,
+) -> list[WasteRoute]:
+    """
+    Assign the generated waste of the organizations to storages with free capacity, waste type by waste type.
+
+    Raises:
+        RoutingProblemTooLargeError: If a waste type has more than `MAX_ROUTING_PAIRS` organization-storage pairs.
+    """
+    assign = ASSIGNMENTS[strategy]
+    routes = []
+    for waste_type in WasteType:
+        sources = [
+            (organization, waste.amount)
+            for organization in organizations
+            for waste in organization.generated_waste
+            if waste.waste_type == waste_type and waste.amount > 0
+        ]
+        destinations = [
+            storage for storage in storages
+            if storage.waste_type == waste_type and storage.free_capacity > 0
+        ]
+        if not sources or not destinations:
+            continue
+        pairs = len(sources) * len(destinations)
+        if pairs > MAX_ROUTING_PAIRS:
+            raise RoutingProblemTooLargeError(
+                f"Routing {waste_type.value} waste needs {pairs} organization-storage pairs, "
+                f"at most {MAX_ROUTING_PAIRS} are supported"
+            )
+        costs = distance_matrix(
+            [(organization.location_x, organization.location_y) for organization, _ in sources],
+            [(storage.location_x, storage.location_y) for storage in destinations],
+        )
+        flows = assign(
+            costs,
+            [amount for _, amount in sources],
+            [storage.free_capacity for storage in destinations],
+        )
+        for (row, column), amount in sorted(flows.items()):
+            routes.append(WasteRoute(
+                organization_id=sources[row][0].id,
+                storage_id=destinations[column].storage_id,
+                waste_type=waste_type,
+                amount=amount,
+                distance=float(costs[row][column]),
+            ))
+    return routes
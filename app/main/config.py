@@ -0,0 +1,55 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """
+    Engine and connection pool settings read from the environment.
+
+    `statement_timeout` is in seconds. It is applied as `statement_timeout` on PostgreSQL,
+    `max_execution_time` on MySQL and as the lock wait timeout on SQLite.
+    With `replica_uri` plain reads go to the replica, except for a client's requests
+    during `read_your_writes_window` seconds after its last write.
+    """
+    uri: str
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    statement_timeout: Optional[float] = None
+    replica_uri: Optional[str] = None
+    read_your_writes_window: float = 5
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        uri = os.getenv('DATABASE_URI')
+        if not uri:
+            raise ValueError("DB_URI env variable is not set")
+        return cls(
+            uri=uri,
+            echo=env_bool('DB_ECHO', cls.echo),
+            pool_size=int(os.getenv('DB_POOL_SIZE', cls.pool_size)),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', cls.max_overflow)),
+            pool_timeout=float(os.getenv('DB_POOL_TIMEOUT', cls.pool_timeout)),
+            pool_recycle=int(os.getenv('DB_POOL_RECYCLE', cls.pool_recycle)),
+            pool_pre_ping=env_bool('DB_POOL_PRE_PING', cls.pool_pre_ping),
+            statement_timeout=env_float('DB_STATEMENT_TIMEOUT'),
+            replica_uri=os.getenv('DATABASE_REPLICA_URI') or None,
+            read_your_writes_window=float(os.getenv('DB_READ_YOUR_WRITES_WINDOW', cls.read_your_writes_window)),
+        )
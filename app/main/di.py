@@ -1,62 +1,261 @@
+import math
 import os
+from contextlib import asynccontextmanager
+from dataclasses import replace
 from functools import partial
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator, Any, cast
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Depends
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from fastapi import FastAPI, Depends, Request, Response
+from redis.asyncio import Redis
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine.default import DefaultDialect
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.pool import QueuePool
 
+from app.adapters.cache_backends import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from app.adapters.cached_gateway import CachedStorageGateway, CachedOrganizationGateway
+from app.adapters.entity_cache import EntityCache, CacheInvalidationChannel, CacheInvalidator, InvalidatingUoW
+from app.adapters.replica_gateway import ReplicaOrganizationGateway, ReplicaStorageGateway, ReadYourWritesUoW
+from app.adapters.sqlalchemy_db.engine import set_statement_timeout, SqlaConnectionPoolMonitor, set_read_only, \
+    enable_foreign_keys
 from app.adapters.sqlalchemy_db.gateway import OrganizationSqlaGateway, StorageSqlaGateway
 from app.api.depends_stub import Stub
-from app.application.protocols.database import UoW, OrganizationDatabaseGateway, StorageDatabaseGateway
+from app.application.models import Organization
+from app.application.models.storage import Storage
+from app.application.protocols.database import UoW, OrganizationDatabaseGateway, StorageDatabaseGateway, \
+    ConnectionPoolMonitor
+from app.main.config import DatabaseSettings
+
+PRIMARY_READS_COOKIE = "read-primary"
 
 
 async def new_gateway(
-        session: AsyncSession = Depends(Stub(AsyncSession))
-) -> AsyncGenerator[OrganizationSqlaGateway, None]:
-    yield OrganizationSqlaGateway(session)
+        organization_cache: EntityCache[Organization],
+        session_maker: async_sessionmaker[AsyncSession],
+        session: AsyncSession = Depends(Stub(AsyncSession)),
+        invalidator: CacheInvalidator = Depends(Stub(CacheInvalidator)),
+) -> AsyncGenerator[CachedOrganizationGateway, None]:
+    gateway = OrganizationSqlaGateway(session, session_maker)
+    yield CachedOrganizationGateway(gateway, organization_cache, invalidator)
 
 
 async def new_storage_gateway(
-        session: AsyncSession = Depends(Stub(AsyncSession))
+        storage_cache: EntityCache[Storage],
+        session_maker: async_sessionmaker[AsyncSession],
+        session: AsyncSession = Depends(Stub(AsyncSession)),
+        invalidator: CacheInvalidator = Depends(Stub(CacheInvalidator)),
+) -> AsyncGenerator[CachedStorageGateway, None]:
+    gateway = StorageSqlaGateway(session, session_maker)
+    yield CachedStorageGateway(gateway, storage_cache, invalidator)
+
+
+async def new_replicated_gateway(
+        organization_cache: EntityCache[Organization],
+        session_maker: async_sessionmaker[AsyncSession],
+        replica_session_maker: async_sessionmaker[AsyncSession],
+        request: Request,
+        session: AsyncSession = Depends(Stub(AsyncSession)),
+        replica_session: AsyncSession = Depends(Stub(AsyncSession, replica=True)),
+        invalidator: CacheInvalidator = Depends(Stub(CacheInvalidator)),
+) -> AsyncGenerator[OrganizationDatabaseGateway, None]:
+    """
+    The cache is only filled from the primary: a lagging replica would put rows back
+    into it that a write has just invalidated. Clients that must see their writes read
+    everything from the primary through the cache, the others read the replica directly.
+    """
+    primary = CachedOrganizationGateway(
+        OrganizationSqlaGateway(session, session_maker), organization_cache, invalidator
+    )
+    if PRIMARY_READS_COOKIE in request.cookies:
+        yield primary
+        return
+    yield ReplicaOrganizationGateway(primary, OrganizationSqlaGateway(replica_session, replica_session_maker))
+
+
+async def new_replicated_storage_gateway(
+        storage_cache: EntityCache[Storage],
+        session_maker: async_sessionmaker[AsyncSession],
+        replica_session_maker: async_sessionmaker[AsyncSession],
+        request: Request,
+        session: AsyncSession = Depends(Stub(AsyncSession)),
+        replica_session: AsyncSession = Depends(Stub(AsyncSession, replica=True)),
+        invalidator: CacheInvalidator = Depends(Stub(CacheInvalidator)),
+) -> AsyncGenerator[StorageDatabaseGateway, None]:
+    primary = CachedStorageGateway(StorageSqlaGateway(session, session_maker), storage_cache, invalidator)
+    if PRIMARY_READS_COOKIE in request.cookies:
+        yield primary
+        return
+    yield ReplicaStorageGateway(primary, StorageSqlaGateway(replica_session, replica_session_maker))
+
+
+def read_session_maker(
+        request: Request,
+        session_maker: async_sessionmaker[AsyncSession],
+        replica_session_maker: async_sessionmaker[AsyncSession],
+) -> async_sessionmaker[AsyncSession]:
+    """
+    Session maker for streamed reads, picking the same database as `new_replica_session`.
+    """
+    if PRIMARY_READS_COOKIE in request.cookies:
+        return session_maker
+    return replica_session_maker
+
+
+async def new_export_gateway(
+        session_maker: async_sessionmaker[AsyncSession],
+        replica_session_maker: async_sessionmaker[AsyncSession],
+        request: Request,
+        session: AsyncSession = Depends(Stub(AsyncSession, replica=True)),
+) -> AsyncGenerator[OrganizationSqlaGateway, None]:
+    # Exports stream every row once, so they skip the cache instead of filling it.
+    yield OrganizationSqlaGateway(session, read_session_maker(request, session_maker, replica_session_maker))
+
+
+async def new_export_storage_gateway(
+        session_maker: async_sessionmaker[AsyncSession],
+        replica_session_maker: async_sessionmaker[AsyncSession],
+        request: Request,
+        session: AsyncSession = Depends(Stub(AsyncSession, replica=True)),
 ) -> AsyncGenerator[StorageSqlaGateway, None]:
-    yield StorageSqlaGateway(session)
+    yield StorageSqlaGateway(session, read_session_maker(request, session_maker, replica_session_maker))
+
+
+def new_cache_invalidator(channel: CacheInvalidationChannel) -> CacheInvalidator:
+    return CacheInvalidator(channel)
 
 
 async def new_uow(
-        session: AsyncSession = Depends(Stub(AsyncSession))
-) -> AsyncSession:
-    return session
+        session: AsyncSession = Depends(Stub(AsyncSession)),
+        invalidator: CacheInvalidator = Depends(Stub(CacheInvalidator)),
+) -> InvalidatingUoW:
+    return InvalidatingUoW(session, invalidator)
 
 
-def create_session_maker() -> async_sessionmaker[AsyncSession]:
-    load_dotenv()
-    db_uri = os.getenv('DATABASE_URI')
-    if not db_uri:
-        raise ValueError("DB_URI env variable is not set")
+async def new_read_your_writes_uow(
+        window: float,
+        response: Response,
+        session: AsyncSession = Depends(Stub(AsyncSession)),
+        invalidator: CacheInvalidator = Depends(Stub(CacheInvalidator)),
+) -> ReadYourWritesUoW:
+    return ReadYourWritesUoW(
+        InvalidatingUoW(session, invalidator),
+        partial(response.set_cookie, PRIMARY_READS_COOKIE, "1", max_age=math.ceil(window), httponly=True),
+    )
+
+
+def pool_size_options(settings: DatabaseSettings) -> dict[str, Any]:
+    """
+    Sizing options for the pool the dialect picks for the URI.
+
+    Only queue pools are sized: the StaticPool of in-memory SQLite and the NullPool
+    some drivers use reject these options.
+    """
+    url = make_url(settings.uri)
+    dialect = cast(type[DefaultDialect], url.get_dialect())
+    if not issubclass(dialect.get_pool_class(url), QueuePool):
+        return {}
+    return dict(pool_size=settings.pool_size, max_overflow=settings.max_overflow, pool_timeout=settings.pool_timeout)
 
+
+def create_engine(settings: DatabaseSettings) -> AsyncEngine:
     engine = create_async_engine(
-        db_uri,
-        echo=True,
-        # pool_size=15,
-        # max_overflow=15,
-        # connect_args={
-        #     "connect_timeout": 5,
-        # },
+        settings.uri,
+        echo=settings.echo,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+        **pool_size_options(settings),
     )
+    enable_foreign_keys(engine)
+    if settings.statement_timeout is not None:
+        set_statement_timeout(engine, settings.statement_timeout)
+    return engine
+
+
+def create_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 
+def create_cache_backend() -> CacheBackend:
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url:
+        return RedisCacheBackend(Redis.from_url(redis_url))
+    return InMemoryCacheBackend()
+
+
 async def new_session(session_maker: async_sessionmaker[AsyncSession]) -> AsyncGenerator[AsyncSession, None]:
     async with session_maker() as session:
         yield session
 
 
+async def new_replica_session(
+        session_maker: async_sessionmaker[AsyncSession],
+        request: Request,
+        session: AsyncSession = Depends(Stub(AsyncSession)),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session on the replica, or the primary session for clients that wrote recently and must see their writes.
+    """
+    if PRIMARY_READS_COOKIE in request.cookies:
+        yield session
+        return
+    async with session_maker() as replica_session:
+        yield replica_session
+
+
 def init_dependencies(app: FastAPI) -> None:
-    session_maker = create_session_maker()
+    load_dotenv()
+    settings = DatabaseSettings.from_env()
+    engine = create_engine(settings)
+    session_maker = create_session_maker(engine)
+    pool_monitor = SqlaConnectionPoolMonitor(engine, settings.max_overflow)
+    cache_backend = create_cache_backend()
+    cache_size = int(os.getenv('CACHE_SIZE', 1024))
+    cache_ttl = float(os.getenv('CACHE_TTL', 60))
+    organization_cache = EntityCache("organizations", Organization, cache_backend, cache_size, cache_ttl)
+    storage_cache = EntityCache("storages", Storage, cache_backend, cache_size, cache_ttl)
+    cache_channel = CacheInvalidationChannel(cache_backend, [organization_cache, storage_cache])
+    app.state.engine = engine
+    app.state.cache_backend = cache_backend
+    app.state.cache_channel = cache_channel
 
     app.dependency_overrides[AsyncSession] = partial(new_session, session_maker)
-    app.dependency_overrides[OrganizationDatabaseGateway] = new_gateway
-    app.dependency_overrides[StorageDatabaseGateway] = new_storage_gateway
+    app.dependency_overrides[CacheInvalidator] = partial(new_cache_invalidator, cache_channel)
+    if settings.replica_uri:
+        replica_engine = create_engine(replace(settings, uri=settings.replica_uri))
+        set_read_only(replica_engine)
+        app.state.replica_engine = replica_engine
+        replica_session_maker = create_session_maker(replica_engine)
+        app.dependency_overrides[Stub(AsyncSession, replica=True)] = partial(new_replica_session, replica_session_maker)
+        app.dependency_overrides[OrganizationDatabaseGateway] = partial(
+            new_replicated_gateway, organization_cache, session_maker, replica_session_maker
+        )
+        app.dependency_overrides[StorageDatabaseGateway] = partial(
+            new_replicated_storage_gateway, storage_cache, session_maker, replica_session_maker
+        )
+        app.dependency_overrides[UoW] = partial(new_read_your_writes_uow, settings.read_your_writes_window)
+    else:
+        app.state.replica_engine = None
+        # Without a replica, the reads meant for it go to the primary.
+        replica_session_maker = session_maker
+        app.dependency_overrides[Stub(AsyncSession, replica=True)] = partial(new_session, session_maker)
+        app.dependency_overrides[OrganizationDatabaseGateway] = partial(new_gateway, organization_cache, session_maker)
+        app.dependency_overrides[StorageDatabaseGateway] = partial(new_storage_gateway, storage_cache, session_maker)
+        app.dependency_overrides[UoW] = new_uow
+    app.dependency_overrides[Stub(OrganizationDatabaseGateway, export=True)] = partial(
+        new_export_gateway, session_maker, replica_session_maker
+    )
+    app.dependency_overrides[Stub(StorageDatabaseGateway, export=True)] = partial(
+        new_export_storage_gateway, session_maker, replica_session_maker
+    )
+    app.dependency_overrides[ConnectionPoolMonitor] = lambda: pool_monitor
+
 
-    app.dependency_overrides[UoW] = new_uow
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    async with app.state.cache_channel.listening():
+        yield
+    await app.state.cache_backend.close()
+    await app.state.engine.dispose()
+    if app.state.replica_engine is not None:
+        await app.state.replica_engine.dispose()
@@ -0,0 +1,71 @@
+"""
+Export all organizations or storages to a file or to stdout.
+
+Usage:
+    python -m app.main.export {organizations,storages} [--format {ndjson,csv,parquet}] [--output PATH]
+
+Reads `DATABASE_URI`, or `DATABASE_REPLICA_URI` when it is set, from the environment or `.env`.
+"""
+import argparse
+import asyncio
+import sys
+from dataclasses import replace
+from typing import AsyncIterator, BinaryIO, Optional
+
+from dotenv import load_dotenv
+
+from app.adapters.sqlalchemy_db.gateway import OrganizationSqlaGateway, StorageSqlaGateway
+from app.application.exceptions import ExportFormatUnavailableError
+from app.application.export import ExportFormat, export_organizations, export_storages, check_export_format
+from app.main.config import DatabaseSettings
+from app.main.di import create_engine, create_session_maker
+
+
+async def write_all(content: AsyncIterator[bytes], output: BinaryIO) -> None:
+    async for chunk in content:
+        output.write(chunk)
+
+
+async def export(table: str, export_format: ExportFormat, output: BinaryIO, after_id: Optional[int]) -> None:
+    settings = DatabaseSettings.from_env()
+    if settings.replica_uri:
+        settings = replace(settings, uri=settings.replica_uri)
+    engine = create_engine(settings)
+    try:
+        async with create_session_maker(engine)() as session:
+            if table == "organizations":
+                content = export_organizations(OrganizationSqlaGateway(session), export_format, after_id)
+            else:
+                content = export_storages(StorageSqlaGateway(session), export_format, after_id)
+            await write_all(content, output)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export all organizations or storages.")
+    parser.add_argument("table", choices=["organizations", "storages"])
+    parser.add_argument(
+        "--format",
+        dest="export_format",
+        choices=[export_format.value for export_format in ExportFormat],
+        default=ExportFormat.NDJSON.value,
+    )
+    parser.add_argument("--output", help="file to write, stdout when omitted")
+    parser.add_argument("--after-id", type=int, help="resume after this ID")
+    args = parser.parse_args()
+    export_format = ExportFormat(args.export_format)
+    try:
+        check_export_format(export_format)
+    except ExportFormatUnavailableError as error:
+        parser.exit(1, f"{error.detail}\n")
+    load_dotenv()
+    if args.output:
+        with open(args.output, "wb") as output:
+            asyncio.run(export(args.table, export_format, output, args.after_id))
+    else:
+        asyncio.run(export(args.table, export_format, sys.stdout.buffer, args.after_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
+import os
+
+from dotenv import load_dotenv
 from fastapi import FastAPI
 
-from .di import init_dependencies
+from app.api.responses import default_response_class
+from .di import init_dependencies, lifespan
 from .routers import init_routers
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    load_dotenv()
+    app = FastAPI(lifespan=lifespan, default_response_class=default_response_class(os.getenv('JSON_RESPONSE')))
     init_routers(app)
     init_dependencies(app)
     return app
-
@@ -0,0 +1,84 @@
+"""
+Latency of the nearest available storages lookup behind `GET /organizations/{id}/available-storages/`
+on a realistic storages table: the first page, a later page, every storage, and a `max_distance` radius.
+Each lookup must stay a single ordered statement, however many storages it skips or returns.
+
+Usage:
+    python -m benchmarks.bench_available_storages [rows] [repeat]
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from contextlib import aclosing
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.adapters.sqlalchemy_db.gateway import StorageSqlaGateway
+from app.application.models import OrganizationWaste, WasteType
+from benchmarks.bench_list_throughput import populate
+
+GENERATED_WASTE = [
+    OrganizationWaste(waste_type=WasteType.GLASS, amount=10),
+    OrganizationWaste(waste_type=WasteType.PLASTIC, amount=10),
+]
+
+
+async def available_storages(
+        session: AsyncSession,
+        max_distance: Optional[float],
+        limit: Optional[int],
+        offset: int,
+) -> int:
+    storages = StorageSqlaGateway(session).iter_available_storages(
+        500, 500, GENERATED_WASTE, max_distance, limit, offset
+    )
+    async with aclosing(storages):
+        return len([storage async for storage in storages])
+
+
+async def measure(
+        label: str,
+        session_maker: async_sessionmaker[AsyncSession],
+        statements: list[str],
+        repeat: int,
+        max_distance: Optional[float] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        async with session_maker() as session:
+            statements.clear()
+            started = time.perf_counter()
+            found = await available_storages(session, max_distance, limit, offset)
+            elapsed += time.perf_counter() - started
+            assert len(statements) == 1, f"{label}: {len(statements)} statements"
+    elapsed /= repeat
+    print(f"{label:<32}{found:>8} storages{elapsed * 1000:>10.1f} ms")
+    return elapsed
+
+
+async def main(rows: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        uri = f"sqlite+aiosqlite:///{directory}/bench.db"
+        await populate(uri, rows)
+        engine = create_async_engine(uri)
+        statements: list[str] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        print(f"storages: {rows}, repeat: {repeat}")
+        await measure("first 10", session_maker, statements, repeat, limit=10)
+        await measure("10 after 1000", session_maker, statements, repeat, limit=10, offset=1000)
+        await measure("all", session_maker, statements, repeat)
+        await measure("within 50", session_maker, statements, repeat, max_distance=50)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    ))
@@ -0,0 +1,78 @@
+"""
+Importing storages through the SQLAlchemy gateway: one `create_storage` and commit per storage,
+as `POST /storages/` does, against `create_storages` committing chunk by chunk, as
+`POST /storages/bulk/` does.
+
+Usage:
+    python -m benchmarks.bench_bulk_import [rows] [chunk_size]
+"""
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from typing import AsyncIterator, cast
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.adapters.sqlalchemy_db import models
+from app.adapters.sqlalchemy_db.gateway import StorageSqlaGateway
+from app.application.models import WasteType
+from app.application.models.storage import StorageCreate
+from app.application.models.storage_capacity import StorageCapacity
+from app.application.models.storage_current_level import StorageCurrentLevel
+from app.application.protocols.database import UoW
+from app.application.storages import add_storage, import_storages
+
+
+def storages_data(rows: int) -> list[StorageCreate]:
+    rng = random.Random(0)
+    return [
+        StorageCreate(
+            name=f"МНО {i}",
+            location_x=rng.uniform(0, 1000),
+            location_y=rng.uniform(0, 1000),
+            capacities=[StorageCapacity(waste_type=waste_type, capacity=1000) for waste_type in WasteType],
+            current_levels=[
+                StorageCurrentLevel(waste_type=waste_type, current_amount=rng.randint(0, 1000))
+                for waste_type in WasteType
+            ],
+        )
+        for i in range(rows)
+    ]
+
+
+async def iterate(items: list[StorageCreate]) -> AsyncIterator[StorageCreate]:
+    for item in items:
+        yield item
+
+
+async def main(rows: int, chunk_size: int) -> None:
+    data = storages_data(rows)
+    print(f"rows: {rows}, chunk size: {chunk_size}")
+    for label in ("one storage per request", "bulk"):
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/bench.db")
+            async with engine.begin() as connection:
+                await connection.run_sync(models.Base.metadata.create_all)
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                database = StorageSqlaGateway(session)
+                # The session commits, flushes and rolls back like the application's UoW, minus cache invalidation.
+                uow = cast(UoW, session)
+                started = time.perf_counter()
+                if label == "bulk":
+                    async for _ in import_storages(iterate(data), database, uow, chunk_size):
+                        pass
+                else:
+                    for storage_data in data:
+                        await add_storage(storage_data, database, uow)
+                elapsed = time.perf_counter() - started
+            await engine.dispose()
+        print(f"{label:<28}{elapsed * 1000:>10.1f} ms{rows / elapsed:>12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+    ))
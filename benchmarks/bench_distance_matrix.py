@@ -0,0 +1,71 @@
+"""
+Distance matrix between organizations and storages: awaiting `calculate_distance` per pair
+against the pure-Python and NumPy matrices of `app.application.distances`.
+
+Usage:
+    python -m benchmarks.bench_distance_matrix [organizations] [storages]
+"""
+import asyncio
+import math
+import random
+import sys
+import time
+from typing import Callable
+
+from app.application.distances import distance_matrix, Point
+from app.application.models import Organization
+from app.application.models.storage import Storage
+from app.application.organizations import calculate_distance
+
+
+def python_distance_matrix(origins: list[Point], destinations: list[Point]) -> list[list[float]]:
+    return [
+        [math.hypot(origin_x - destination_x, origin_y - destination_y) for destination_x, destination_y in destinations]
+        for origin_x, origin_y in origins
+    ]
+
+
+async def per_pair(organizations: list[Organization], storages: list[Storage]) -> list[list[float]]:
+    return [
+        [await calculate_distance(organization, storage) for storage in storages]
+        for organization in organizations
+    ]
+
+
+def measure(label: str, function: Callable[[], object], pairs: int) -> float:
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24}{elapsed * 1000:>10.1f} ms {elapsed / pairs * 1e9:>8.1f} ns per pair")
+    return elapsed
+
+
+def main(organization_count: int, storage_count: int) -> None:
+    rng = random.Random(0)
+    organizations = [
+        Organization(id=i, name=f"ОО {i}", location_x=rng.uniform(0, 1000), location_y=rng.uniform(0, 1000),
+                     generated_waste=[])
+        for i in range(organization_count)
+    ]
+    storages = [
+        Storage(id=i, name=f"МНО {i}", location_x=rng.uniform(0, 1000), location_y=rng.uniform(0, 1000),
+                capacities=[], current_levels=[])
+        for i in range(storage_count)
+    ]
+    origins = [(organization.location_x, organization.location_y) for organization in organizations]
+    destinations = [(storage.location_x, storage.location_y) for storage in storages]
+    pairs = organization_count * storage_count
+
+    print(f"organizations: {organization_count}, storages: {storage_count}, pairs: {pairs}")
+    per_pair_time = measure("await per pair", lambda: asyncio.run(per_pair(organizations, storages)), pairs)
+    python_time = measure("pure-Python matrix", lambda: python_distance_matrix(origins, destinations), pairs)
+    numpy_time = measure("NumPy matrix", lambda: distance_matrix(origins, destinations), pairs)
+    print(f"NumPy speedup: {per_pair_time / numpy_time:.1f}x over per pair, "
+          f"{python_time / numpy_time:.1f}x over pure Python")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10_000,
+    )
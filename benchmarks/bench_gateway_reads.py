@@ -0,0 +1,83 @@
+"""
+Reading every organization and storage through the SQLAlchemy gateways, which select plain
+columns, against loading full ORM entities with `selectinload` and validating them.
+
+Usage:
+    python -m benchmarks.bench_gateway_reads [rows] [repeat]
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.adapters.sqlalchemy_db import models
+from app.adapters.sqlalchemy_db.gateway import OrganizationSqlaGateway, StorageSqlaGateway
+from app.application.models import Organization
+from app.application.models.storage import Storage
+from benchmarks.bench_list_throughput import populate
+
+
+async def entity_organizations(session: AsyncSession) -> list[Organization]:
+    result = await session.execute(
+        select(models.Organization).options(selectinload(models.Organization.generated_waste))
+        .order_by(models.Organization.id)
+    )
+    return [Organization.model_validate(organization) for organization in result.scalars().all()]
+
+
+async def entity_storages(session: AsyncSession) -> list[Storage]:
+    result = await session.execute(
+        select(models.Storage).options(selectinload(models.Storage.capacities))
+        .options(selectinload(models.Storage.current_levels))
+        .order_by(models.Storage.id)
+    )
+    return [Storage.model_validate(storage) for storage in result.scalars().all()]
+
+
+async def measure(
+        label: str,
+        session_maker: async_sessionmaker[AsyncSession],
+        read: Callable[[AsyncSession], Awaitable[list[Organization] | list[Storage]]],
+        repeat: int,
+) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        async with session_maker() as session:
+            started = time.perf_counter()
+            await read(session)
+            elapsed += time.perf_counter() - started
+    elapsed /= repeat
+    print(f"{label:<32}{elapsed * 1000:>10.1f} ms")
+    return elapsed
+
+
+async def main(rows: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        uri = f"sqlite+aiosqlite:///{directory}/bench.db"
+        await populate(uri, rows)
+        engine = create_async_engine(uri)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        print(f"rows: {rows}, repeat: {repeat}")
+        async with session_maker() as session:
+            assert await OrganizationSqlaGateway(session).get_organizations() == await entity_organizations(session)
+            assert await StorageSqlaGateway(session).get_storages() == await entity_storages(session)
+        for label, read in (
+                ("organizations, ORM entities", entity_organizations),
+                ("organizations, columns", lambda session: OrganizationSqlaGateway(session).get_organizations()),
+                ("storages, ORM entities", entity_storages),
+                ("storages, columns", lambda session: StorageSqlaGateway(session).get_storages()),
+        ):
+            await measure(label, session_maker, read, repeat)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    ))
@@ -0,0 +1,110 @@
+"""
+Throughput of `GET /organizations/` and `GET /storages/` on the full application with 10k rows:
+the pre-serialized endpoints against returning models through `response_model`
+rendered by the standard library `JSONResponse` and by `ORJSONResponse`.
+
+Usage:
+    python -m benchmarks.bench_list_throughput [rows] [seconds]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Annotated
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.adapters.sqlalchemy_db import models
+from app.adapters.sqlalchemy_db.models.waste_type import WasteTypeEnum
+from app.api.depends_stub import Stub
+from app.application.models import Organization
+from app.application.models.storage import Storage
+from app.application.organizations import get_organizations_data
+from app.application.protocols.database import OrganizationDatabaseGateway, StorageDatabaseGateway
+from app.application.storages import get_storages_data
+
+
+async def populate(uri: str, rows: int) -> None:
+    rng = random.Random(0)
+    engine = create_async_engine(uri)
+    async with engine.begin() as connection:
+        await connection.run_sync(models.Base.metadata.create_all)
+        await connection.execute(insert(models.Organization), [
+            {"id": i, "name": f"ОО {i}", "location_x": rng.uniform(0, 1000), "location_y": rng.uniform(0, 1000)}
+            for i in range(1, rows + 1)
+        ])
+        await connection.execute(insert(models.Storage), [
+            {"id": i, "name": f"МНО {i}", "location_x": rng.uniform(0, 1000), "location_y": rng.uniform(0, 1000)}
+            for i in range(1, rows + 1)
+        ])
+        await connection.execute(insert(models.OrganizationWaste), [
+            {"organization_id": i, "waste_type": waste_type, "amount": rng.randint(0, 100)}
+            for i in range(1, rows + 1) for waste_type in WasteTypeEnum
+        ])
+        await connection.execute(insert(models.StorageCapacity), [
+            {"storage_id": i, "waste_type": waste_type, "capacity": 1000}
+            for i in range(1, rows + 1) for waste_type in WasteTypeEnum
+        ])
+        await connection.execute(insert(models.StorageCurrentLevel), [
+            {"storage_id": i, "waste_type": waste_type, "current_amount": rng.randint(0, 1000)}
+            for i in range(1, rows + 1) for waste_type in WasteTypeEnum
+        ])
+    await engine.dispose()
+
+
+def add_model_routes(app: FastAPI) -> None:
+    for name, response_class in (("json", JSONResponse), ("orjson", ORJSONResponse)):
+        @app.get(f"/bench/{name}/organizations/", response_model=list[Organization], response_class=response_class)
+        async def organizations(
+                database: Annotated[OrganizationDatabaseGateway, Depends(Stub(OrganizationDatabaseGateway))],
+        ) -> list[Organization]:
+            return await get_organizations_data(database)
+
+        @app.get(f"/bench/{name}/storages/", response_model=list[Storage], response_class=response_class)
+        async def storages(
+                database: Annotated[StorageDatabaseGateway, Depends(Stub(StorageDatabaseGateway))],
+        ) -> list[Storage]:
+            return await get_storages_data(database)
+
+
+def throughput(client: TestClient, path: str, seconds: float) -> float:
+    client.get(path)
+    requests = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        assert client.get(path).status_code == 200
+        requests += 1
+    return requests / elapsed
+
+
+def main(rows: int, seconds: float) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        uri = f"sqlite+aiosqlite:///{directory}/bench.db"
+        asyncio.run(populate(uri, rows))
+        os.environ["DATABASE_URI"] = uri
+        from app.main.web import create_app
+
+        app = create_app()
+        add_model_routes(app)
+        client = TestClient(app)
+        print(f"rows: {rows}, {seconds:.0f} s per endpoint")
+        for table in ("organizations", "storages"):
+            for label, path in (
+                    ("response_model + json", f"/bench/json/{table}/"),
+                    ("response_model + orjson", f"/bench/orjson/{table}/"),
+                    ("pre-serialized", f"/{table}/"),
+            ):
+                print(f"GET /{table + '/':<15}{label:<26}{throughput(client, path, seconds):>8.1f} requests/s")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
@@ -0,0 +1,113 @@
+"""
+Listing organizations: returning models for FastAPI to check against `response_model`
+and encode, against returning JSON pre-serialized by Pydantic, plus the cost of
+building the models with `model_validate` and with `model_construct`.
+
+The encoding step is also measured the way FastAPI 0.115 (the locked version) does it:
+validate against `response_model`, dump to Python objects, then `json.dumps`.
+Newer FastAPI releases dump straight to JSON themselves.
+
+Usage:
+    python -m benchmarks.bench_serialization [organizations] [requests]
+"""
+import json
+import random
+import sys
+import time
+from typing import Callable
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.adapters.sqlalchemy_db import models
+from app.adapters.sqlalchemy_db.models.waste_type import WasteTypeEnum
+from app.api.responses import json_response
+from app.application.models import Organization, OrganizationWaste
+
+ORGANIZATION_LIST = TypeAdapter(list[Organization])
+
+
+def create_rows(count: int) -> list[models.Organization]:
+    rng = random.Random(0)
+    return [
+        models.Organization(
+            id=i,
+            name=f"ОО {i}",
+            location_x=rng.uniform(0, 1000),
+            location_y=rng.uniform(0, 1000),
+            generated_waste=[
+                models.OrganizationWaste(waste_type=waste_type, amount=rng.randint(0, 100))
+                for waste_type in WasteTypeEnum
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def construct(row: models.Organization) -> Organization:
+    return Organization.model_construct(
+        id=row.id,
+        name=row.name,
+        location_x=row.location_x,
+        location_y=row.location_y,
+        generated_waste=[
+            OrganizationWaste.model_construct(waste_type=waste.waste_type.value, amount=waste.amount)
+            for waste in row.generated_waste
+        ],
+    )
+
+
+def create_app(organizations: list[Organization]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/models/", response_model=list[Organization])
+    async def get_models() -> list[Organization]:
+        return organizations
+
+    @app.get("/json/", response_model=list[Organization])
+    async def get_json() -> Response:
+        return json_response(ORGANIZATION_LIST, organizations)
+
+    return app
+
+
+def fastapi_0_115_encode(organizations: list[Organization]) -> bytes:
+    content = ORGANIZATION_LIST.dump_python(ORGANIZATION_LIST.validate_python(organizations), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def measure(label: str, function: Callable[[], object], repeat: int) -> float:
+    function()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<32}{elapsed * 1000:>10.1f} ms")
+    return elapsed
+
+
+def main(organization_count: int, requests: int) -> None:
+    rows = create_rows(organization_count)
+    organizations = [Organization.model_validate(row) for row in rows]
+    client = TestClient(create_app(organizations))
+    assert client.get("/models/").content == client.get("/json/").content
+    assert fastapi_0_115_encode(organizations) == ORGANIZATION_LIST.dump_json(organizations)
+
+    print(f"organizations: {organization_count}, requests: {requests}")
+    validate_time = measure("model_validate", lambda: [Organization.model_validate(row) for row in rows], 3)
+    construct_time = measure("model_construct", lambda: [construct(row) for row in rows], 3)
+    encode_time = measure("FastAPI 0.115 encoding", lambda: fastapi_0_115_encode(organizations), requests)
+    dump_time = measure("dump_json", lambda: ORGANIZATION_LIST.dump_json(organizations), requests)
+    models_time = measure("response_model, per request", lambda: client.get("/models/"), requests)
+    json_time = measure("pre-serialized, per request", lambda: client.get("/json/"), requests)
+    print(f"model_construct: {validate_time / construct_time:.1f}x the speed of model_validate")
+    print(f"dump_json: {encode_time / dump_time:.1f}x the speed of FastAPI 0.115 encoding")
+    print(f"pre-serialized: {models_time / json_time:.1f}x the speed of response_model with the installed FastAPI")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
@@ -0,0 +1,94 @@
+"""
+Cost of the (owner_id, waste_type) lookups done by the gateways, with and without the indexes
+from the `waste type indexes` migration.
+
+Usage:
+    python -m benchmarks.bench_waste_lookup [rows] [lookups]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from sqlalchemy import select, insert, Index
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection
+from sqlalchemy.pool import StaticPool
+
+from app.adapters.sqlalchemy_db import models
+from app.adapters.sqlalchemy_db.models.waste_type import WasteTypeEnum
+
+WASTE_TYPES = list(WasteTypeEnum)
+
+
+async def populate(connection: AsyncConnection, rows: int) -> None:
+    owners = rows // len(WASTE_TYPES)
+    await connection.execute(insert(models.Organization), [
+        {"id": owner_id, "name": f"ОО {owner_id}", "location_x": 0, "location_y": 0}
+        for owner_id in range(1, owners + 1)
+    ])
+    await connection.execute(insert(models.Storage), [
+        {"id": owner_id, "name": f"МНО {owner_id}", "location_x": 0, "location_y": 0}
+        for owner_id in range(1, owners + 1)
+    ])
+    for table, owner_column, value_column in (
+            (models.OrganizationWaste, "organization_id", "amount"),
+            (models.StorageCurrentLevel, "storage_id", "current_amount"),
+            (models.StorageCapacity, "storage_id", "capacity"),
+    ):
+        await connection.execute(insert(table), [
+            {owner_column: owner_id, "waste_type": waste_type, value_column: 100}
+            for owner_id in range(1, owners + 1)
+            for waste_type in WASTE_TYPES
+        ])
+
+
+async def measure(connection: AsyncConnection, owners: int, lookups: int) -> float:
+    rng = random.Random(0)
+    started = time.perf_counter()
+    for _ in range(lookups):
+        owner_id = rng.randint(1, owners)
+        waste_type = rng.choice(WASTE_TYPES)
+        await connection.execute(
+            select(models.OrganizationWaste)
+            .where(models.OrganizationWaste.organization_id == owner_id)
+            .where(models.OrganizationWaste.waste_type == waste_type)
+        )
+        await connection.execute(
+            select(models.StorageCurrentLevel)
+            .where(models.StorageCurrentLevel.storage_id == owner_id)
+            .where(models.StorageCurrentLevel.waste_type == waste_type)
+        )
+    return (time.perf_counter() - started) / lookups
+
+
+async def main(rows: int, lookups: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    indexes = [
+        index
+        for table in models.Base.metadata.sorted_tables
+        for index in table.indexes
+    ]
+    async with engine.begin() as connection:
+        await connection.run_sync(models.Base.metadata.create_all)
+        for index in indexes:
+            await connection.run_sync(lambda sync_connection, i=index: Index.drop(i, sync_connection))
+        await populate(connection, rows)
+
+        owners = rows // len(WASTE_TYPES)
+        without_indexes = await measure(connection, owners, lookups)
+        for index in indexes:
+            await connection.run_sync(lambda sync_connection, i=index: Index.create(i, sync_connection))
+        with_indexes = await measure(connection, owners, lookups)
+
+    await engine.dispose()
+    print(f"rows per table: {owners * len(WASTE_TYPES)}, lookups: {lookups}")
+    print(f"without indexes: {without_indexes * 1000:.3f} ms per transfer lookup pair")
+    print(f"with indexes:    {with_indexes * 1000:.3f} ms per transfer lookup pair")
+    print(f"speedup:         {without_indexes / with_indexes:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    ))
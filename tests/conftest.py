@@ -1,9 +1,15 @@
+from typing import AsyncGenerator
 from unittest.mock import AsyncMock
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from app.adapters.sqlalchemy_db.engine import enable_foreign_keys
+from app.adapters.sqlalchemy_db.models import Base
+from app.api.depends_stub import Stub
 from app.application.protocols.database import OrganizationDatabaseGateway, UoW, StorageDatabaseGateway
 from app.main import init_routers
 
@@ -11,12 +17,14 @@ from app.main import init_routers
 @pytest.fixture
 def mock_organization_gateway() -> OrganizationDatabaseGateway:
     mock = AsyncMock(OrganizationDatabaseGateway)
+    mock.get_version.return_value = 1
     return mock
 
 
 @pytest.fixture
 def mock_storage_gateway() -> StorageDatabaseGateway:
     mock = AsyncMock(StorageDatabaseGateway)
+    mock.get_version.return_value = 1
     return mock
 
 
@@ -34,6 +42,19 @@ def client(mock_organization_gateway: AsyncMock, mock_storage_gateway: AsyncMock
     init_routers(app)
     app.dependency_overrides[OrganizationDatabaseGateway] = lambda: mock_organization_gateway
     app.dependency_overrides[StorageDatabaseGateway] = lambda: mock_storage_gateway
+    app.dependency_overrides[Stub(OrganizationDatabaseGateway, export=True)] = lambda: mock_organization_gateway
+    app.dependency_overrides[Stub(StorageDatabaseGateway, export=True)] = lambda: mock_storage_gateway
     app.dependency_overrides[UoW] = lambda: mock_uow
 
     return TestClient(app)
+
+
+@pytest.fixture
+async def session() -> AsyncGenerator[AsyncSession, None]:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    enable_foreign_keys(engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, autoflush=False, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
@@ -0,0 +1,131 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.models import Organization, OrganizationWaste, WasteType
+from app.application.models.storage import StorageFreeCapacity
+from app.application.models.waste import OrganizationWasteState, StorageWasteState, WasteTransferItem
+
+
+@pytest.mark.asyncio
+async def test_auto_dispose(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+) -> None:
+    mock_organization_gateway.get_organizations_by_ids.return_value = [
+        Organization(
+            id=1,
+            name="ОО 1",
+            location_x=0,
+            location_y=0,
+            generated_waste=[
+                OrganizationWaste(waste_type=WasteType.GLASS, amount=5),
+                OrganizationWaste(waste_type=WasteType.PLASTIC, amount=2),
+            ]
+        )
+    ]
+    mock_storage_gateway.get_free_capacities.return_value = [
+        StorageFreeCapacity(storage_id=1, location_x=3, location_y=4, waste_type=WasteType.GLASS, free_capacity=3),
+        StorageFreeCapacity(storage_id=2, location_x=6, location_y=8, waste_type=WasteType.GLASS, free_capacity=10),
+    ]
+    mock_organization_gateway.lock_organization_wastes.return_value = [
+        OrganizationWasteState(organization_id=1, waste_type=WasteType.GLASS, amount=5),
+    ]
+    mock_storage_gateway.lock_storage_wastes.return_value = [
+        StorageWasteState(storage_id=1, waste_type=WasteType.GLASS, capacity=3, current_amount=0),
+        StorageWasteState(storage_id=2, waste_type=WasteType.GLASS, capacity=10, current_amount=0),
+    ]
+
+    response = client.post("/organizations/1/auto-dispose/", params={"strategy": "min_cost_flow"})
+
+    assert response.status_code == 200
+    assert response.json()["strategy"] == "min_cost_flow"
+    assert response.json()["transferred"] == 2
+    assert response.json()["total_distance"] == 35.0
+    assert response.json()["undisposed"] == [{"organization_id": 1, "waste_type": "PLASTIC", "amount": 2}]
+    mock_organization_gateway.get_organizations_by_ids.assert_called_once_with([1])
+    mock_storage_gateway.get_free_capacities.assert_called_once_with([WasteType.GLASS, WasteType.PLASTIC])
+    mock_storage_gateway.add_waste_to_storages.assert_called_once_with([
+        WasteTransferItem(organization_id=1, storage_id=1, waste_type=WasteType.GLASS, amount=3),
+        WasteTransferItem(organization_id=1, storage_id=2, waste_type=WasteType.GLASS, amount=2),
+    ])
+    mock_uow.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_auto_dispose_organization_not_found(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+) -> None:
+    mock_organization_gateway.get_organizations_by_ids.return_value = []
+
+    response = client.post("/organizations/1/auto-dispose/")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Organization not found"}
+    mock_storage_gateway.get_free_capacities.assert_not_called()
+    mock_uow.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_auto_dispose_too_many_storages(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("app.application.waste_routing.MAX_ROUTING_PAIRS", 1)
+    mock_organization_gateway.get_organizations_by_ids.return_value = [
+        Organization(
+            id=1,
+            name="ОО 1",
+            location_x=0,
+            location_y=0,
+            generated_waste=[OrganizationWaste(waste_type=WasteType.GLASS, amount=5)]
+        )
+    ]
+    mock_storage_gateway.get_free_capacities.return_value = [
+        StorageFreeCapacity(storage_id=1, location_x=3, location_y=4, waste_type=WasteType.GLASS, free_capacity=3),
+        StorageFreeCapacity(storage_id=2, location_x=6, location_y=8, waste_type=WasteType.GLASS, free_capacity=10),
+    ]
+
+    response = client.post("/organizations/1/auto-dispose/")
+
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": "Routing GLASS waste needs 2 organization-storage pairs, at most 1 are supported"
+    }
+    mock_uow.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_auto_dispose_in_batch_nothing_to_store(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+) -> None:
+    mock_organization_gateway.get_organizations_by_ids.return_value = [
+        Organization(id=1, name="ОО 1", location_x=0, location_y=0, generated_waste=[]),
+        Organization(id=2, name="ОО 2", location_x=0, location_y=0, generated_waste=[]),
+    ]
+    mock_storage_gateway.get_free_capacities.return_value = []
+
+    response = client.post("/organizations/auto-dispose/", json=[1, 2, 1])
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "strategy": "greedy",
+        "transferred": 0,
+        "total_distance": 0.0,
+        "results": [],
+        "undisposed": [],
+    }
+    mock_organization_gateway.get_organizations_by_ids.assert_called_once_with([1, 2])
+    mock_uow.commit.assert_not_called()
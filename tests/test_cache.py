@@ -0,0 +1,48 @@
+from app.adapters.cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction() -> None:
+    cache: LRUTTLCache[int, str] = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_ttl_expiry() -> None:
+    clock = FakeClock()
+    cache: LRUTTLCache[int, str] = LRUTTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set(1, "a")
+
+    clock.now = 9.9
+    assert cache.get(1) == "a"
+    clock.now = 10
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_pop_and_clear() -> None:
+    cache: LRUTTLCache[int, str] = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set(1, "a")
+    cache.set(2, "b")
+
+    cache.pop(1)
+    cache.pop(5)
+    assert cache.get(1) is None
+    cache.clear()
+    assert cache.get(2) is None
@@ -0,0 +1,56 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+
+from app.adapters.cache_backends import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def backend(request: pytest.FixtureRequest) -> AsyncGenerator[CacheBackend, None]:
+    if request.param == "memory":
+        backend: CacheBackend = InMemoryCacheBackend()
+    else:
+        backend = RedisCacheBackend(FakeAsyncRedis(server=FakeServer()))
+    yield backend
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_get_set_delete(backend: CacheBackend) -> None:
+    await backend.set("a", b"1", ttl=60)
+    await backend.set("b", b"2", ttl=60)
+
+    assert await backend.get("a") == b"1"
+    await backend.delete(["a", "missing"])
+    await backend.delete([])
+    assert await backend.get("a") is None
+    assert await backend.get("b") == b"2"
+
+
+@pytest.mark.asyncio
+async def test_ttl(backend: CacheBackend) -> None:
+    await backend.set("a", b"1", ttl=0.05)
+
+    await asyncio.sleep(0.1)
+
+    assert await backend.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_publish_subscribe(backend: CacheBackend) -> None:
+    received: list[str] = []
+
+    async def listen() -> None:
+        async for message in backend.subscribe("channel"):
+            received.append(message)
+
+    task = asyncio.create_task(listen())
+    await asyncio.sleep(0.05)
+    await backend.publish("channel", "hello")
+    await backend.publish("other", "ignored")
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert received == ["hello"]
@@ -0,0 +1,64 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+
+from app.adapters.cache_backends import RedisCacheBackend
+from app.adapters.entity_cache import EntityCache, CacheInvalidationChannel, CacheInvalidator, InvalidatingUoW
+from app.application.models.location import Location
+
+
+class Worker:
+    def __init__(self, server: FakeServer):
+        self.backend = RedisCacheBackend(FakeAsyncRedis(server=server))
+        self.cache = EntityCache("locations", Location, self.backend)
+        self.channel = CacheInvalidationChannel(self.backend, [self.cache])
+
+
+@pytest.mark.asyncio
+async def test_commit_invalidates_other_workers() -> None:
+    server = FakeServer()
+    first, second = Worker(server), Worker(server)
+    location = Location(id=1, location_x=1, location_y=2)
+    await first.cache.set(1, location, 1)
+    assert await second.cache.get(1) == location
+    await second.cache.set_all([location], 1)
+    assert second.cache.entities.get(1) == (1, location)
+
+    async with first.channel.listening(), second.channel.listening():
+        await asyncio.sleep(0.05)
+        session = AsyncMock()
+        uow = InvalidatingUoW(session, CacheInvalidator(first.channel))
+        uow.invalidator.add(first.cache, [1])
+        await uow.commit()
+        await asyncio.sleep(0.05)
+
+    session.commit.assert_called_once()
+    assert second.cache.entities.get(1) is None
+    assert second.cache.snapshot.get(None) is None
+    assert await second.cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_rollback_discards_invalidations() -> None:
+    worker = Worker(FakeServer())
+    location = Location(id=1, location_x=1, location_y=2)
+    await worker.cache.set(1, location, 1)
+    uow = InvalidatingUoW(AsyncMock(), CacheInvalidator(worker.channel))
+    uow.invalidator.add(worker.cache, [1])
+
+    await uow.rollback()
+    await uow.commit()
+
+    assert await worker.cache.get(1) == location
+
+
+@pytest.mark.asyncio
+async def test_unknown_cache_names_are_ignored() -> None:
+    worker = Worker(FakeServer())
+    await worker.cache.set(2, Location(id=2, location_x=0, location_y=0), 1)
+
+    worker.channel.apply('{"other": [1], "locations": [2]}')
+
+    assert worker.cache.entities.get(2) is None
@@ -0,0 +1,98 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.adapters.cache_backends import InMemoryCacheBackend
+from app.adapters.cached_gateway import CachedOrganizationGateway
+from app.adapters.entity_cache import EntityCache, CacheInvalidationChannel, CacheInvalidator
+from app.application.models import Organization, OrganizationWaste, WasteType
+from app.application.models.waste import WasteTransferItem
+from app.application.protocols.database import OrganizationDatabaseGateway
+
+
+def make_organization(organization_id: int) -> Organization:
+    return Organization(
+        id=organization_id,
+        name=f"ОО {organization_id}",
+        location_x=0,
+        location_y=0,
+        generated_waste=[OrganizationWaste(waste_type=WasteType.GLASS, amount=organization_id)]
+    )
+
+
+@pytest.fixture
+def inner_gateway() -> AsyncMock:
+    gateway = AsyncMock(OrganizationDatabaseGateway)
+    gateway.get_version.return_value = 1
+    gateway.get_organization_by_id.side_effect = make_organization
+    gateway.get_organizations.return_value = [make_organization(1), make_organization(2)]
+    return gateway
+
+
+@pytest.fixture
+def cache() -> EntityCache[Organization]:
+    return EntityCache("organizations", Organization, InMemoryCacheBackend(), maxsize=10, ttl=60)
+
+
+def new_gateway(inner_gateway: AsyncMock, cache: EntityCache[Organization]) -> CachedOrganizationGateway:
+    return CachedOrganizationGateway(
+        inner_gateway,
+        cache,
+        CacheInvalidator(CacheInvalidationChannel(cache.backend, [cache]))
+    )
+
+
+@pytest.mark.asyncio
+async def test_organization_reads_are_cached(inner_gateway: AsyncMock, cache: EntityCache[Organization]) -> None:
+    for _ in range(2):
+        gateway = new_gateway(inner_gateway, cache)
+        assert await gateway.get_organization_by_id(1) == make_organization(1)
+        assert await gateway.get_organizations() == [make_organization(1), make_organization(2)]
+        assert await gateway.get_organizations(after_id=1) == [make_organization(2)]
+
+    inner_gateway.get_organization_by_id.assert_called_once_with(1)
+    inner_gateway.get_organizations.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_entries_of_another_version_are_not_served(
+        inner_gateway: AsyncMock,
+        cache: EntityCache[Organization],
+) -> None:
+    await new_gateway(inner_gateway, cache).get_organization_by_id(1)
+    await new_gateway(inner_gateway, cache).get_organizations()
+    inner_gateway.get_version.return_value = 2
+    gateway = new_gateway(inner_gateway, cache)
+
+    assert await gateway.get_version() == 2
+    assert await gateway.get_organization_by_id(1) == make_organization(1)
+    assert await gateway.get_organizations() == [make_organization(1), make_organization(2)]
+
+    assert inner_gateway.get_organization_by_id.call_count == 2
+    assert inner_gateway.get_organizations.call_count == 2
+    assert cache.entities.get(1) == (2, make_organization(1))
+    assert await new_gateway(inner_gateway, cache).get_organization_by_id(1) == make_organization(1)
+    assert inner_gateway.get_organization_by_id.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_organization_waste_changes_invalidate(
+        inner_gateway: AsyncMock,
+        cache: EntityCache[Organization],
+) -> None:
+    reader = new_gateway(inner_gateway, cache)
+    for organization_id in (1, 2, 3):
+        await reader.get_organization_by_id(organization_id)
+    await reader.get_organizations()
+
+    writer = new_gateway(inner_gateway, cache)
+    await writer.generate_waste(1, WasteType.GLASS, 5)
+    await writer.reduce_organization_wastes([
+        WasteTransferItem(organization_id=2, storage_id=1, waste_type=WasteType.GLASS, amount=1)
+    ])
+
+    assert await cache.get(1) is None
+    assert await cache.get(2) is None
+    assert await cache.get(3) == make_organization(3)
+    assert await cache.get_all() is None
+    assert writer.invalidator.pending == {"organizations": {1, 2}}
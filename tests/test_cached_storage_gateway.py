@@ -0,0 +1,159 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.adapters.cache_backends import InMemoryCacheBackend
+from app.adapters.cached_gateway import CachedStorageGateway
+from app.adapters.entity_cache import EntityCache, CacheInvalidationChannel, CacheInvalidator
+from app.application.models import WasteType
+from app.application.models.storage import Storage, StorageCreate
+from app.application.protocols.database import StorageDatabaseGateway
+from tests.utils import async_iter
+
+
+def make_storage(storage_id: int) -> Storage:
+    return Storage(
+        id=storage_id,
+        name=f"S{storage_id}",
+        location_x=storage_id,
+        location_y=0,
+        capacities=[],
+        current_levels=[]
+    )
+
+
+@pytest.fixture
+def inner_gateway() -> AsyncMock:
+    gateway = AsyncMock(StorageDatabaseGateway)
+    gateway.get_version.return_value = 1
+    return gateway
+
+
+@pytest.fixture
+def cache() -> EntityCache[Storage]:
+    return EntityCache("storages", Storage, InMemoryCacheBackend(), maxsize=10, ttl=60)
+
+
+@pytest.fixture
+def invalidator(cache: EntityCache[Storage]) -> CacheInvalidator:
+    return CacheInvalidator(CacheInvalidationChannel(cache.backend, [cache]))
+
+
+@pytest.mark.asyncio
+async def test_get_storage_by_id_is_cached(
+        inner_gateway: AsyncMock,
+        cache: EntityCache[Storage],
+        invalidator: CacheInvalidator,
+) -> None:
+    inner_gateway.get_storage_by_id.return_value = make_storage(1)
+
+    assert await CachedStorageGateway(inner_gateway, cache, invalidator).get_storage_by_id(1) == make_storage(1)
+    assert await CachedStorageGateway(inner_gateway, cache, invalidator).get_storage_by_id(1) == make_storage(1)
+
+    inner_gateway.get_storage_by_id.assert_called_once_with(1)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_missing_storage_is_not_cached(
+        inner_gateway: AsyncMock,
+        cache: EntityCache[Storage],
+        invalidator: CacheInvalidator,
+) -> None:
+    inner_gateway.get_storage_by_id.return_value = None
+    gateway = CachedStorageGateway(inner_gateway, cache, invalidator)
+
+    assert await gateway.get_storage_by_id(1) is None
+    assert await gateway.get_storage_by_id(1) is None
+
+    assert inner_gateway.get_storage_by_id.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshot_serves_pages(
+        inner_gateway: AsyncMock,
+        cache: EntityCache[Storage],
+        invalidator: CacheInvalidator,
+) -> None:
+    storages = [make_storage(storage_id) for storage_id in (1, 3, 5, 7)]
+    inner_gateway.get_storages.return_value = storages
+    gateway = CachedStorageGateway(inner_gateway, cache, invalidator)
+
+    assert await gateway.get_storages() == storages
+    assert await gateway.get_storages(after_id=3, limit=1) == [storages[2]]
+    assert await gateway.get_storages(after_id=2) == storages[1:]
+    assert [storage async for storage in gateway.iter_storages(limit=2)] == storages[:2]
+
+    inner_gateway.get_storages.assert_called_once_with()
+    inner_gateway.iter_storages.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_not_streamed(
+        inner_gateway: AsyncMock,
+        cache: EntityCache[Storage],
+        invalidator: CacheInvalidator,
+) -> None:
+    inner_gateway.get_storages.return_value = [make_storage(1)]
+    await CachedStorageGateway(inner_gateway, cache, invalidator).get_storages()
+    inner_gateway.get_version.return_value = 2
+    inner_gateway.iter_storages.return_value = async_iter([make_storage(1), make_storage(2)])
+    gateway = CachedStorageGateway(inner_gateway, cache, invalidator)
+
+    await gateway.get_version()
+    assert [storage async for storage in gateway.iter_storages()] == [make_storage(1), make_storage(2)]
+
+    inner_gateway.iter_storages.assert_called_once_with(None, None)
+
+
+@pytest.mark.asyncio
+async def test_pages_without_snapshot_go_to_database(
+        inner_gateway: AsyncMock,
+        cache: EntityCache[Storage],
+        invalidator: CacheInvalidator,
+) -> None:
+    inner_gateway.get_storages.return_value = [make_storage(1)]
+    inner_gateway.iter_storages.return_value = async_iter([make_storage(1)])
+    gateway = CachedStorageGateway(inner_gateway, cache, invalidator)
+
+    await gateway.get_storages(limit=1)
+    assert [storage async for storage in gateway.iter_storages()] == [make_storage(1)]
+
+    inner_gateway.get_storages.assert_called_once_with(None, 1)
+    assert len(cache.snapshot) == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate(
+        inner_gateway: AsyncMock,
+        cache: EntityCache[Storage],
+        invalidator: CacheInvalidator,
+) -> None:
+    inner_gateway.get_storages.return_value = [make_storage(1), make_storage(2)]
+    inner_gateway.get_storage_by_id.side_effect = make_storage
+    reader = CachedStorageGateway(inner_gateway, cache, invalidator)
+    await reader.get_storages()
+    await reader.get_storage_by_id(1)
+    await reader.get_storage_by_id(2)
+
+    writer = CachedStorageGateway(inner_gateway, cache, CacheInvalidator(invalidator.channel))
+    await writer.add_waste_to_storage(1, WasteType.GLASS, 5)
+
+    assert await cache.get(1) is None
+    assert await cache.get(2) == make_storage(2)
+    assert await cache.get_all() is None
+    assert writer.invalidator.pending == {"storages": {1}}
+
+    await writer.get_storage_by_id(2)
+    await writer.get_storages()
+    assert await cache.get_all() is None
+    assert inner_gateway.get_storages.call_count == 2
+
+    storage_data = StorageCreate(name="S", location_x=0, location_y=0, capacities=[], current_levels=[])
+    await reader.get_storages()
+    await CachedStorageGateway(inner_gateway, cache, invalidator).create_storage(storage_data)
+    assert await cache.get_all() is None
+    assert await cache.get(2) == make_storage(2)
+
+    await CachedStorageGateway(inner_gateway, cache, invalidator).delete_storage_by_id(2)
+    assert await cache.get(2) is None
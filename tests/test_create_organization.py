@@ -50,3 +50,24 @@ async def test_create_organization_unprocessable_entity(
 
     response = client.post("/organizations/", json=organization_data)
     assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_organization_duplicate_waste_type(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    organization_data = {
+        "name": "New Org",
+        "location_x": 0,
+        "location_y": 0,
+        "generated_waste": [
+            {"waste_type": "BIO_WASTE", "amount": 25},
+            {"waste_type": "BIO_WASTE", "amount": 5}
+        ]
+    }
+
+    response = client.post("/organizations/", json=organization_data)
+    assert response.status_code == 422
+    mock_organization_gateway.create_organization.assert_not_called()
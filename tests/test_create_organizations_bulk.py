@@ -0,0 +1,64 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.testclient import TestClient
+
+
+def organization_data(index: int) -> dict:
+    return {
+        "name": f"Organization {index}",
+        "location_x": index,
+        "location_y": 0,
+        "generated_waste": [{"waste_type": "GLASS", "amount": 10}]
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_organizations_bulk_json(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    mock_organization_gateway.create_organizations.side_effect = [[1, 2], [3]]
+
+    response = client.post(
+        "/organizations/bulk/?chunk_size=2",
+        json=[organization_data(index) for index in range(3)],
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"organization_ids": [1, 2, 3]}
+    assert mock_uow.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_create_organizations_bulk_ndjson(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    mock_organization_gateway.create_organizations.side_effect = [[1, 2]]
+
+    response = client.post(
+        "/organizations/bulk/",
+        content="\n".join(json.dumps(organization_data(index)) for index in range(2)),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"organization_ids": [1, 2]}
+    chunk = mock_organization_gateway.create_organizations.call_args.args[0]
+    assert [organization.name for organization in chunk] == ["Organization 0", "Organization 1"]
+
+
+@pytest.mark.asyncio
+async def test_create_organizations_bulk_invalid_chunk_size(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    response = client.post("/organizations/bulk/?chunk_size=0", json=[organization_data(0)])
+
+    assert response.status_code == 422
+    mock_organization_gateway.create_organizations.assert_not_called()
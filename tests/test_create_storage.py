@@ -34,3 +34,25 @@ async def test_create_storage_missing_fields(
 
     response = client.post("/storages/", json=invalid_storage_data)
     assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_storage_duplicate_waste_type(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    storage_data = {
+        "name": "Storage 1",
+        "location_x": 0,
+        "location_y": 0,
+        "capacities": [
+            {"waste_type": "GLASS", "capacity": 10},
+            {"waste_type": "GLASS", "capacity": 20}
+        ],
+        "current_levels": []
+    }
+
+    response = client.post("/storages/", json=storage_data)
+    assert response.status_code == 422
+    mock_storage_gateway.create_storage.assert_not_called()
@@ -0,0 +1,100 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.application.models.storage import StorageCreate
+
+
+def storage_data(index: int) -> dict:
+    return {
+        "name": f"Storage {index}",
+        "location_x": index,
+        "location_y": 0,
+        "capacities": [{"waste_type": "GLASS", "capacity": 10}],
+        "current_levels": []
+    }
+
+
+def assign_ids(mock_storage_gateway: AsyncMock) -> None:
+    next_id = iter(range(1, 100))
+    mock_storage_gateway.create_storages.side_effect = lambda chunk: [next(next_id) for _ in chunk]
+
+
+@pytest.mark.asyncio
+async def test_create_storages_bulk_json(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    assign_ids(mock_storage_gateway)
+
+    response = client.post("/storages/bulk/?chunk_size=2", json=[storage_data(index) for index in range(3)])
+
+    assert response.status_code == 200
+    assert response.json() == {"storage_ids": [1, 2, 3]}
+    chunks = [call.args[0] for call in mock_storage_gateway.create_storages.call_args_list]
+    assert [[storage.name for storage in chunk] for chunk in chunks] == [["Storage 0", "Storage 1"], ["Storage 2"]]
+    assert isinstance(chunks[0][0], StorageCreate)
+    assert mock_uow.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_create_storages_bulk_ndjson(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    assign_ids(mock_storage_gateway)
+    body = "\n".join(json.dumps(storage_data(index)) for index in range(3)) + "\n\n"
+
+    response = client.post(
+        "/storages/bulk/",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"storage_ids": [1, 2, 3]}
+    assert mock_uow.commit.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_create_storages_bulk_ndjson_invalid_line(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    assign_ids(mock_storage_gateway)
+    lines = [json.dumps(storage_data(index)) for index in range(3)] + ['{"name": "Storage 3"}']
+
+    response = client.post(
+        "/storages/bulk/?chunk_size=2",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["line"] == 4
+    assert detail["storage_ids"] == [1, 2]
+    assert {error["loc"][0] for error in detail["errors"]} == {"location_x", "location_y", "capacities",
+                                                              "current_levels"}
+    assert mock_uow.commit.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_create_storages_bulk_json_invalid_item(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    invalid_storage = storage_data(1)
+    invalid_storage["capacities"] *= 2
+
+    response = client.post("/storages/bulk/", json=[storage_data(0), invalid_storage])
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][:3] == ["body", 1, "capacities"]
+    mock_storage_gateway.create_storages.assert_not_called()
@@ -0,0 +1,28 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.testclient import TestClient
+
+
+@pytest.mark.asyncio
+async def test_delete_organizations_in_bulk(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    mock_organization_gateway.delete_organizations.return_value = [1, 3]
+
+    response = client.post("/organizations/bulk-delete/", json=[3, 1, 999])
+
+    assert response.status_code == 200
+    assert response.json() == {"organization_ids": [1, 3]}
+    mock_organization_gateway.delete_organizations.assert_awaited_once_with([3, 1, 999])
+    mock_uow.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_organizations_in_bulk_empty(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    response = client.post("/organizations/bulk-delete/", json=[])
+
+    assert response.status_code == 422
+    mock_organization_gateway.delete_organizations.assert_not_awaited()
@@ -0,0 +1,32 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.testclient import TestClient
+
+
+@pytest.mark.asyncio
+async def test_delete_storages_in_bulk(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    mock_storage_gateway.delete_storages.return_value = [2]
+
+    response = client.post("/storages/bulk-delete/", json=[2, 999])
+
+    assert response.status_code == 200
+    assert response.json() == {"storage_ids": [2]}
+    mock_storage_gateway.delete_storages.assert_awaited_once_with([2, 999])
+    mock_uow.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_storages_in_bulk_invalid_ids(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    response = client.post("/storages/bulk-delete/", json=["first"])
+
+    assert response.status_code == 422
+    mock_storage_gateway.delete_storages.assert_not_awaited()
@@ -0,0 +1,17 @@
+from app.application.distances import distance_matrix, sorted_pairs
+
+ORGANIZATIONS = [(0, 0), (3, 4)]
+STORAGES = [(0, 0), (6, 8), (3, 0)]
+
+
+def test_distance_matrix() -> None:
+    matrix = distance_matrix(ORGANIZATIONS, STORAGES)
+
+    assert matrix.tolist() == [[0.0, 10.0, 3.0], [5.0, 5.0, 4.0]]
+    assert distance_matrix([], STORAGES).shape == (0, 3)
+
+
+def test_sorted_pairs() -> None:
+    expected = [(0, 0), (0, 2), (1, 2), (1, 0), (1, 1), (0, 1)]
+
+    assert list(sorted_pairs(distance_matrix(ORGANIZATIONS, STORAGES))) == expected
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.application.models import Organization, OrganizationWaste, WasteType
+from app.application.models.storage import Storage
+from app.application.models.storage_capacity import StorageCapacity
+from app.application.models.storage_current_level import StorageCurrentLevel
+from tests.utils import async_iter
+
+STORAGES = [
+    Storage(
+        id=1,
+        name="Storage 1",
+        location_x=0,
+        location_y=0,
+        capacities=[StorageCapacity(waste_type=WasteType.GLASS, capacity=10)],
+        current_levels=[StorageCurrentLevel(waste_type=WasteType.GLASS, current_amount=4)],
+    ),
+    Storage(id=2, name="Storage 2", location_x=10, location_y=10, capacities=[], current_levels=[]),
+]
+
+
+@pytest.mark.asyncio
+async def test_export_organizations_ndjson(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    mock_organization_gateway.iter_organizations.return_value = async_iter([
+        Organization(id=1, name="Organization 1", location_x=0, location_y=0, generated_waste=[]),
+        Organization(id=2, name="Organization 2", location_x=10, location_y=10, generated_waste=[]),
+    ])
+
+    response = client.get("/export/organizations/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="organizations.ndjson"'
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [1, 2]
+    mock_organization_gateway.iter_organizations.assert_called_once_with(None)
+
+
+@pytest.mark.asyncio
+async def test_export_organizations_csv(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    mock_organization_gateway.iter_organizations.return_value = async_iter([
+        Organization(
+            id=3,
+            name="Organization 3",
+            location_x=1.5,
+            location_y=0,
+            generated_waste=[OrganizationWaste(waste_type=WasteType.PLASTIC, amount=7)],
+        ),
+    ])
+
+    response = client.get("/export/organizations/?format=csv&after_id=2")
+
+    assert response.status_code == 200
+    assert list(csv.DictReader(io.StringIO(response.text))) == [{
+        "id": "3",
+        "name": "Organization 3",
+        "location_x": "1.5",
+        "location_y": "0.0",
+        "generated_waste_BIO_WASTE": "",
+        "generated_waste_GLASS": "",
+        "generated_waste_PLASTIC": "7",
+    }]
+    mock_organization_gateway.iter_organizations.assert_called_once_with(2)
+
+
+@pytest.mark.asyncio
+async def test_export_storages_csv(client: TestClient, mock_storage_gateway: AsyncMock) -> None:
+    mock_storage_gateway.iter_storages.return_value = async_iter(STORAGES)
+
+    with patch("app.application.export.EXPORT_BATCH_SIZE", 1):
+        response = client.get("/export/storages/?format=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == ["1", "2"]
+    assert rows[0]["capacity_GLASS"] == "10"
+    assert rows[0]["current_amount_GLASS"] == "4"
+    assert rows[1]["capacity_GLASS"] == ""
+
+
+@pytest.mark.asyncio
+async def test_export_storages_parquet(client: TestClient, mock_storage_gateway: AsyncMock) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    mock_storage_gateway.iter_storages.return_value = async_iter(STORAGES)
+
+    with patch("app.application.export.PARQUET_ROW_GROUP_SIZE", 1):
+        response = client.get("/export/storages/?format=parquet")
+
+    assert response.status_code == 200
+    parquet_file = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet_file.metadata.num_row_groups == 2
+    table = parquet_file.read()
+    assert table.column("id").to_pylist() == [1, 2]
+    assert table.column("capacity_GLASS").to_pylist() == [10, None]
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_unavailable(client: TestClient, mock_storage_gateway: AsyncMock) -> None:
+    with patch("app.application.export.pq", None):
+        response = client.get("/export/storages/?format=parquet")
+
+    assert response.status_code == 501
+    mock_storage_gateway.iter_storages.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_export_unknown_format(client: TestClient) -> None:
+    response = client.get("/export/storages/?format=xlsx")
+    assert response.status_code == 422
@@ -7,6 +7,7 @@ from app.application.models import OrganizationWaste, WasteType, Organization
 from app.application.models.storage import Storage
 from app.application.models.storage_capacity import StorageCapacity
 from app.application.models.storage_current_level import StorageCurrentLevel
+from tests.utils import async_iter
 
 
 @pytest.mark.asyncio
@@ -24,7 +25,7 @@ async def test_get_available_storages(
             OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)
         ]
     )
-    mock_storage_gateway.get_storages.return_value = [
+    mock_storage_gateway.iter_available_storages.return_value = async_iter([
         Storage(
             id=2,
             name="S2",
@@ -42,35 +43,26 @@ async def test_get_available_storages(
                     current_amount=1
                 )
             ]
-        ),
-        Storage(
-            id=3,
-            name="S3",
-            location_x=100,
-            location_y=0,
-            capacities=[
-                StorageCapacity(
-                    waste_type=WasteType.BIO_WASTE,
-                    capacity=2
-                )
-            ],
-            current_levels=[
-                StorageCurrentLevel(
-                    waste_type=WasteType.BIO_WASTE,
-                    current_amount=2
-                )
-            ]
         )
-    ]
+    ])
 
     response = client.get("/organizations/1/available-storages/")
 
     assert response.status_code == 200
     assert len(response.json()) == 1
+    assert response.json()[0]["distance"] == 100
     assert response.json()[0]["capacities"][0]["waste_type"] == "BIO_WASTE"
     assert response.json()[0]["capacities"][0]["capacity"] == 2
     assert response.json()[0]["current_levels"][0]["waste_type"] == "BIO_WASTE"
     assert response.json()[0]["current_levels"][0]["current_amount"] == 1
+    mock_storage_gateway.iter_available_storages.assert_called_once_with(
+        0,
+        0,
+        [OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)],
+        None,
+        None,
+        0,
+    )
 
 
 @pytest.mark.asyncio
@@ -88,44 +80,7 @@ async def test_get_available_storages_no_suitable(
             OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=10)
         ]
     )
-    mock_storage_gateway.get_storages.return_value = [
-        Storage(
-            id=2,
-            name="S2",
-            location_x=100,
-            location_y=0,
-            capacities=[
-                StorageCapacity(
-                    waste_type=WasteType.BIO_WASTE,
-                    capacity=18
-                )
-            ],
-            current_levels=[
-                StorageCurrentLevel(
-                    waste_type=WasteType.BIO_WASTE,
-                    current_amount=10
-                )
-            ]
-        ),
-        Storage(
-            id=3,
-            name="S3",
-            location_x=100,
-            location_y=0,
-            capacities=[
-                StorageCapacity(
-                    waste_type=WasteType.GLASS,
-                    capacity=2000
-                )
-            ],
-            current_levels=[
-                StorageCurrentLevel(
-                    waste_type=WasteType.GLASS,
-                    current_amount=200
-                )
-            ]
-        )
-    ]
+    mock_storage_gateway.iter_available_storages.return_value = async_iter([])
 
     response = client.get("/organizations/1/available-storages/")
 
@@ -134,7 +89,23 @@ async def test_get_available_storages_no_suitable(
 
 
 @pytest.mark.asyncio
-async def test_get_available_storages_several_waste_types(
+async def test_get_available_storages_organization_not_found(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock
+) -> None:
+    mock_organization_gateway.get_organization_by_id.return_value = None
+
+    response = client.get("/organizations/1/available-storages/")
+
+    assert response.status_code == 404
+    assert len(response.json()) == 1
+    assert response.json()["detail"] == "Organization not found"
+    mock_storage_gateway.iter_available_storages.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_available_storages_limit_offset_max_distance(
         client: TestClient,
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock
@@ -145,92 +116,56 @@ async def test_get_available_storages_several_waste_types(
         location_x=0,
         location_y=0,
         generated_waste=[
-            OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=10),
-            OrganizationWaste(waste_type=WasteType.GLASS, amount=20)
-
+            OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)
         ]
     )
-    mock_storage_gateway.get_storages.return_value = [
+    mock_storage_gateway.iter_available_storages.return_value = async_iter([
         Storage(
-            id=2,
-            name="S2",
-            location_x=100,
+            id=storage_id,
+            name=f"S{storage_id}",
+            location_x=storage_id,
             location_y=0,
-            capacities=[
-                StorageCapacity(
-                    waste_type=WasteType.BIO_WASTE,
-                    capacity=200
-                )
-            ],
-            current_levels=[
-                StorageCurrentLevel(
-                    waste_type=WasteType.BIO_WASTE,
-                    current_amount=10
-                )
-            ]
-        ),
-        Storage(
-            id=3,
-            name="S3",
-            location_x=100,
-            location_y=0,
-            capacities=[
-                StorageCapacity(
-                    waste_type=WasteType.GLASS,
-                    capacity=2000
-                )
-            ],
-            current_levels=[
-                StorageCurrentLevel(
-                    waste_type=WasteType.GLASS,
-                    current_amount=200
-                )
-            ]
-        ),
-        Storage(
-            id=4,
-            name="S4",
-            location_x=100,
-            location_y=0,
-            capacities=[
-                StorageCapacity(
-                    waste_type=WasteType.BIO_WASTE,
-                    capacity=2000
-                ),
-                StorageCapacity(
-                    waste_type=WasteType.GLASS,
-                    capacity=2000
-                )
-            ],
-            current_levels=[
-                StorageCurrentLevel(
-                    waste_type=WasteType.BIO_WASTE,
-                    current_amount=20
-                ),
-                StorageCurrentLevel(
-                    waste_type=WasteType.GLASS,
-                    current_amount=200
-                )
-            ]
-        ),
-    ]
+            capacities=[StorageCapacity(waste_type=WasteType.BIO_WASTE, capacity=1)],
+            current_levels=[]
+        )
+        for storage_id in (2, 3)
+    ])
 
-    response = client.get("/organizations/1/available-storages/")
+    response = client.get("/organizations/1/available-storages/?limit=2&offset=1&max_distance=50")
 
     assert response.status_code == 200
-    assert len(response.json()) == 1
+    assert [storage["storage_id"] for storage in response.json()] == [2, 3]
+    assert [storage["distance"] for storage in response.json()] == [2, 3]
+    mock_storage_gateway.iter_available_storages.assert_called_once_with(
+        0,
+        0,
+        [OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)],
+        50,
+        2,
+        1,
+    )
 
 
 @pytest.mark.asyncio
-async def test_get_available_storages_organization_not_found(
+async def test_get_available_storages_invalid_limit(
         client: TestClient,
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock
 ) -> None:
-    mock_organization_gateway.get_organization_by_id.return_value = None
+    response = client.get("/organizations/1/available-storages/?limit=0")
 
-    response = client.get("/organizations/1/available-storages/")
+    assert response.status_code == 422
 
-    assert response.status_code == 404
-    assert len(response.json()) == 1
-    assert response.json()["detail"] == "Organization not found"
+
+@pytest.mark.asyncio
+async def test_get_available_storages_not_modified(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock
+) -> None:
+    mock_storage_gateway.get_version.return_value = 7
+
+    response = client.get("/organizations/1/available-storages/", headers={"If-None-Match": '"available-1-7"'})
+    assert response.status_code == 304
+    mock_organization_gateway.get_organization_by_id.assert_not_called()
+    mock_storage_gateway.iter_available_storages.assert_not_called()
@@ -0,0 +1,68 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.distances import MAX_MATRIX_CELLS
+from app.application.models.location import Location
+
+
+@pytest.mark.asyncio
+async def test_get_distances_matrix(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+) -> None:
+    mock_organization_gateway.get_organization_locations.return_value = [
+        Location(id=1, location_x=0, location_y=0),
+        Location(id=2, location_x=3, location_y=4),
+    ]
+    mock_storage_gateway.get_storage_locations.return_value = [
+        Location(id=7, location_x=6, location_y=8),
+        Location(id=5, location_x=0, location_y=0),
+    ]
+
+    response = client.get("/distances/matrix", params={"organization_id": [2, 1], "storage_id": [5, 7, 5]})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "organization_ids": [2, 1],
+        "storage_ids": [5, 7],
+        "distances": [[5.0, 5.0], [0.0, 10.0]],
+    }
+    mock_organization_gateway.get_organization_locations.assert_called_once_with([2, 1])
+    mock_storage_gateway.get_storage_locations.assert_called_once_with([5, 7])
+
+
+@pytest.mark.asyncio
+async def test_get_distances_matrix_not_found(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+) -> None:
+    mock_organization_gateway.get_organization_locations.return_value = [Location(id=1, location_x=0, location_y=0)]
+    mock_storage_gateway.get_storage_locations.return_value = []
+
+    response = client.get("/distances/matrix", params={"organization_id": [1], "storage_id": [5]})
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Storage not found"}
+    assert client.get("/distances/matrix", params={"organization_id": [1]}).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_distances_matrix_too_large(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+) -> None:
+    response = client.get(
+        "/distances/matrix",
+        params={"organization_id": list(range(1, 501)), "storage_id": list(range(1, 502))},
+    )
+
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": f"The distance matrix would have {500 * 501} cells, at most {MAX_MATRIX_CELLS} are supported"
+    }
+    mock_organization_gateway.get_organization_locations.assert_not_called()
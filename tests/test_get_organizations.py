@@ -1,9 +1,11 @@
+import json
 from unittest.mock import AsyncMock
 
 import pytest
 from starlette.testclient import TestClient
 
 from app.application.models import Organization, OrganizationWaste, WasteType
+from tests.utils import async_iter
 
 
 @pytest.mark.asyncio
@@ -35,3 +37,43 @@ async def test_get_organizations_empty(client: TestClient, mock_organization_gat
 
     assert response.status_code == 200
     assert len(response.json()) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_organizations_page(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    mock_organization_gateway.get_organizations.return_value = [
+        Organization(id=13, name="Org 13", location_x=0, location_y=0, generated_waste=[]),
+    ]
+
+    response = client.get("/organizations/?after_id=12&limit=1")
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == 13
+    mock_organization_gateway.get_organizations.assert_called_once_with(12, 1)
+
+
+@pytest.mark.asyncio
+async def test_get_organizations_stream(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    mock_organization_gateway.iter_organizations.return_value = async_iter([
+        Organization(id=1, name="Org 1", location_x=0, location_y=0, generated_waste=[
+            OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)
+        ]),
+        Organization(id=2, name="Org 2", location_x=0, location_y=0, generated_waste=[]),
+    ])
+
+    response = client.get("/organizations/?stream=true&after_id=0")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["name"] for line in lines] == ["Org 1", "Org 2"]
+    assert lines[0]["generated_waste"] == [{"waste_type": "BIO_WASTE", "amount": 1}]
+    mock_organization_gateway.iter_organizations.assert_called_once_with(0, None)
+    mock_organization_gateway.get_organizations.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_organizations_not_modified(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    response = client.get("/organizations/", headers={"If-None-Match": '"organizations-1"'})
+    assert response.status_code == 304
+    mock_organization_gateway.get_organizations.assert_not_called()
@@ -0,0 +1,30 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.models.pool import PoolMetrics
+from app.application.protocols.database import ConnectionPoolMonitor
+
+
+@pytest.mark.asyncio
+async def test_get_pool_metrics(client: TestClient) -> None:
+    monitor = AsyncMock(ConnectionPoolMonitor)
+    monitor.get_pool_metrics.return_value = PoolMetrics(
+        pool="QueuePool",
+        size=5,
+        max_overflow=10,
+        checked_in=3,
+        checked_out=2,
+        overflow=0,
+        utilization=2 / 15,
+        connects=5,
+        checkouts=40,
+        invalidations=0,
+    )
+    client.app.dependency_overrides[ConnectionPoolMonitor] = lambda: monitor  # type: ignore[attr-defined]
+
+    response = client.get("/admin/pool/")
+    assert response.status_code == 200
+    assert response.json()["checked_out"] == 2
+    assert response.json()["checkouts"] == 40
@@ -1,9 +1,11 @@
+import json
 from unittest.mock import AsyncMock
 
 import pytest
 from starlette.testclient import TestClient
 
 from app.application.models.storage import Storage
+from tests.utils import async_iter
 
 
 @pytest.mark.asyncio
@@ -26,3 +28,57 @@ async def test_get_storages_empty(client: TestClient, mock_storage_gateway: Asyn
     response = client.get("/storages/")
     assert response.status_code == 200
     assert len(response.json()) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_storages_page(client: TestClient, mock_storage_gateway: AsyncMock) -> None:
+    mock_storage_gateway.get_storages.return_value = [
+        Storage(id=3, name="Storage 3", location_x=0, location_y=0, capacities=[], current_levels=[])
+    ]
+
+    response = client.get("/storages/?after_id=2&limit=1")
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == 3
+    mock_storage_gateway.get_storages.assert_called_once_with(2, 1)
+
+
+@pytest.mark.asyncio
+async def test_get_storages_stream(client: TestClient, mock_storage_gateway: AsyncMock) -> None:
+    mock_storage_gateway.iter_storages.return_value = async_iter([
+        Storage(id=1, name="Storage 1", location_x=0, location_y=0, capacities=[], current_levels=[]),
+        Storage(id=2, name="Storage 2", location_x=10, location_y=10, capacities=[], current_levels=[])
+    ])
+
+    response = client.get("/storages/?stream=true&limit=2")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["name"] for line in response.text.splitlines()] == ["Storage 1", "Storage 2"]
+    mock_storage_gateway.iter_storages.assert_called_once_with(None, 2)
+
+
+@pytest.mark.asyncio
+async def test_get_storages_etag(client: TestClient, mock_storage_gateway: AsyncMock) -> None:
+    mock_storage_gateway.get_storages.return_value = []
+
+    response = client.get("/storages/")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"storages-1"'
+
+
+@pytest.mark.asyncio
+async def test_get_storages_not_modified(client: TestClient, mock_storage_gateway: AsyncMock) -> None:
+    response = client.get("/storages/", headers={"If-None-Match": 'W/"storages-1"'})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"storages-1"'
+    assert response.content == b""
+    mock_storage_gateway.get_storages.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_storages_modified(client: TestClient, mock_storage_gateway: AsyncMock) -> None:
+    mock_storage_gateway.get_version.return_value = 2
+    mock_storage_gateway.get_storages.return_value = []
+
+    response = client.get("/storages/", headers={"If-None-Match": '"storages-1"'})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"storages-2"'
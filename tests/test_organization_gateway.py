@@ -0,0 +1,242 @@
+import pytest
+from sqlalchemy import event, select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.adapters.sqlalchemy_db import models
+from app.adapters.sqlalchemy_db.gateway import OrganizationSqlaGateway
+from app.application.models import OrganizationCreate, OrganizationWaste, WasteType
+from app.application.models.organization import OrganizationUpdate
+from app.application.models.waste import WasteTransferItem
+
+
+@pytest.fixture
+def gateway(session: AsyncSession) -> OrganizationSqlaGateway:
+    return OrganizationSqlaGateway(session)
+
+
+async def create_organization(gateway: OrganizationSqlaGateway, generated_waste: dict[WasteType, int]) -> int:
+    return await gateway.create_organization(OrganizationCreate(
+        name="Org",
+        location_x=0,
+        location_y=0,
+        generated_waste=[
+            OrganizationWaste(waste_type=waste_type, amount=amount)
+            for waste_type, amount in generated_waste.items()
+        ]
+    ))
+
+
+async def generated_waste(gateway: OrganizationSqlaGateway, organization_id: int) -> dict[str, int]:
+    gateway.session.expire_all()
+    organization = await gateway.get_organization_by_id(organization_id)
+    assert organization
+    return {waste.waste_type: waste.amount for waste in organization.generated_waste}
+
+
+@pytest.mark.asyncio
+async def test_reduce_organization_waste(gateway: OrganizationSqlaGateway) -> None:
+    organization_id = await create_organization(gateway, {WasteType.GLASS: 10})
+
+    assert await gateway.reduce_organization_waste(organization_id, WasteType.GLASS, 4) == 6
+    assert await gateway.reduce_organization_waste(organization_id, WasteType.GLASS, 7) is None
+    assert await gateway.reduce_organization_waste(organization_id, WasteType.PLASTIC, 1) is None
+    assert await gateway.reduce_organization_waste(organization_id, WasteType.GLASS, 6) == 0
+    assert await generated_waste(gateway, organization_id) == {"GLASS": 0}
+
+
+@pytest.mark.asyncio
+async def test_iter_organizations_through_own_session(session: AsyncSession) -> None:
+    organization_id = await create_organization(OrganizationSqlaGateway(session), {WasteType.GLASS: 10})
+    await session.commit()
+    # The request's session is closed once a streamed response starts.
+    await session.close()
+
+    gateway = OrganizationSqlaGateway(session, async_sessionmaker(session.bind))
+    organizations = [organization async for organization in gateway.iter_organizations()]
+
+    assert [organization.id for organization in organizations] == [organization_id]
+    assert organizations[0].generated_waste == [OrganizationWaste(waste_type=WasteType.GLASS, amount=10)]
+    assert not session.in_transaction()
+
+
+@pytest.mark.asyncio
+async def test_generate_waste(gateway: OrganizationSqlaGateway) -> None:
+    organization_id = await create_organization(gateway, {WasteType.GLASS: 10})
+
+    assert await gateway.generate_waste(organization_id, WasteType.GLASS, 5) == 15
+    assert await gateway.generate_waste(organization_id, WasteType.PLASTIC, 3) == 3
+    assert await generated_waste(gateway, organization_id) == {"GLASS": 15, "PLASTIC": 3}
+
+
+@pytest.mark.asyncio
+async def test_lock_organization_waste(gateway: OrganizationSqlaGateway) -> None:
+    organization_id = await create_organization(gateway, {WasteType.GLASS: 10})
+
+    glass = await gateway.lock_organization_waste(organization_id, WasteType.GLASS)
+    plastic = await gateway.lock_organization_waste(organization_id, WasteType.PLASTIC)
+
+    assert glass and glass.amount == 10
+    assert plastic and plastic.amount is None
+    assert await gateway.lock_organization_waste(organization_id + 1, WasteType.GLASS) is None
+
+
+@pytest.mark.asyncio
+async def test_lock_and_reduce_organization_wastes(gateway: OrganizationSqlaGateway) -> None:
+    first = await create_organization(gateway, {WasteType.GLASS: 10, WasteType.PLASTIC: 4})
+    second = await create_organization(gateway, {WasteType.GLASS: 7})
+
+    states = await gateway.lock_organization_wastes([
+        (first, WasteType.GLASS),
+        (first, WasteType.PLASTIC),
+        (second, WasteType.PLASTIC),
+        (second + 1, WasteType.GLASS),
+        (first, WasteType.GLASS),
+    ])
+    assert [(state.organization_id, state.waste_type, state.amount) for state in states] == [
+        (first, WasteType.GLASS, 10),
+        (first, WasteType.PLASTIC, 4),
+        (second, WasteType.PLASTIC, None),
+    ]
+
+    await gateway.reduce_organization_wastes([
+        WasteTransferItem(organization_id=first, storage_id=1, waste_type=WasteType.GLASS, amount=3),
+        WasteTransferItem(organization_id=first, storage_id=2, waste_type=WasteType.GLASS, amount=2),
+        WasteTransferItem(organization_id=second, storage_id=1, waste_type=WasteType.GLASS, amount=7),
+    ])
+    assert await generated_waste(gateway, first) == {"GLASS": 5, "PLASTIC": 4}
+    assert await generated_waste(gateway, second) == {"GLASS": 0}
+
+
+@pytest.mark.asyncio
+async def test_version_is_bumped_on_commit(gateway: OrganizationSqlaGateway) -> None:
+    assert await gateway.get_version() == 0
+
+    await create_organization(gateway, {WasteType.GLASS: 10})
+    await gateway.session.commit()
+    assert await gateway.get_version() == 1
+
+    await create_organization(gateway, {WasteType.GLASS: 10})
+    await gateway.session.rollback()
+    assert await gateway.get_version() == 1
+
+    await gateway.session.commit()
+    assert await gateway.get_version() == 1
+
+
+@pytest.mark.asyncio
+async def test_update_organization_keeps_waste_types(gateway: OrganizationSqlaGateway) -> None:
+    organization_id = await create_organization(gateway, {WasteType.GLASS: 10})
+
+    await gateway.update_organization_by_id(organization_id, OrganizationCreate(
+        name="Org",
+        location_x=0,
+        location_y=0,
+        generated_waste=[OrganizationWaste(waste_type=WasteType.GLASS, amount=20)]
+    ))
+    await gateway.session.flush()
+
+    assert await generated_waste(gateway, organization_id) == {"GLASS": 20}
+
+
+@pytest.mark.asyncio
+async def test_update_organization_writes_only_changes(gateway: OrganizationSqlaGateway) -> None:
+    organization_id = await create_organization(gateway, {WasteType.GLASS: 10, WasteType.PLASTIC: 5})
+    await gateway.session.commit()
+    version = await gateway.get_version()
+    statements: list[str] = []
+    engine = gateway.session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+    await gateway.update_organization_by_id(organization_id, OrganizationCreate(
+        name="Org",
+        location_x=0,
+        location_y=0,
+        generated_waste=[
+            OrganizationWaste(waste_type=WasteType.GLASS, amount=20),
+            OrganizationWaste(waste_type=WasteType.PLASTIC, amount=5),
+        ]
+    ))
+
+    assert statements == ["SELECT", "SELECT", "UPDATE"]
+    await gateway.session.commit()
+    assert await gateway.get_version() == version + 1
+
+    statements.clear()
+    await gateway.update_organization_by_id(organization_id, OrganizationCreate(
+        name="Org",
+        location_x=0,
+        location_y=0,
+        generated_waste=[
+            OrganizationWaste(waste_type=WasteType.PLASTIC, amount=5),
+            OrganizationWaste(waste_type=WasteType.GLASS, amount=20),
+        ]
+    ))
+
+    assert statements == ["SELECT", "SELECT"]
+    await gateway.session.commit()
+    assert await gateway.get_version() == version + 1
+    assert await generated_waste(gateway, organization_id) == {"GLASS": 20, "PLASTIC": 5}
+
+
+@pytest.mark.asyncio
+async def test_patch_organization(gateway: OrganizationSqlaGateway) -> None:
+    organization_id = await create_organization(gateway, {WasteType.GLASS: 10, WasteType.PLASTIC: 5})
+
+    assert await gateway.patch_organization_by_id(organization_id, OrganizationUpdate(name="New")) == organization_id
+    assert await generated_waste(gateway, organization_id) == {"GLASS": 10, "PLASTIC": 5}
+
+    await gateway.patch_organization_by_id(organization_id, OrganizationUpdate(generated_waste=[
+        OrganizationWaste(waste_type=WasteType.PLASTIC, amount=7),
+        OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1),
+    ]))
+    assert await generated_waste(gateway, organization_id) == {"PLASTIC": 7, "BIO_WASTE": 1}
+    organization = await gateway.get_organization_by_id(organization_id)
+    assert organization
+    assert (organization.name, organization.location_x) == ("New", 0)
+    assert await gateway.patch_organization_by_id(organization_id + 1, OrganizationUpdate(name="New")) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_organizations(gateway: OrganizationSqlaGateway) -> None:
+    first = await create_organization(gateway, {WasteType.GLASS: 10, WasteType.PLASTIC: 5})
+    second = await create_organization(gateway, {WasteType.GLASS: 1})
+    kept = await create_organization(gateway, {WasteType.BIO_WASTE: 3})
+    await gateway.session.commit()
+    version = await gateway.get_version()
+    statements: list[str] = []
+    engine = gateway.session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+    assert await gateway.delete_organization_by_id(second) == second
+    assert await gateway.delete_organizations([first, kept + 1, first]) == [first]
+
+    assert statements == ["DELETE", "DELETE"]
+    await gateway.session.commit()
+    assert await gateway.get_version() == version + 1
+    assert await gateway.session.scalar(select(func.count()).select_from(models.OrganizationWaste)) == 1
+    assert [organization.id for organization in await gateway.get_organizations()] == [kept]
+    assert await gateway.delete_organization_by_id(first) is None
+
+
+@pytest.mark.asyncio
+async def test_create_organizations(gateway: OrganizationSqlaGateway) -> None:
+    version = await gateway.get_version()
+    organization_ids = await gateway.create_organizations([
+        OrganizationCreate(
+            name=f"Org {index}",
+            location_x=index,
+            location_y=0,
+            generated_waste=[OrganizationWaste(waste_type=WasteType.GLASS, amount=index)] if index else [],
+        )
+        for index in range(3)
+    ])
+    await gateway.session.commit()
+
+    organizations = await gateway.get_organizations()
+    assert [organization.id for organization in organizations] == organization_ids
+    assert [organization.name for organization in organizations] == ["Org 0", "Org 1", "Org 2"]
+    assert [await generated_waste(gateway, organization_id) for organization_id in organization_ids] == [
+        {}, {WasteType.GLASS: 1}, {WasteType.GLASS: 2}
+    ]
+    assert await gateway.get_version() == version + 1
+    assert await gateway.create_organizations([]) == []
@@ -0,0 +1,38 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.application.models.organization import OrganizationUpdate
+
+
+@pytest.mark.asyncio
+async def test_patch_organization(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    mock_organization_gateway.patch_organization_by_id.return_value = 1
+
+    response = client.patch("/organizations/1/", json={"name": "Updated Org"})
+
+    assert response.status_code == 200
+    assert response.json()["detail"] == "Organization updated successfully"
+    organization_id, organization_data = mock_organization_gateway.patch_organization_by_id.await_args.args
+    assert organization_id == 1
+    assert organization_data == OrganizationUpdate(name="Updated Org")
+    assert organization_data.model_fields_set == {"name"}
+
+
+@pytest.mark.asyncio
+async def test_patch_organization_not_found(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    mock_organization_gateway.patch_organization_by_id.return_value = None
+
+    response = client.patch("/organizations/999/", json={"generated_waste": []})
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Organization not found"
+
+
+@pytest.mark.asyncio
+async def test_patch_organization_rejects_null(client: TestClient, mock_organization_gateway: AsyncMock) -> None:
+    response = client.patch("/organizations/1/", json={"name": None})
+
+    assert response.status_code == 422
+    mock_organization_gateway.patch_organization_by_id.assert_not_awaited()
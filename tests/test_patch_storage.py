@@ -0,0 +1,54 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.application.models import WasteType
+from app.application.models.storage import StorageUpdate
+from app.application.models.storage_capacity import StorageCapacity
+
+
+@pytest.mark.asyncio
+async def test_patch_storage(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    mock_storage_gateway.patch_storage_by_id.return_value = 1
+
+    response = client.patch("/storages/1/", json={"capacities": [{"waste_type": "GLASS", "capacity": 10}]})
+
+    assert response.status_code == 200
+    assert response.json() == {"detail": "Storage updated successfully"}
+    mock_storage_gateway.patch_storage_by_id.assert_awaited_once_with(
+        1, StorageUpdate(capacities=[StorageCapacity(waste_type=WasteType.GLASS, capacity=10)])
+    )
+    mock_uow.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_patch_storage_not_found(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    mock_storage_gateway.patch_storage_by_id.return_value = None
+
+    response = client.patch("/storages/999/", json={"name": "Updated Storage"})
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Storage not found"}
+
+
+@pytest.mark.asyncio
+async def test_patch_storage_duplicate_waste_types(
+        client: TestClient,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock
+) -> None:
+    current_levels = [{"waste_type": "GLASS", "current_amount": 1}, {"waste_type": "GLASS", "current_amount": 2}]
+
+    response = client.patch("/storages/1/", json={"current_levels": current_levels})
+
+    assert response.status_code == 422
+    mock_storage_gateway.patch_storage_by_id.assert_not_awaited()
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from app.adapters.sqlalchemy_db.engine import SqlaConnectionPoolMonitor
+from app.main.config import DatabaseSettings
+from app.main.di import create_engine
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics(tmp_path: Path) -> None:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=2,
+        max_overflow=2,
+    )
+    monitor = SqlaConnectionPoolMonitor(engine, 2)
+
+    async with engine.connect() as first, engine.connect():
+        await first.execute(text("SELECT 1"))
+        metrics = await monitor.get_pool_metrics()
+        assert metrics.size == 2
+        assert metrics.checked_out == 2
+        assert metrics.utilization == 0.5
+
+    metrics = await monitor.get_pool_metrics()
+    assert metrics.checked_out == 0
+    assert metrics.checked_in == 2
+    assert metrics.connects == 2
+    assert metrics.checkouts == 2
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_engine_without_queue_pool() -> None:
+    engine = create_engine(DatabaseSettings(uri="sqlite+aiosqlite://", pool_size=2, max_overflow=2))
+
+    assert isinstance(engine.pool, StaticPool)
+    async with engine.connect() as connection:
+        assert await connection.scalar(text("SELECT 1")) == 1
+    metrics = await SqlaConnectionPoolMonitor(engine, 2).get_pool_metrics()
+    assert (metrics.pool, metrics.size) == ("StaticPool", None)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout(tmp_path: Path) -> None:
+    engine = create_engine(DatabaseSettings(uri=f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", statement_timeout=1.5))
+
+    async with engine.connect() as connection:
+        assert await connection.scalar(text("PRAGMA busy_timeout")) == 1500
+    await engine.dispose()
+
+
+def test_settings_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DATABASE_URI", "sqlite+aiosqlite:///test.db")
+    monkeypatch.setenv("DB_ECHO", "true")
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT", "5")
+
+    settings = DatabaseSettings.from_env()
+    assert settings.echo is True
+    assert settings.pool_size == 20
+    assert settings.max_overflow == 10
+    assert settings.statement_timeout == 5
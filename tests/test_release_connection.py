@@ -0,0 +1,76 @@
+from contextlib import aclosing
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.adapters.sqlalchemy_db.gateway import OrganizationSqlaGateway, StorageSqlaGateway
+from app.adapters.sqlalchemy_db.models import Base
+from app.application.models import OrganizationCreate, WasteType
+from app.application.models.storage import StorageCreate
+
+
+@pytest.fixture
+async def engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'release.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+def checked_out(engine: AsyncEngine) -> int:
+    assert isinstance(engine.pool, QueuePool)
+    return engine.pool.checkedout()
+
+
+@pytest.mark.asyncio
+async def test_reads_release_connection(engine: AsyncEngine) -> None:
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        gateway = OrganizationSqlaGateway(session)
+        assert checked_out(engine) == 0
+
+        assert await gateway.get_organizations() == []
+        assert await gateway.get_organization_by_id(1) is None
+        assert await gateway.get_version() == 0
+        assert checked_out(engine) == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_and_locks_keep_connection(engine: AsyncEngine) -> None:
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        gateway = OrganizationSqlaGateway(session)
+        organization_id = await gateway.create_organization(
+            OrganizationCreate(name="Org", location_x=0, location_y=0, generated_waste=[])
+        )
+        await gateway.get_organizations()
+        assert checked_out(engine) == 1
+
+        await session.commit()
+        await gateway.get_organizations()
+        assert checked_out(engine) == 0
+
+        await gateway.lock_organization_waste(organization_id, WasteType.GLASS)
+        organization = await gateway.get_organization_by_id(organization_id)
+        assert organization and organization.name == "Org"
+        assert checked_out(engine) == 1
+
+
+@pytest.mark.asyncio
+async def test_stopped_available_storages_release_connection(engine: AsyncEngine) -> None:
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        gateway = StorageSqlaGateway(session)
+        await gateway.create_storages([
+            StorageCreate(name=f"S{i}", location_x=i, location_y=0, capacities=[], current_levels=[])
+            for i in range(3)
+        ])
+        await session.commit()
+
+        nearest_storages = gateway.iter_available_storages(0, 0, [])
+        async with aclosing(nearest_storages):
+            async for storage in nearest_storages:
+                assert checked_out(engine) == 1
+                break
+        assert checked_out(engine) == 0
@@ -0,0 +1,134 @@
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.adapters.replica_gateway import ReplicaOrganizationGateway, ReplicaStorageGateway
+from app.adapters.sqlalchemy_db.models import Base
+from app.application.models import OrganizationCreate
+from app.application.protocols.database import OrganizationDatabaseGateway, StorageDatabaseGateway
+from app.main.di import PRIMARY_READS_COOKIE
+from app.main.web import create_app
+
+
+@pytest.mark.asyncio
+async def test_organization_reads_go_to_replica() -> None:
+    primary = AsyncMock(OrganizationDatabaseGateway)
+    replica = AsyncMock(OrganizationDatabaseGateway)
+    gateway = ReplicaOrganizationGateway(primary, replica)
+
+    await gateway.get_organizations()
+    await gateway.get_organization_by_id(1)
+    await gateway.get_version()
+    await gateway.create_organization(OrganizationCreate(name="Org", location_x=0, location_y=0, generated_waste=[]))
+    await gateway.lock_organization_wastes([])
+
+    replica.get_organizations.assert_awaited_once()
+    replica.get_organization_by_id.assert_awaited_once_with(1)
+    replica.get_version.assert_awaited_once()
+    primary.create_organization.assert_awaited_once()
+    primary.lock_organization_wastes.assert_awaited_once()
+    primary.get_organizations.assert_not_called()
+    replica.create_organization.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_storage_reads_go_to_replica() -> None:
+    primary = AsyncMock(StorageDatabaseGateway)
+    replica = AsyncMock(StorageDatabaseGateway)
+    gateway = ReplicaStorageGateway(primary, replica)
+
+    await gateway.get_storages(1, 2)
+    await gateway.get_storage_by_id(1)
+    await gateway.get_free_capacities([])
+    await gateway.add_waste_to_storages([])
+
+    replica.get_storages.assert_awaited_once_with(1, 2)
+    replica.get_storage_by_id.assert_awaited_once_with(1)
+    primary.get_free_capacities.assert_awaited_once()
+    primary.add_waste_to_storages.assert_awaited_once()
+
+
+@pytest.fixture
+async def replicated_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    uris = [f"sqlite+aiosqlite:///{tmp_path / name}" for name in ("primary.db", "replica.db")]
+    for uri in uris:
+        engine = create_async_engine(uri)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+    monkeypatch.setenv("DATABASE_URI", uris[0])
+    monkeypatch.setenv("DATABASE_REPLICA_URI", uris[1])
+    monkeypatch.setenv("DB_READ_YOUR_WRITES_WINDOW", "30")
+    return TestClient(create_app())
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes(replicated_client: TestClient) -> None:
+    response = replicated_client.post(
+        "/organizations/",
+        json={"name": "Org", "location_x": 0, "location_y": 0, "generated_waste": []},
+    )
+    assert response.status_code == 200
+    cookie = response.cookies[PRIMARY_READS_COOKIE]
+    organization_id = response.json()["organization_id"]
+
+    replicated_client.cookies.clear()
+    response = replicated_client.get(f"/organizations/{organization_id}")
+    assert response.status_code == 404
+
+    replicated_client.cookies[PRIMARY_READS_COOKIE] = cookie
+    response = replicated_client.get(f"/organizations/{organization_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Org"
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_are_not_cached(replicated_client: TestClient, tmp_path: Path) -> None:
+    organization_id = replicated_client.post(
+        "/organizations/",
+        json={"name": "Org", "location_x": 3, "location_y": 4, "generated_waste": []},
+    ).json()["organization_id"]
+    response = replicated_client.post(
+        "/storages/",
+        json={"name": "Storage", "location_x": 0, "location_y": 0, "capacities": [], "current_levels": []},
+    )
+    cookie = response.cookies[PRIMARY_READS_COOKIE]
+    storage_id = response.json()["storage_id"]
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("INSERT INTO organizations (id, name, location_x, location_y) VALUES (:id, 'Org', 0, 0)"),
+            {"id": organization_id},
+        )
+        await connection.execute(
+            text("INSERT INTO storages (id, name, location_x, location_y) VALUES (:id, 'Storage', 0, 0)"),
+            {"id": storage_id},
+        )
+    await engine.dispose()
+    url = f"/organizations/{organization_id}/distance-to-storage/{storage_id}/"
+
+    replicated_client.cookies.clear()
+    assert replicated_client.get(url).json()["distance"] == 0
+
+    replicated_client.cookies[PRIMARY_READS_COOKIE] = cookie
+    assert replicated_client.get(url).json()["distance"] == 5
+
+
+@pytest.mark.asyncio
+async def test_export_streams_through_own_session(replicated_client: TestClient) -> None:
+    response = replicated_client.post(
+        "/organizations/",
+        json={"name": "Org", "location_x": 0, "location_y": 0, "generated_waste": []},
+    )
+    organization_id = response.json()["organization_id"]
+
+    lines = replicated_client.get("/export/organizations/").text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [organization_id]
+
+    replicated_client.cookies.clear()
+    assert replicated_client.get("/export/organizations/").text == ""
@@ -0,0 +1,17 @@
+import pytest
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.api.responses import default_response_class
+
+
+def test_default_response_class() -> None:
+    assert default_response_class() is ORJSONResponse
+    assert default_response_class("json") is JSONResponse
+    with pytest.raises(ValueError):
+        default_response_class("yaml")
+
+
+def test_orjson_response_matches_json_response() -> None:
+    content = {"distances": [[1.5, 2.0]], "name": "ОО 1", "ids": {1: True}}
+
+    assert ORJSONResponse(content).body == JSONResponse({**content, "ids": {"1": True}}).body
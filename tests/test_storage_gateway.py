@@ -0,0 +1,390 @@
+from contextlib import aclosing
+
+import pytest
+from sqlalchemy import event, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters.sqlalchemy_db import models
+from app.adapters.sqlalchemy_db.gateway import StorageSqlaGateway
+from app.application.models import OrganizationWaste, WasteType
+from app.application.models.storage import StorageCreate, StorageUpdate
+from app.application.models.storage_capacity import StorageCapacity
+from app.application.models.storage_current_level import StorageCurrentLevel
+from app.application.models.waste import WasteTransferItem
+
+
+@pytest.fixture
+def gateway(session: AsyncSession) -> StorageSqlaGateway:
+    return StorageSqlaGateway(session)
+
+
+async def create_storage(
+        gateway: StorageSqlaGateway,
+        location_x: float,
+        capacities: dict[WasteType, int],
+        current_levels: dict[WasteType, int],
+) -> int:
+    return await gateway.create_storage(StorageCreate(
+        name=f"S{location_x}",
+        location_x=location_x,
+        location_y=0,
+        capacities=[
+            StorageCapacity(waste_type=waste_type, capacity=capacity)
+            for waste_type, capacity in capacities.items()
+        ],
+        current_levels=[
+            StorageCurrentLevel(waste_type=waste_type, current_amount=current_amount)
+            for waste_type, current_amount in current_levels.items()
+        ]
+    ))
+
+
+async def available_storage_ids(
+        gateway: StorageSqlaGateway,
+        generated_waste: list[OrganizationWaste],
+        max_distance: float | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+) -> list[int]:
+    storages = gateway.iter_available_storages(0, 0, generated_waste, max_distance, limit, offset)
+    async with aclosing(storages):
+        return [storage.id async for storage in storages]
+
+
+@pytest.mark.asyncio
+async def test_available_storages_free_capacity(gateway: StorageSqlaGateway) -> None:
+    suitable = await create_storage(gateway, 100, {WasteType.BIO_WASTE: 2}, {WasteType.BIO_WASTE: 1})
+    await create_storage(gateway, 50, {WasteType.BIO_WASTE: 2}, {WasteType.BIO_WASTE: 2})
+
+    result = await available_storage_ids(gateway, [OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)])
+
+    assert result == [suitable]
+
+
+@pytest.mark.asyncio
+async def test_available_storages_no_suitable(gateway: StorageSqlaGateway) -> None:
+    await create_storage(gateway, 100, {WasteType.BIO_WASTE: 18}, {WasteType.BIO_WASTE: 10})
+    await create_storage(gateway, 100, {WasteType.GLASS: 2000}, {WasteType.GLASS: 200})
+
+    result = await available_storage_ids(gateway, [OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=10)])
+
+    assert result == []
+
+
+@pytest.mark.asyncio
+async def test_available_storages_several_waste_types(gateway: StorageSqlaGateway) -> None:
+    await create_storage(gateway, 100, {WasteType.BIO_WASTE: 200}, {WasteType.BIO_WASTE: 10})
+    await create_storage(gateway, 100, {WasteType.GLASS: 2000}, {WasteType.GLASS: 200})
+    suitable = await create_storage(
+        gateway,
+        100,
+        {WasteType.BIO_WASTE: 2000, WasteType.GLASS: 2000},
+        {WasteType.BIO_WASTE: 20, WasteType.GLASS: 200}
+    )
+
+    result = await available_storage_ids(gateway, [
+        OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=10),
+        OrganizationWaste(waste_type=WasteType.GLASS, amount=20),
+    ])
+
+    assert result == [suitable]
+
+
+@pytest.mark.asyncio
+async def test_available_storages_missing_level_and_empty_waste(gateway: StorageSqlaGateway) -> None:
+    far = await create_storage(gateway, 30, {WasteType.PLASTIC: 5}, {})
+    near = await create_storage(gateway, 10, {}, {})
+
+    assert await available_storage_ids(gateway, [
+        OrganizationWaste(waste_type=WasteType.PLASTIC, amount=5)
+    ]) == [far]
+    assert await available_storage_ids(gateway, [
+        OrganizationWaste(waste_type=WasteType.PLASTIC, amount=0)
+    ]) == [near, far]
+    assert await available_storage_ids(gateway, [], max_distance=20) == [near]
+
+
+@pytest.mark.asyncio
+async def test_available_storages_limit_offset(gateway: StorageSqlaGateway) -> None:
+    far = await create_storage(gateway, -30, {}, {})
+    ties = [await create_storage(gateway, location_x, {}, {}) for location_x in (10, -10, 10)]
+    near = await create_storage(gateway, 5, {}, {})
+
+    assert await available_storage_ids(gateway, []) == [near, *ties, far]
+    assert await available_storage_ids(gateway, [], max_distance=10) == [near, *ties]
+    assert await available_storage_ids(gateway, [], limit=2, offset=1) == ties[:2]
+    assert await available_storage_ids(gateway, [], max_distance=10, offset=3) == ties[2:]
+
+
+@pytest.mark.asyncio
+async def test_available_storages_follow_updates_and_deletes(gateway: StorageSqlaGateway) -> None:
+    first = await create_storage(gateway, 10, {}, {})
+    second = await create_storage(gateway, 20, {}, {})
+
+    await gateway.update_storage_by_id(first, StorageCreate(
+        name="moved",
+        location_x=30,
+        location_y=0,
+        capacities=[],
+        current_levels=[]
+    ))
+    await gateway.session.flush()
+    assert await available_storage_ids(gateway, []) == [second, first]
+
+    await gateway.delete_storage_by_id(second)
+    await gateway.session.flush()
+    assert await available_storage_ids(gateway, []) == [first]
+
+
+@pytest.mark.asyncio
+async def test_delete_storages(gateway: StorageSqlaGateway) -> None:
+    first = await create_storage(gateway, 10, {WasteType.GLASS: 100, WasteType.PLASTIC: 50}, {WasteType.GLASS: 10})
+    second = await create_storage(gateway, 20, {WasteType.GLASS: 100}, {})
+    kept = await create_storage(gateway, 30, {WasteType.GLASS: 100}, {WasteType.GLASS: 1})
+    await gateway.session.commit()
+    version = await gateway.get_version()
+    statements: list[str] = []
+    engine = gateway.session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+    assert await gateway.delete_storages([second, kept + 1, first]) == [first, second]
+
+    assert statements == ["DELETE"]
+    await gateway.session.commit()
+    assert await gateway.get_version() == version + 1
+    assert await gateway.session.scalar(select(func.count()).select_from(models.StorageCapacity)) == 1
+    assert await gateway.session.scalar(select(func.count()).select_from(models.StorageCurrentLevel)) == 1
+    assert [storage.id for storage in await gateway.get_storages()] == [kept]
+    assert await available_storage_ids(gateway, []) == [kept]
+    assert await gateway.delete_storage_by_id(first) is None
+
+
+@pytest.mark.asyncio
+async def test_get_storages_keyset_pagination(gateway: StorageSqlaGateway) -> None:
+    storage_ids = [await create_storage(gateway, index, {WasteType.GLASS: index}, {}) for index in range(5)]
+
+    first_page = await gateway.get_storages(limit=2)
+    second_page = await gateway.get_storages(after_id=first_page[-1].id, limit=2)
+    rest = await gateway.get_storages(after_id=second_page[-1].id)
+
+    assert [storage.id for storage in first_page + second_page + rest] == storage_ids
+    assert rest[0].capacities == [StorageCapacity(waste_type=WasteType.GLASS, capacity=4)]
+
+
+@pytest.mark.asyncio
+async def test_iter_storages(gateway: StorageSqlaGateway) -> None:
+    storage_ids = [await create_storage(gateway, index, {WasteType.GLASS: index}, {}) for index in range(5)]
+
+    storages = [storage async for storage in gateway.iter_storages(after_id=storage_ids[0], limit=3)]
+
+    assert [storage.id for storage in storages] == storage_ids[1:4]
+    assert storages[-1].capacities == [StorageCapacity(waste_type=WasteType.GLASS, capacity=3)]
+
+
+@pytest.mark.asyncio
+async def test_create_storages(gateway: StorageSqlaGateway) -> None:
+    storage_ids = await gateway.create_storages([
+        StorageCreate(
+            name=f"S{index}",
+            location_x=index,
+            location_y=0,
+            capacities=[StorageCapacity(waste_type=WasteType.GLASS, capacity=10)],
+            current_levels=[StorageCurrentLevel(waste_type=WasteType.GLASS, current_amount=index)] if index else [],
+        )
+        for index in range(3)
+    ])
+    await gateway.session.commit()
+
+    storages = await gateway.get_storages()
+    assert [storage.id for storage in storages] == storage_ids
+    assert [storage.name for storage in storages] == ["S0", "S1", "S2"]
+    assert [storage.current_levels for storage in storages] == [
+        [],
+        [StorageCurrentLevel(waste_type=WasteType.GLASS, current_amount=1)],
+        [StorageCurrentLevel(waste_type=WasteType.GLASS, current_amount=2)],
+    ]
+    assert await available_storage_ids(gateway, [OrganizationWaste(waste_type=WasteType.GLASS, amount=9)]) == [
+        storage_ids[0], storage_ids[1]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_storages_in_one_query(gateway: StorageSqlaGateway) -> None:
+    storage_id = await create_storage(
+        gateway,
+        1,
+        {WasteType.PLASTIC: 5, WasteType.BIO_WASTE: 3},
+        {WasteType.PLASTIC: 2, WasteType.GLASS: 0},
+    )
+    empty_id = await create_storage(gateway, 2, {}, {})
+    await gateway.session.commit()
+    statements = []
+    engine = gateway.session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    storages = await gateway.get_storages()
+
+    assert len(statements) == 1
+    assert [storage.id for storage in storages] == [storage_id, empty_id]
+    assert storages[0].capacities == [
+        StorageCapacity(waste_type=WasteType.BIO_WASTE, capacity=3),
+        StorageCapacity(waste_type=WasteType.PLASTIC, capacity=5),
+    ]
+    assert storages[0].current_levels == [
+        StorageCurrentLevel(waste_type=WasteType.GLASS, current_amount=0),
+        StorageCurrentLevel(waste_type=WasteType.PLASTIC, current_amount=2),
+    ]
+    assert storages[1].capacities == []
+    assert storages[1].current_levels == []
+    assert await gateway.get_storage_by_id(storage_id) == storages[0]
+
+
+@pytest.mark.asyncio
+async def test_add_waste_to_storage_respects_capacity(gateway: StorageSqlaGateway) -> None:
+    storage_id = await create_storage(
+        gateway,
+        0,
+        {WasteType.GLASS: 10, WasteType.PLASTIC: 5},
+        {WasteType.GLASS: 8}
+    )
+
+    assert await gateway.add_waste_to_storage(storage_id, WasteType.GLASS, 3) is None
+    assert await gateway.add_waste_to_storage(storage_id, WasteType.GLASS, 2) == 10
+    assert await gateway.add_waste_to_storage(storage_id, WasteType.PLASTIC, 6) is None
+    assert await gateway.add_waste_to_storage(storage_id, WasteType.PLASTIC, 4) == 4
+    assert await gateway.add_waste_to_storage(storage_id, WasteType.PLASTIC, 1) == 5
+    assert await gateway.add_waste_to_storage(storage_id, WasteType.BIO_WASTE, 1) is None
+
+    gateway.session.expire_all()
+    storage = await gateway.get_storage_by_id(storage_id)
+    assert storage
+    assert {level.waste_type: level.current_amount for level in storage.current_levels} == {
+        "GLASS": 10,
+        "PLASTIC": 5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_lock_storage_waste(gateway: StorageSqlaGateway) -> None:
+    storage_id = await create_storage(gateway, 0, {WasteType.GLASS: 10, WasteType.PLASTIC: 5}, {WasteType.GLASS: 8})
+
+    glass = await gateway.lock_storage_waste(storage_id, WasteType.GLASS)
+    plastic = await gateway.lock_storage_waste(storage_id, WasteType.PLASTIC)
+    bio_waste = await gateway.lock_storage_waste(storage_id, WasteType.BIO_WASTE)
+
+    assert glass and (glass.capacity, glass.current_amount) == (10, 8)
+    assert plastic and (plastic.capacity, plastic.current_amount) == (5, None)
+    assert bio_waste and (bio_waste.capacity, bio_waste.current_amount) == (None, None)
+    assert await gateway.lock_storage_waste(storage_id + 1, WasteType.GLASS) is None
+
+
+@pytest.mark.asyncio
+async def test_lock_and_add_waste_to_storages(gateway: StorageSqlaGateway) -> None:
+    first = await create_storage(gateway, 0, {WasteType.GLASS: 10, WasteType.PLASTIC: 5}, {WasteType.GLASS: 8})
+    second = await create_storage(gateway, 0, {WasteType.GLASS: 10}, {WasteType.GLASS: 1})
+
+    states = await gateway.lock_storage_wastes([
+        (second, WasteType.GLASS),
+        (first, WasteType.PLASTIC),
+        (first, WasteType.BIO_WASTE),
+        (second + 1, WasteType.GLASS),
+    ])
+    assert [(state.storage_id, state.waste_type, state.capacity, state.current_amount) for state in states] == [
+        (second, WasteType.GLASS, 10, 1),
+        (first, WasteType.PLASTIC, 5, None),
+        (first, WasteType.BIO_WASTE, None, None),
+    ]
+
+    await gateway.add_waste_to_storages([
+        WasteTransferItem(organization_id=1, storage_id=first, waste_type=WasteType.PLASTIC, amount=2),
+        WasteTransferItem(organization_id=2, storage_id=first, waste_type=WasteType.PLASTIC, amount=1),
+        WasteTransferItem(organization_id=1, storage_id=second, waste_type=WasteType.GLASS, amount=4),
+    ])
+    gateway.session.expire_all()
+    levels = {}
+    for storage_id in (first, second):
+        storage = await gateway.get_storage_by_id(storage_id)
+        assert storage
+        levels[storage_id] = {level.waste_type: level.current_amount for level in storage.current_levels}
+    assert levels == {first: {"GLASS": 8, "PLASTIC": 3}, second: {"GLASS": 5}}
+
+
+@pytest.mark.asyncio
+async def test_get_free_capacities(gateway: StorageSqlaGateway) -> None:
+    partly_full = await create_storage(
+        gateway, 1, {WasteType.GLASS: 10, WasteType.PLASTIC: 5}, {WasteType.GLASS: 4, WasteType.PLASTIC: 5}
+    )
+    empty = await create_storage(gateway, 2, {WasteType.GLASS: 3, WasteType.BIO_WASTE: 7}, {})
+
+    result = await gateway.get_free_capacities([WasteType.GLASS, WasteType.PLASTIC])
+
+    assert [(item.storage_id, item.waste_type, item.free_capacity) for item in result] == [
+        (partly_full, WasteType.GLASS, 6),
+        (empty, WasteType.GLASS, 3),
+    ]
+    assert await gateway.get_free_capacities([]) == []
+
+
+@pytest.mark.asyncio
+async def test_update_storage_keeps_waste_types(gateway: StorageSqlaGateway) -> None:
+    storage_id = await create_storage(gateway, 10, {WasteType.GLASS: 100}, {WasteType.GLASS: 10})
+
+    await gateway.update_storage_by_id(storage_id, StorageCreate(
+        name="S10",
+        location_x=10,
+        location_y=0,
+        capacities=[StorageCapacity(waste_type=WasteType.GLASS, capacity=200)],
+        current_levels=[StorageCurrentLevel(waste_type=WasteType.GLASS, current_amount=20)]
+    ))
+    await gateway.session.flush()
+    gateway.session.expire_all()
+
+    storage = await gateway.get_storage_by_id(storage_id)
+    assert storage
+    assert [(capacity.waste_type, capacity.capacity) for capacity in storage.capacities] == [("GLASS", 200)]
+    assert [(level.waste_type, level.current_amount) for level in storage.current_levels] == [("GLASS", 20)]
+
+
+@pytest.mark.asyncio
+async def test_update_storage_writes_only_changes(gateway: StorageSqlaGateway) -> None:
+    storage_id = await create_storage(
+        gateway, 10, {WasteType.GLASS: 100, WasteType.PLASTIC: 50}, {WasteType.GLASS: 10}
+    )
+    await gateway.session.commit()
+    statements: list[str] = []
+    engine = gateway.session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+    await gateway.update_storage_by_id(storage_id, StorageCreate(
+        name="S10",
+        location_x=10,
+        location_y=0,
+        capacities=[
+            StorageCapacity(waste_type=WasteType.GLASS, capacity=100),
+            StorageCapacity(waste_type=WasteType.PLASTIC, capacity=50),
+        ],
+        current_levels=[StorageCurrentLevel(waste_type=WasteType.GLASS, current_amount=11)]
+    ))
+
+    assert statements == ["SELECT", "SELECT", "SELECT", "UPDATE"]
+
+
+@pytest.mark.asyncio
+async def test_patch_storage(gateway: StorageSqlaGateway) -> None:
+    storage_id = await create_storage(
+        gateway, 10, {WasteType.GLASS: 100, WasteType.PLASTIC: 50}, {WasteType.GLASS: 10}
+    )
+
+    await gateway.patch_storage_by_id(storage_id, StorageUpdate(
+        location_x=500,
+        capacities=[StorageCapacity(waste_type=WasteType.BIO_WASTE, capacity=30)],
+    ))
+    await gateway.session.flush()
+    gateway.session.expire_all()
+
+    storage = await gateway.get_storage_by_id(storage_id)
+    assert storage
+    assert (storage.name, storage.location_x, storage.location_y) == ("S10", 500, 0)
+    assert storage.capacities == [StorageCapacity(waste_type=WasteType.BIO_WASTE, capacity=30)]
+    assert storage.current_levels == [StorageCurrentLevel(waste_type=WasteType.GLASS, current_amount=10)]
+    assert await gateway.patch_storage_by_id(storage_id + 1, StorageUpdate(name="S")) is None
@@ -0,0 +1,87 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.models import WasteType
+from app.application.models.waste import OrganizationWasteState, StorageWasteState, WasteTransferItem
+
+
+@pytest.mark.asyncio
+async def test_transfer_waste_in_batch(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+) -> None:
+    mock_organization_gateway.lock_organization_wastes.return_value = [
+        OrganizationWasteState(organization_id=1, waste_type=WasteType.GLASS, amount=10),
+        OrganizationWasteState(organization_id=2, waste_type=WasteType.GLASS, amount=None),
+    ]
+    mock_storage_gateway.lock_storage_wastes.return_value = [
+        StorageWasteState(storage_id=5, waste_type=WasteType.GLASS, capacity=10, current_amount=2),
+    ]
+    transfers = [
+        {"organization_id": 1, "storage_id": 5, "waste_type": "GLASS", "amount": 6},
+        {"organization_id": 1, "storage_id": 5, "waste_type": "GLASS", "amount": 3},
+        {"organization_id": 1, "storage_id": 5, "waste_type": "GLASS", "amount": 2},
+        {"organization_id": 2, "storage_id": 5, "waste_type": "GLASS", "amount": 1},
+        {"organization_id": 3, "storage_id": 5, "waste_type": "GLASS", "amount": 1},
+        {"organization_id": 1, "storage_id": 6, "waste_type": "GLASS", "amount": 1},
+    ]
+
+    response = client.post("/organizations/transfer-waste/", json=transfers)
+
+    assert response.status_code == 200
+    assert response.json()["transferred"] == 2
+    assert [(result["transferred"], result["detail"]) for result in response.json()["results"]] == [
+        (True, "Waste transferred successfully."),
+        (False, "Storage 5 does not have sufficient capacity for 3 of waste type GLASS."),
+        (True, "Waste transferred successfully."),
+        (False, "Storage 5 does not have sufficient capacity for 1 of waste type GLASS."),
+        (False, "Organization not found"),
+        (False, "Storage not found"),
+    ]
+    mock_organization_gateway.lock_organization_wastes.assert_called_once_with(
+        [(1, WasteType.GLASS)] * 3 + [(2, WasteType.GLASS), (3, WasteType.GLASS), (1, WasteType.GLASS)]
+    )
+    accepted = [
+        WasteTransferItem(organization_id=1, storage_id=5, waste_type=WasteType.GLASS, amount=6),
+        WasteTransferItem(organization_id=1, storage_id=5, waste_type=WasteType.GLASS, amount=2),
+    ]
+    mock_organization_gateway.reduce_organization_wastes.assert_called_once_with(accepted)
+    mock_storage_gateway.add_waste_to_storages.assert_called_once_with(accepted)
+    mock_uow.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_transfer_waste_in_batch_nothing_valid(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+) -> None:
+    mock_organization_gateway.lock_organization_wastes.return_value = []
+    mock_storage_gateway.lock_storage_wastes.return_value = []
+    transfers = [{"organization_id": 1, "storage_id": 5, "waste_type": "GLASS", "amount": 6}]
+
+    response = client.post("/organizations/transfer-waste/", json=transfers)
+
+    assert response.status_code == 200
+    assert response.json()["transferred"] == 0
+    mock_organization_gateway.reduce_organization_wastes.assert_not_called()
+    mock_storage_gateway.add_waste_to_storages.assert_not_called()
+    mock_uow.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_transfer_waste_in_batch_validation(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+) -> None:
+    assert client.post("/organizations/transfer-waste/", json=[]).status_code == 422
+    assert client.post("/organizations/transfer-waste/", json=[
+        {"organization_id": 1, "storage_id": 5, "waste_type": "GLASS", "amount": 0}
+    ]).status_code == 422
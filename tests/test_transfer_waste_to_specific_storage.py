@@ -1,13 +1,10 @@
 from unittest.mock import AsyncMock
 
 import pytest
-from _pytest.monkeypatch import MonkeyPatch
 from fastapi.testclient import TestClient
 
-from app.application.models import OrganizationWaste, WasteType, Organization
-from app.application.models.storage import Storage
-from app.application.models.storage_capacity import StorageCapacity
-from app.application.models.storage_current_level import StorageCurrentLevel
+from app.application.models import WasteType
+from app.application.models.waste import OrganizationWasteState, StorageWasteState
 
 
 @pytest.mark.asyncio
@@ -16,38 +13,20 @@ async def test_transfer_waste_to_specific_storage(
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock,
         mock_uow: AsyncMock,
-        monkeypatch: MonkeyPatch
 ) -> None:
-    mock_transfer_waste = AsyncMock(return_value=None)
-    monkeypatch.setattr("app.api.organizations.transfer_waste", mock_transfer_waste)
-
-    mock_organization_gateway.get_organization_by_id.return_value = Organization(
-        id=1,
-        name="Org 1",
-        location_x=0,
-        location_y=0,
-        generated_waste=[
-            OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)
-        ]
-    )
-    mock_storage_gateway.get_storage_by_id.return_value = Storage(
-        id=2,
-        name="S2",
-        location_x=100,
-        location_y=0,
-        capacities=[
-            StorageCapacity(
-                waste_type=WasteType.BIO_WASTE,
-                capacity=2
-            )
-        ],
-        current_levels=[
-            StorageCurrentLevel(
-                waste_type=WasteType.BIO_WASTE,
-                current_amount=1
-            )
-        ]
+    mock_organization_gateway.lock_organization_waste.return_value = OrganizationWasteState(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=1
     )
+    mock_storage_gateway.lock_storage_waste.return_value = StorageWasteState(
+        storage_id=2,
+        waste_type=WasteType.BIO_WASTE,
+        capacity=2,
+        current_amount=1
+    )
+    mock_organization_gateway.reduce_organization_waste.return_value = 0
+    mock_storage_gateway.add_waste_to_storage.return_value = 2
 
     transfer_request = {
         "waste_type": "BIO_WASTE",
@@ -57,8 +36,21 @@ async def test_transfer_waste_to_specific_storage(
     response = client.post("/organizations/1/storages/2/transfer-waste/", json=transfer_request)
     assert response.status_code == 200
     assert response.json() == {"detail": "Waste transferred successfully."}
-    mock_organization_gateway.get_organization_by_id.assert_called_once_with(1)
-    mock_storage_gateway.get_storage_by_id.assert_called_once_with(2)
+    mock_organization_gateway.lock_organization_waste.assert_called_once_with(1, WasteType.BIO_WASTE)
+    mock_storage_gateway.lock_storage_waste.assert_called_once_with(2, WasteType.BIO_WASTE)
+    mock_organization_gateway.reduce_organization_waste.assert_called_once_with(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=1
+    )
+    mock_storage_gateway.add_waste_to_storage.assert_called_once_with(
+        storage_id=2,
+        waste_type=WasteType.BIO_WASTE,
+        amount=1
+    )
+    mock_organization_gateway.get_organization_by_id.assert_not_called()
+    mock_storage_gateway.get_storage_by_id.assert_not_called()
+    mock_uow.commit.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -67,9 +59,8 @@ async def test_organization_not_found(
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock,
         mock_uow: AsyncMock,
-        monkeypatch: MonkeyPatch
 ) -> None:
-    mock_organization_gateway.get_organization_by_id.return_value = None
+    mock_organization_gateway.lock_organization_waste.return_value = None
     transfer_request = {
         "waste_type": "BIO_WASTE",
         "amount": 1
@@ -77,6 +68,7 @@ async def test_organization_not_found(
     response = client.post("/organizations/1/storages/1/transfer-waste/", json=transfer_request)
     assert response.status_code == 404
     assert response.json() == {"detail": "Organization not found"}
+    mock_uow.rollback.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -85,16 +77,13 @@ async def test_storage_not_found(
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock,
         mock_uow: AsyncMock,
-        monkeypatch: MonkeyPatch
 ) -> None:
-    mock_organization_gateway.get_organization_by_id.return_value = Organization(
-        id=1,
-        name="Org 1",
-        location_x=0,
-        location_y=0,
-        generated_waste=[OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)]
-    )
-    mock_storage_gateway.get_storage_by_id.return_value = None
+    mock_organization_gateway.lock_organization_waste.return_value = OrganizationWasteState(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=1
+    )
+    mock_storage_gateway.lock_storage_waste.return_value = None
     transfer_request = {
         "waste_type": "BIO_WASTE",
         "amount": 1
@@ -110,22 +99,17 @@ async def test_storage_does_not_support_waste_type(
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock,
         mock_uow: AsyncMock,
-        monkeypatch: MonkeyPatch
 ) -> None:
-    mock_organization_gateway.get_organization_by_id.return_value = Organization(
-        id=1,
-        name="Org 1",
-        location_x=0,
-        location_y=0,
-        generated_waste=[OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)]
-    )
-    mock_storage_gateway.get_storage_by_id.return_value = Storage(
-        id=2,
-        name="S2",
-        location_x=100,
-        location_y=0,
-        capacities=[],
-        current_levels=[]
+    mock_organization_gateway.lock_organization_waste.return_value = OrganizationWasteState(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=1
+    )
+    mock_storage_gateway.lock_storage_waste.return_value = StorageWasteState(
+        storage_id=2,
+        waste_type=WasteType.BIO_WASTE,
+        capacity=None,
+        current_amount=None
     )
     transfer_request = {
         "waste_type": "BIO_WASTE",
@@ -142,22 +126,17 @@ async def test_storage_insufficient_capacity(
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock,
         mock_uow: AsyncMock,
-        monkeypatch: MonkeyPatch
 ) -> None:
-    mock_organization_gateway.get_organization_by_id.return_value = Organization(
-        id=1,
-        name="Org 1",
-        location_x=0,
-        location_y=0,
-        generated_waste=[OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=2)]
-    )
-    mock_storage_gateway.get_storage_by_id.return_value = Storage(
-        id=2,
-        name="S2",
-        location_x=100,
-        location_y=0,
-        capacities=[StorageCapacity(waste_type=WasteType.BIO_WASTE, capacity=1)],
-        current_levels=[StorageCurrentLevel(waste_type=WasteType.BIO_WASTE, current_amount=1)]
+    mock_organization_gateway.lock_organization_waste.return_value = OrganizationWasteState(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=2
+    )
+    mock_storage_gateway.lock_storage_waste.return_value = StorageWasteState(
+        storage_id=2,
+        waste_type=WasteType.BIO_WASTE,
+        capacity=1,
+        current_amount=1
     )
     transfer_request = {
         "waste_type": "BIO_WASTE",
@@ -166,6 +145,37 @@ async def test_storage_insufficient_capacity(
     response = client.post("/organizations/1/storages/2/transfer-waste/", json=transfer_request)
     assert response.status_code == 400
     assert response.json() == {"detail": "Storage 2 does not have sufficient capacity for 2 of waste type BIO_WASTE."}
+    mock_organization_gateway.reduce_organization_waste.assert_not_called()
+    mock_storage_gateway.add_waste_to_storage.assert_not_called()
+    mock_uow.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_storage_missing_level_counts_as_empty(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+) -> None:
+    mock_organization_gateway.lock_organization_waste.return_value = OrganizationWasteState(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=2
+    )
+    mock_storage_gateway.lock_storage_waste.return_value = StorageWasteState(
+        storage_id=2,
+        waste_type=WasteType.BIO_WASTE,
+        capacity=2,
+        current_amount=None
+    )
+    mock_organization_gateway.reduce_organization_waste.return_value = 0
+    mock_storage_gateway.add_waste_to_storage.return_value = 2
+    transfer_request = {
+        "waste_type": "BIO_WASTE",
+        "amount": 2
+    }
+    response = client.post("/organizations/1/storages/2/transfer-waste/", json=transfer_request)
+    assert response.status_code == 200
 
 
 @pytest.mark.asyncio
@@ -174,22 +184,17 @@ async def test_organization_does_not_generate_waste_type(
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock,
         mock_uow: AsyncMock,
-        monkeypatch: MonkeyPatch
 ) -> None:
-    mock_organization_gateway.get_organization_by_id.return_value = Organization(
-        id=1,
-        name="Org 1",
-        location_x=0,
-        location_y=0,
-        generated_waste=[]
-    )
-    mock_storage_gateway.get_storage_by_id.return_value = Storage(
-        id=2,
-        name="S2",
-        location_x=100,
-        location_y=0,
-        capacities=[StorageCapacity(waste_type=WasteType.BIO_WASTE, capacity=2)],
-        current_levels=[StorageCurrentLevel(waste_type=WasteType.BIO_WASTE, current_amount=1)]
+    mock_organization_gateway.lock_organization_waste.return_value = OrganizationWasteState(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=None
+    )
+    mock_storage_gateway.lock_storage_waste.return_value = StorageWasteState(
+        storage_id=2,
+        waste_type=WasteType.BIO_WASTE,
+        capacity=2,
+        current_amount=1
     )
     transfer_request = {
         "waste_type": "BIO_WASTE",
@@ -206,22 +211,17 @@ async def test_organization_insufficient_waste(
         mock_organization_gateway: AsyncMock,
         mock_storage_gateway: AsyncMock,
         mock_uow: AsyncMock,
-        monkeypatch: MonkeyPatch
 ) -> None:
-    mock_organization_gateway.get_organization_by_id.return_value = Organization(
-        id=1,
-        name="Org 1",
-        location_x=0,
-        location_y=0,
-        generated_waste=[OrganizationWaste(waste_type=WasteType.BIO_WASTE, amount=1)]
-    )
-    mock_storage_gateway.get_storage_by_id.return_value = Storage(
-        id=2,
-        name="S2",
-        location_x=100,
-        location_y=0,
-        capacities=[StorageCapacity(waste_type=WasteType.BIO_WASTE, capacity=5)],
-        current_levels=[StorageCurrentLevel(waste_type=WasteType.BIO_WASTE, current_amount=1)]
+    mock_organization_gateway.lock_organization_waste.return_value = OrganizationWasteState(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=1
+    )
+    mock_storage_gateway.lock_storage_waste.return_value = StorageWasteState(
+        storage_id=2,
+        waste_type=WasteType.BIO_WASTE,
+        capacity=5,
+        current_amount=1
     )
     transfer_request = {
         "waste_type": "BIO_WASTE",
@@ -231,3 +231,33 @@ async def test_organization_insufficient_waste(
     assert response.status_code == 400
     assert response.json() == {
         "detail": "Organization 1 has insufficient waste of type BIO_WASTE. Available: 1, Requested: 2."}
+
+
+@pytest.mark.asyncio
+async def test_transfer_waste_conflict(
+        client: TestClient,
+        mock_organization_gateway: AsyncMock,
+        mock_storage_gateway: AsyncMock,
+        mock_uow: AsyncMock,
+) -> None:
+    mock_organization_gateway.lock_organization_waste.return_value = OrganizationWasteState(
+        organization_id=1,
+        waste_type=WasteType.BIO_WASTE,
+        amount=1
+    )
+    mock_storage_gateway.lock_storage_waste.return_value = StorageWasteState(
+        storage_id=2,
+        waste_type=WasteType.BIO_WASTE,
+        capacity=5,
+        current_amount=1
+    )
+    mock_organization_gateway.reduce_organization_waste.return_value = 0
+    mock_storage_gateway.add_waste_to_storage.return_value = None
+    transfer_request = {
+        "waste_type": "BIO_WASTE",
+        "amount": 1
+    }
+    response = client.post("/organizations/1/storages/2/transfer-waste/", json=transfer_request)
+    assert response.status_code == 409
+    mock_uow.rollback.assert_called_once()
+    mock_uow.commit.assert_not_called()
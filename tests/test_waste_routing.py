@@ -0,0 +1,82 @@
+import pytest
+
+from app.application.distances import distance_matrix
+from app.application.exceptions import RoutingProblemTooLargeError
+from app.application.models import Organization, OrganizationWaste, WasteType
+from app.application.models.routing import RoutingStrategy
+from app.application.models.storage import StorageFreeCapacity
+from app.application.waste_routing import greedy_assignment, min_cost_flow_assignment, plan_waste_routes
+
+
+def test_min_cost_flow_beats_greedy() -> None:
+    # Greedy takes the 0.1 edge first and leaves the first organization with the far storage.
+    costs = distance_matrix([(0, 0), (2, 0)], [(1.9, 0), (5, 0)])
+
+    greedy = greedy_assignment(costs, [1, 1], [1, 1])
+    optimal = min_cost_flow_assignment(costs, [1, 1], [1, 1])
+
+    assert greedy == {(1, 0): 1, (0, 1): 1}
+    assert optimal == {(0, 0): 1, (1, 1): 1}
+
+
+def test_assignment_respects_supplies_and_capacities() -> None:
+    costs = distance_matrix([(0, 0), (10, 0)], [(1, 0), (9, 0), (20, 0)])
+
+    for assign in (greedy_assignment, min_cost_flow_assignment):
+        flows = assign(costs, [7, 5], [4, 3, 100])
+
+        assert sum(flows.values()) == 12
+        assert sum(amount for (row, _), amount in flows.items() if row == 0) == 7
+        assert sum(amount for (_, column), amount in flows.items() if column == 0) <= 4
+        assert sum(amount for (_, column), amount in flows.items() if column == 1) <= 3
+
+
+def test_assignment_limited_by_capacity() -> None:
+    costs = distance_matrix([(0, 0)], [(1, 0), (2, 0)])
+
+    assert greedy_assignment(costs, [10], [2, 3]) == {(0, 0): 2, (0, 1): 3}
+    assert min_cost_flow_assignment(costs, [10], [2, 3]) == {(0, 0): 2, (0, 1): 3}
+
+
+def test_plan_waste_routes_per_waste_type() -> None:
+    organization = Organization(
+        id=1,
+        name="ОО 1",
+        location_x=0,
+        location_y=0,
+        generated_waste=[
+            OrganizationWaste(waste_type=WasteType.GLASS, amount=5),
+            OrganizationWaste(waste_type=WasteType.PLASTIC, amount=2),
+        ]
+    )
+    storages = [
+        StorageFreeCapacity(storage_id=1, location_x=3, location_y=4, waste_type=WasteType.GLASS, free_capacity=3),
+        StorageFreeCapacity(storage_id=2, location_x=6, location_y=8, waste_type=WasteType.GLASS, free_capacity=10),
+        StorageFreeCapacity(storage_id=1, location_x=3, location_y=4, waste_type=WasteType.BIO_WASTE, free_capacity=9),
+    ]
+
+    for strategy in RoutingStrategy:
+        routes = plan_waste_routes([organization], storages, strategy)
+
+        assert [(route.storage_id, route.waste_type, route.amount, route.distance) for route in routes] == [
+            (1, WasteType.GLASS, 3, 5.0),
+            (2, WasteType.GLASS, 2, 10.0),
+        ]
+
+
+def test_plan_waste_routes_too_large(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.application.waste_routing.MAX_ROUTING_PAIRS", 1)
+    organization = Organization(
+        id=1,
+        name="ОО 1",
+        location_x=0,
+        location_y=0,
+        generated_waste=[OrganizationWaste(waste_type=WasteType.GLASS, amount=5)]
+    )
+    storages = [
+        StorageFreeCapacity(storage_id=1, location_x=3, location_y=4, waste_type=WasteType.GLASS, free_capacity=3),
+        StorageFreeCapacity(storage_id=2, location_x=6, location_y=8, waste_type=WasteType.GLASS, free_capacity=10),
+    ]
+
+    with pytest.raises(RoutingProblemTooLargeError):
+        plan_waste_routes([organization], storages, RoutingStrategy.MIN_COST_FLOW)
@@ -0,0 +1,46 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+ROOT = Path(__file__).parents[1]
+
+
+def alembic_config(database: Path, monkeypatch: pytest.MonkeyPatch) -> Config:
+    monkeypatch.setenv("DATABASE_URI", f"sqlite+aiosqlite:///{database}")
+    config = Config(ROOT / "alembic.ini")
+    config.set_main_option("script_location", str(ROOT / "app/adapters/sqlalchemy_db/migrations"))
+    return config
+
+
+def test_duplicate_waste_rows_are_merged(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    database = tmp_path / "migration.db"
+    config = alembic_config(database, monkeypatch)
+    command.upgrade(config, "2258e2a81a6b")
+    with sqlite3.connect(database) as connection:
+        connection.execute("INSERT INTO organizations VALUES (1, 'Org', 0, 0)")
+        connection.execute("INSERT INTO storages VALUES (1, 'Storage', 0, 0)")
+        connection.executemany("INSERT INTO organization_waste VALUES (?, 1, ?, ?)", [
+            (1, "GLASS", 3), (2, "GLASS", 4), (3, "PLASTIC", 5), (4, "GLASS", 1),
+        ])
+        connection.executemany("INSERT INTO storage_capacities VALUES (?, 1, ?, ?)", [
+            (1, "GLASS", 10), (2, "GLASS", 10), (3, "PLASTIC", 5), (4, "PLASTIC", 50),
+        ])
+        connection.executemany("INSERT INTO storage_current_levels VALUES (?, 1, ?, ?)", [
+            (1, "GLASS", 2), (2, "GLASS", 3),
+        ])
+
+    command.upgrade(config, "052a51f6020d")
+
+    with sqlite3.connect(database) as connection:
+        assert connection.execute(
+            "SELECT id, waste_type, amount FROM organization_waste ORDER BY id"
+        ).fetchall() == [(1, "GLASS", 8), (3, "PLASTIC", 5)]
+        assert connection.execute(
+            "SELECT id, waste_type, capacity FROM storage_capacities ORDER BY id"
+        ).fetchall() == [(1, "GLASS", 10), (3, "PLASTIC", 5)]
+        assert connection.execute(
+            "SELECT id, waste_type, current_amount FROM storage_current_levels ORDER BY id"
+        ).fetchall() == [(1, "GLASS", 5)]
@@ -0,0 +1,8 @@
+from typing import AsyncIterator, TypeVar
+
+T = TypeVar("T")
+
+
+async def async_iter(items: list[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item